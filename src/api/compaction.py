@@ -0,0 +1,76 @@
+"""
+Search-history compaction
+Rolls old per-search results out of storage into the date-partitioned Parquet archive (jobtracker.archive)
+"""
+import argparse
+import asyncio
+import time
+from typing import Dict, Set
+
+import schedule
+
+from jobtracker.archive import SearchArchive, archive_rows
+from jobtracker.config import JobTrackerConfig
+from api.storage import create_storage
+from api.storage_base import StorageBackend
+
+# Runs loaded, archived and deleted together; bounds memory on a large backlog
+BATCH_RUNS = 200
+
+
+async def compact_history(storage: StorageBackend, archive: SearchArchive, older_than_days: float) -> Dict:
+    """Archive every run older than ``older_than_days`` (except each session's latest), then drop it from storage
+
+    Each batch is written to the archive before its runs are deleted, so a crash
+    can at worst archive a batch twice, never lose it.
+    """
+    runs = await storage.list_archivable_runs(time.time() - older_than_days * 86400)
+    touched: Set[str] = set()
+    rows_written = 0
+    for start in range(0, len(runs), BATCH_RUNS):
+        batch = runs[start:start + BATCH_RUNS]
+        rows = []
+        for run in batch:
+            jobs = await storage.load_run_jobs(run)
+            rows.extend(archive_rows(run["session_id"], run["run_id"], run["created_at"], jobs))
+        if rows:
+            touched.update(await asyncio.to_thread(archive.append, rows))
+        await storage.delete_runs(batch)
+        rows_written += len(rows)
+    # One file per date partition instead of one per batch (or per CLI run)
+    for day in archive.partitions():
+        await asyncio.to_thread(archive.compact, day)
+    return {"runs": len(runs), "rows": rows_written, "partitions": sorted(touched)}
+
+
+def run_once(older_than_days: float) -> Dict:
+    async def run():
+        storage = create_storage()
+        try:
+            return await compact_history(storage, SearchArchive.from_config(JobTrackerConfig.from_env()), older_than_days)
+        finally:
+            await storage.close()
+
+    return asyncio.run(run())
+
+
+def main():
+    config = JobTrackerConfig.from_env()
+    parser = argparse.ArgumentParser(description="Compact old search results into the Parquet archive")
+    parser.add_argument("--older-than-days", type=float, default=config.archive_after_days)
+    parser.add_argument("--daily-at", help="Keep running and compact every day at HH:MM (local time)")
+    args = parser.parse_args()
+
+    if not args.daily_at:
+        print(run_once(args.older_than_days))
+        return
+
+    schedule.every().day.at(args.daily_at).do(lambda: print(run_once(args.older_than_days)))
+    print(f"Compacting search history daily at {args.daily_at}")
+    while True:
+        schedule.run_pending()
+        time.sleep(30)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Bounded executors and admission control for the API
+Keeps blocking NLP, embedding, HTTP and storage work off the event loop
+"""
+import asyncio
+import functools
+import multiprocessing
+import os
+import threading
+from contextlib import asynccontextmanager
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Dict, List
+
+from fastapi import HTTPException
+
+from jobtracker.metrics import metrics
+
+
+class Overloaded(HTTPException):
+    """Raised instead of queueing when an executor or admission limit is full"""
+
+    def __init__(self, name: str, status_code: int = 503, retry_after: int = 5):
+        super().__init__(
+            status_code=status_code,
+            detail=f"Server busy ({name} queue full), retry later",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+class AdmissionLimiter:
+    """Non-blocking counter of in-flight work; rejects instead of waiting
+
+    Work that was already accepted elsewhere (a queued background task) uses
+    ``async with limiter.slot()`` instead, which waits for a free slot.
+    """
+
+    def __init__(self, name: str, limit: int, status_code: int = 503):
+        self.name = name
+        self.limit = limit
+        self.status_code = status_code
+        self.in_flight = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+        self._waiters: List[asyncio.Future] = []
+
+    def acquire(self):
+        with self._lock:
+            if self.in_flight >= self.limit:
+                self.rejected += 1
+                metrics.inc("jobtracker_executor_rejected_total", executor=self.name)
+                raise Overloaded(self.name, self.status_code)
+            self.in_flight += 1
+
+    def release(self):
+        with self._lock:
+            self.in_flight -= 1
+            waiters, self._waiters = self._waiters, []
+        # Wake every waiter to re-check; a cancelled waiter then can't swallow the freed slot
+        for waiter in waiters:
+            waiter.get_loop().call_soon_threadsafe(_wake, waiter)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator["AdmissionLimiter"]:
+        """Hold a slot for the duration of the block, waiting for one instead of raising Overloaded"""
+        while True:
+            with self._lock:
+                if self.in_flight < self.limit:
+                    self.in_flight += 1
+                    break
+                waiter = asyncio.get_running_loop().create_future()
+                self._waiters.append(waiter)
+            await waiter
+        try:
+            yield self
+        finally:
+            self.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+    def stats(self) -> Dict:
+        return {"in_flight": self.in_flight, "limit": self.limit, "rejected": self.rejected}
+
+
+def _wake(waiter: asyncio.Future):
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class BoundedExecutor:
+    """Thread or process pool with a bounded queue (workers + max_queue slots)"""
+
+    def __init__(self, name: str, executor: Executor, max_workers: int, max_queue: int):
+        self.name = name
+        self.executor = executor
+        self.admission = AdmissionLimiter(name, max_workers + max_queue)
+
+    async def run(self, fn: Callable, *args, **kwargs):
+        self.admission.acquire()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, functools.partial(fn, *args, **kwargs))
+        finally:
+            self.admission.release()
+
+    def stats(self) -> Dict:
+        return self.admission.stats()
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def create_io_executor() -> BoundedExecutor:
+    """Threads for blocking network and disk I/O (job API, storage SDK)"""
+    workers = int(os.getenv("API_IO_WORKERS", "16"))
+    return BoundedExecutor(
+        "io",
+        ThreadPoolExecutor(max_workers=workers, thread_name_prefix="api-io"),
+        workers,
+        int(os.getenv("API_IO_QUEUE", "64")),
+    )
+
+
+def create_cpu_executor() -> BoundedExecutor:
+    """Processes for CPU-bound resume parsing, embedding and matching
+
+    API_CPU_EXECUTOR=thread runs the same work on threads in the server process
+    instead, for preforked gunicorn workers that share preloaded models
+    copy-on-write (spawned processes would each load their own copy).
+    """
+    workers = int(os.getenv("API_CPU_WORKERS", "2"))
+    if os.getenv("API_CPU_EXECUTOR", "process") == "thread":
+        return BoundedExecutor(
+            "cpu",
+            ThreadPoolExecutor(max_workers=workers, thread_name_prefix="api-cpu"),
+            workers,
+            int(os.getenv("API_CPU_QUEUE", "8")),
+        )
+    return BoundedExecutor(
+        "cpu",
+        # spawn: never fork the threaded server process
+        ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")),
+        workers,
+        int(os.getenv("API_CPU_QUEUE", "8")),
+    )
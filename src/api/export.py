@@ -0,0 +1,199 @@
+"""
+Streaming export of search results
+CSV, gzip-CSV, Parquet and XLSX produced chunk by chunk as the response is written; nothing touches disk
+"""
+import csv
+import io
+import re
+import zipfile
+import zlib
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+from xml.sax.saxutils import escape
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+# Rows buffered before a chunk is yielded (CSV/XLSX) or a row group is written (Parquet)
+ROWS_PER_CHUNK = 500
+PARQUET_ROW_GROUP = 5000
+# Control characters XML 1.0 cannot carry (scraped descriptions occasionally contain them)
+_XML_ILLEGAL = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def _number(value):
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+# (CSV/XLSX header, Parquet column, getter, Parquet type name)
+COLUMNS: List[Tuple[str, str, Callable[[Dict], object], str]] = [
+    ("Title", "title", lambda job: job.get("title", ""), "string"),
+    ("Company", "company", lambda job: job.get("company", ""), "string"),
+    ("Location", "location", lambda job: f"{job.get('city', '')}, {job.get('state', '')}", "string"),
+    ("Match Score", "match_score", lambda job: job.get("match_score", ""), "float64"),
+    ("Semantic Score", "semantic_score", lambda job: job.get("semantic_score", ""), "float64"),
+    ("Skill Match Score", "skill_match_score", lambda job: job.get("skill_match_score", ""), "float64"),
+    ("Filter Score", "filter_score", lambda job: job.get("filter_score", ""), "float64"),
+    ("Matched Skills", "matched_skills", lambda job: ", ".join(job.get("matched_skills", [])), "string"),
+    ("Posted Date", "posted_at", lambda job: job.get("posted_at", ""), "string"),
+    ("Apply URL", "apply_url", lambda job: job.get("apply_url", ""), "string"),
+    ("Source", "source", lambda job: job.get("source", ""), "string"),
+]
+
+# format -> (media type, file extension)
+FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "csv.gz": ("application/gzip", "csv.gz"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"),
+}
+
+
+def _rows(jobs: Iterable[Dict]) -> Iterator[List]:
+    for job in jobs:
+        yield [getter(job) for _, _, getter, _ in COLUMNS]
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only, non-seekable file object whose contents are taken with ``drain``"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_csv(jobs: Iterable[Dict]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([header for header, _, _, _ in COLUMNS])
+    for count, row in enumerate(_rows(jobs), 1):
+        writer.writerow(row)
+        if count % ROWS_PER_CHUNK == 0:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode("utf-8")
+
+
+def iter_csv_gzip(jobs: Iterable[Dict]) -> Iterator[bytes]:
+    # wbits=31: gzip container around a deflate stream
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in iter_csv(jobs):
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def iter_parquet(jobs: Iterable[Dict]) -> Iterator[bytes]:
+    """Row groups of PARQUET_ROW_GROUP jobs, each flushed to the response as soon as it is written"""
+    if not PARQUET_AVAILABLE:
+        raise RuntimeError("Parquet export needs the pyarrow package")
+    schema = pa.schema([(name, getattr(pa, type_name)()) for _, name, _, type_name in COLUMNS])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    batch: List[Dict] = []
+
+    def write_batch():
+        columns = list(zip(*(_parquet_row(job) for job in batch)))
+        writer.write_table(pa.Table.from_arrays([pa.array(c, type=f.type) for c, f in zip(columns, schema)], schema=schema))
+        batch.clear()
+
+    for job in jobs:
+        batch.append(job)
+        if len(batch) >= PARQUET_ROW_GROUP:
+            write_batch()
+            yield sink.drain()
+    if batch:
+        write_batch()
+    writer.close()  # footer
+    yield sink.drain()
+
+
+def _parquet_row(job: Dict) -> List:
+    return [
+        _number(getter(job)) if type_name == "float64" else str(getter(job) or "")
+        for _, _, getter, type_name in COLUMNS
+    ]
+
+
+_XLSX_STATIC = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    "xl/workbook.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Jobs" sheetId="1" r:id="rId1"/></sheets></workbook>'
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'
+    ),
+}
+
+
+def _xlsx_cell(value) -> str:
+    if _number(value) is not None:
+        return f"<c><v>{value}</v></c>"
+    # Inline strings: no shared-strings table to hold in memory until the end
+    text = escape(_XML_ILLEGAL.sub("", str(value))).replace("\n", "&#10;")
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def iter_xlsx(jobs: Iterable[Dict]) -> Iterator[bytes]:
+    """Single-sheet workbook written as a streamed ZIP (data descriptors, no seeking back)"""
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in _XLSX_STATIC.items():
+            archive.writestr(name, content)
+        with archive.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+            sheet.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+            )
+            header = "".join(_xlsx_cell(header) for header, _, _, _ in COLUMNS)
+            sheet.write(f"<row>{header}</row>".encode("utf-8"))
+            for count, row in enumerate(_rows(jobs), 1):
+                sheet.write(f"<row>{''.join(_xlsx_cell(value) for value in row)}</row>".encode("utf-8"))
+                if count % ROWS_PER_CHUNK == 0:
+                    yield sink.drain()
+            sheet.write(b"</sheetData></worksheet>")
+        yield sink.drain()
+    yield sink.drain()  # central directory
+
+
+WRITERS = {"csv": iter_csv, "csv.gz": iter_csv_gzip, "parquet": iter_parquet, "xlsx": iter_xlsx}
+
+
+def iter_export(jobs: Iterable[Dict], format: str) -> Iterator[bytes]:
+    return WRITERS[format](jobs)
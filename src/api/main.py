@@ -2,34 +2,65 @@
 FastAPI backend for Job Tracker
 Provides REST API endpoints for job search, resume parsing, and result management
 """
-from fastapi import FastAPI, File, UploadFile, HTTPException, BackgroundTasks
+from fastapi import FastAPI, File, UploadFile, HTTPException, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional
-import tempfile
+import asyncio
 import os
 import json
-from datetime import datetime
+from datetime import date, datetime
 import uuid
+import time
+from contextlib import asynccontextmanager
 
 # Import our job tracker modules
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
-from jobtracker.fetcher.fetcher import JobFetcher
-from jobtracker.filter.filter import JobFilter
-from jobtracker.resume.parser import resume_parser
-from jobtracker.matcher.matcher import job_matcher
-from jobtracker.filter.llm_filter import filter_jobs
+from jobtracker.resume.cache import ResumeProfileCache, cached_resume_parser
+from jobtracker.resume.pdf_text import PdfTooLargeError
+from jobtracker.resume.profile import compact_profile, has_current_embedding, without_embedding
 from jobtracker.config import JobTrackerConfig
-from api.storage import AzureBlobStorage
+from jobtracker.models import SENTENCE_TRANSFORMER_MODEL
+from jobtracker.metrics import collect_metrics, metrics
+from jobtracker.archive import ARCHIVE_AVAILABLE, COLUMNS as ARCHIVE_COLUMNS, SearchArchive
+from jobtracker.warehouse import get_warehouse
+from api.storage import CachedStorage, create_storage
+from api.export import FORMATS as EXPORT_FORMATS, PARQUET_AVAILABLE, iter_export
+from api.executors import AdmissionLimiter, create_cpu_executor, create_io_executor
+from api.pipeline import run_search, search_cache_key
+from api.cache import SingleFlight, TTLCache
+from api.tasks import TaskManager, format_sse
+from api.streaming import check_cursor_run, decode_cursor, encode_cursor, iter_ndjson, parse_fields
+from api.uploads import MAX_UPLOAD_BYTES, UploadSizeLimit, spool_to_path, spool_upload
+from api.warmup import Warmup
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start task workers and background warmup; the server accepts connections immediately
+
+    /live answers as soon as the event loop runs, /ready only once warmup finishes.
+    """
+    await task_manager.start()
+    warmup_task = asyncio.create_task(warmup.run(cpu_executor))
+    try:
+        yield
+    finally:
+        warmup_task.cancel()
+        await asyncio.gather(warmup_task, return_exceptions=True)
+        await task_manager.stop()
+        await storage.close()
+        io_executor.shutdown()
+        cpu_executor.shutdown()
 
 # Initialize FastAPI app
 app = FastAPI(
     title="AI Job Tracker API",
     description="AI-powered job matching and filtering system",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware for frontend
@@ -41,8 +72,65 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize Azure Blob Storage
-storage = AzureBlobStorage()
+# Oversized resume uploads fail with 413 while the body is still streaming in
+app.add_middleware(UploadSizeLimit, max_bytes=MAX_UPLOAD_BYTES, paths=("/upload-resume",))
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Request count and latency per route template (not raw path, to keep label cardinality bounded)"""
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        path = getattr(route, "path", "unmatched")
+        metrics.observe("jobtracker_http_request_duration_seconds", time.perf_counter() - start,
+                        method=request.method, route=path)
+        metrics.inc("jobtracker_http_requests_total", method=request.method, route=path, status=status)
+
+# Bounded executors: blocking I/O on threads, CPU-bound NLP/embedding in processes
+io_executor = create_io_executor()
+cpu_executor = create_cpu_executor()
+
+# Searches beyond this many in flight are rejected with 429 instead of queueing
+search_admission = AdmissionLimiter(
+    "search", int(os.getenv("API_MAX_CONCURRENT_SEARCHES", "8")), status_code=429
+)
+
+config = JobTrackerConfig.from_env()
+
+# Search outcomes keyed by (normalized params, resume hash, weights); concurrent identical searches coalesce
+search_cache = TTLCache(
+    max_entries=int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "256")),
+    ttl_seconds=float(os.getenv("SEARCH_CACHE_TTL_SECONDS", "900")),
+)
+search_flight = SingleFlight()
+
+# Largest page served by the NDJSON results stream
+MAX_STREAM_LIMIT = 1000
+# Ranked jobs persisted per search run (what /search-results, its stream and exports can page through)
+MAX_STORED_JOBS = int(os.getenv("SEARCH_RESULTS_MAX_STORED", "500"))
+
+# Background search tasks (POST /search-jobs?mode=async)
+task_manager = TaskManager(
+    workers=int(os.getenv("API_SEARCH_TASK_WORKERS", "2")),
+    max_queued=int(os.getenv("API_SEARCH_TASK_QUEUE", "32")),
+)
+
+# Model loading + warmup state behind /ready
+warmup = Warmup()
+
+# Azure Blob Storage when configured, otherwise the local SQLite database; hot sessions served from memory
+storage = create_storage(executor=io_executor)
+
+# Parsed resume profiles keyed by content hash, shared across sessions
+resume_cache = ResumeProfileCache.from_config(config)
+
+# Parquet archive of past search runs, filled by python -m api.compaction (None without pyarrow)
+archive = SearchArchive.from_config(config) if ARCHIVE_AVAILABLE else None
 
 # Pydantic models for API
 class JobSearchRequest(BaseModel):
@@ -52,6 +140,7 @@ class JobSearchRequest(BaseModel):
     user_prompt: str = "filter for relevant jobs"
     match_score_threshold: float = 50.0
     use_llm_filtering: bool = False
+    pages: int = 1  # result pages to fetch; async searches report progress per page
 
 class JobSearchResponse(BaseModel):
     session_id: str
@@ -73,7 +162,45 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "timestamp": datetime.now().isoformat()}
+    return {
+        "status": "healthy",
+        "timestamp": datetime.now().isoformat(),
+        "executors": {
+            "io": io_executor.stats(),
+            "cpu": cpu_executor.stats(),
+            "search": search_admission.stats(),
+        },
+        "search_cache": {**search_cache.stats(), "coalesced": search_flight.coalesced},
+        "storage_cache": storage.stats() if isinstance(storage, CachedStorage) else None,
+        "warmup": warmup.status(),
+    }
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Stage timings, job/cache/API counters and executor load in Prometheus text format"""
+    for name, executor in (("io", io_executor), ("cpu", cpu_executor), ("search", search_admission)):
+        metrics.set("jobtracker_executor_in_flight", executor.stats()["in_flight"], executor=name)
+    metrics.set("jobtracker_search_cache_entries", search_cache.stats()["entries"])
+    metrics.set("jobtracker_search_coalesced", search_flight.coalesced)
+    if isinstance(storage, CachedStorage):
+        for name, stats in (("profile", storage.profiles.stats()), ("results", storage.results.stats())):
+            metrics.set("jobtracker_storage_cache_entries", stats["entries"], cache=name)
+    return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+@app.get("/live")
+async def liveness_check():
+    """Process and event loop are up; 503 once model loading/warmup failed for good, so the worker gets replaced"""
+    if warmup.failed:
+        return JSONResponse(status_code=503, content={"status": "failed", "error": warmup.error, "pid": os.getpid()})
+    return {"status": "alive", "pid": os.getpid()}
+
+@app.get("/ready")
+async def readiness_check():
+    """503 until models are loaded and warmup latency has settled"""
+    status = {**warmup.status(), "pid": os.getpid()}
+    if not warmup.ready:
+        return JSONResponse(status_code=503, content=status)
+    return status
 
 @app.post("/upload-resume", response_model=ResumeUploadResponse)
 async def upload_resume(file: UploadFile = File(...)):
@@ -86,140 +213,279 @@ async def upload_resume(file: UploadFile = File(...)):
         # Generate session ID
         session_id = str(uuid.uuid4())
         
-        # Save file temporarily for processing
-        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(file.filename)[1]) as tmp_file:
-            content = await file.read()
-            tmp_file.write(content)
-            tmp_file_path = tmp_file.name
+        # Size-checked and hashed in one pass over the spooled upload; nothing is read into memory whole
+        upload = await spool_upload(file)
         
-        try:
-            # Parse resume
-            resume_profile = resume_parser(tmp_file_path)
-            
-            # Upload to Azure Blob Storage
-            blob_url = await storage.upload_resume(session_id, file.filename, content)
-            
-            # Save resume profile metadata
-            await storage.save_resume_profile(session_id, resume_profile)
+        # Parse resume (cached by content hash, so re-uploads skip NLP and embedding)
+        full_profile = await io_executor.run(resume_cache.get, upload.sha256)
+        if full_profile is not None:
+            metrics.inc("jobtracker_cache_hits_total", cache="resume")
+        else:
+            # The parser runs in another process and needs a path
+            tmp_file_path = await io_executor.run(spool_to_path, upload.stream, os.path.splitext(file.filename)[1])
+            try:
+                full_profile, snapshot = await cpu_executor.run(
+                    collect_metrics, cached_resume_parser, tmp_file_path, resume_cache, upload.sha256
+                )
+                metrics.merge(snapshot)
+            finally:
+                # Clean up temporary file
+                os.unlink(tmp_file_path)
+        resume_profile = compact_profile(full_profile)
+        
+        with metrics.stage("storage"):
+            # Stream the spooled upload to Azure Blob Storage
+            blob_url = await storage.upload_resume(session_id, file.filename, upload.stream, upload.size)
             
-            return ResumeUploadResponse(
-                session_id=session_id,
-                filename=file.filename,
-                resume_profile=resume_profile,
-                blob_url=blob_url
+            # Save compact profile (with embedding) for searches; raw text kept separately
+            await asyncio.gather(
+                storage.save_resume_profile(session_id, resume_profile),
+                storage.save_resume_text(session_id, full_profile["text"]),
             )
+        
+        return ResumeUploadResponse(
+            session_id=session_id,
+            filename=file.filename,
+            resume_profile=without_embedding(resume_profile),
+            blob_url=blob_url
+        )
             
-        finally:
-            # Clean up temporary file
-            os.unlink(tmp_file_path)
-            
+    except HTTPException:
+        raise
+    except PdfTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Resume processing failed: {str(e)}")
 
+async def execute_search(session_id: str, request: JobSearchRequest, resume_profile: dict, progress=None,
+                         wait_for_slot: bool = False) -> dict:
+    """Run the pipeline, save the results and build the JobSearchResponse payload
+
+    Synchronous requests are rejected with 429 when every search slot is taken;
+    queued tasks (``wait_for_slot``) were already accepted, so they wait for one.
+    """
+    progress = progress or (lambda event, **data: None)
+    params = request.dict()
+    params["semantic_weight"] = config.semantic_weight
+    params["skill_weight"] = config.skill_weight
+    
+    # Identical searches share one cached or in-flight pipeline execution
+    key = search_cache_key(params, resume_profile)
+    outcome = search_cache.get(key)
+    if outcome is not None:
+        metrics.inc("jobtracker_cache_hits_total", cache="search")
+        progress("stage", stage="cache_hit")
+    else:
+        metrics.inc("jobtracker_cache_misses_total", cache="search")
+        async def run_pipeline():
+            if wait_for_slot:
+                return await run_search(params, resume_profile, io_executor, cpu_executor, progress=progress)
+            with search_admission:
+                return await run_search(params, resume_profile, io_executor, cpu_executor, progress=progress)
+        
+        if wait_for_slot:
+            if search_admission.in_flight >= search_admission.limit:
+                progress("stage", stage="waiting_for_slot")
+            async with search_admission.slot():
+                outcome, shared = await search_flight.do(key, run_pipeline)
+        else:
+            outcome, shared = await search_flight.do(key, run_pipeline)
+        if shared:
+            progress("stage", stage="coalesced")
+        else:
+            search_cache.set(key, outcome)
+    
+    if not outcome["total_jobs"]:
+        return JobSearchResponse(
+            session_id=session_id,
+            total_jobs=0,
+            filtered_jobs=0,
+            jobs=[],
+            resume_profile=without_embedding(resume_profile),
+            search_params=request.dict()
+        ).dict()
+    filtered_jobs = outcome["jobs"]
+    
+    # Save search results to storage
+    progress("stage", stage="storage")
+    search_results = {
+        "search_params": request.dict(),
+        "total_jobs": outcome["total_jobs"],
+        "filtered_jobs": outcome["filtered_jobs"],
+        "jobs": filtered_jobs[:MAX_STORED_JOBS],  # Top of the ranked list; paged via /search-results/{id}
+        "timestamp": datetime.now().isoformat()
+    }
+    with metrics.stage("storage", jobs_in=len(filtered_jobs)):
+        await storage.save_search_results(session_id, search_results)
+    
+    return JobSearchResponse(
+        session_id=session_id,
+        total_jobs=outcome["total_jobs"],
+        filtered_jobs=outcome["filtered_jobs"],
+        jobs=filtered_jobs[:20],  # Limit for UI performance
+        resume_profile=without_embedding(resume_profile),
+        search_params=request.dict()
+    ).dict()
+
 @app.post("/search-jobs", response_model=JobSearchResponse)
-async def search_jobs(request: JobSearchRequest, session_id: str):
-    """Search and match jobs with uploaded resume"""
+async def search_jobs(request: JobSearchRequest, session_id: str, mode: str = "sync"):
+    """Search and match jobs with uploaded resume
+    
+    mode=async queues the search and returns 202 with a task id; follow it via
+    GET /tasks/{task_id} or the server-sent events at GET /tasks/{task_id}/events.
+    """
     try:
         # Get resume profile from storage
         resume_profile = await storage.get_resume_profile(session_id)
         if not resume_profile:
             raise HTTPException(status_code=404, detail="Resume not found. Please upload a resume first.")
+        if not has_current_embedding(resume_profile, SENTENCE_TRANSFORMER_MODEL):
+            # Compact profiles carry no text: re-encode from the stored resume text
+            resume_text = await storage.get_resume_text(session_id)
+            if resume_text:
+                resume_profile = {**resume_profile, "resume_text": resume_text}
         
-        # Fetch jobs
         rapidapi_key = os.getenv("RAPIDAPI_KEY")
         if not rapidapi_key:
             raise HTTPException(status_code=500, detail="RapidAPI key not configured")
         
-        fetcher = JobFetcher(rapidapi_key)
-        jobs = fetcher.fetch_jsearch(
-            keywords=request.keywords,
-            location=request.location,
-            posted_within_days=request.posted_within_days
-        )
-        
-        # Deduplicate (simplified for API)
-        job_filter = JobFilter(jobs)
-        jobs = job_filter.deduplicate(set())  # No persistence for API demo
-        
-        if not jobs:
-            return JobSearchResponse(
-                session_id=session_id,
-                total_jobs=0,
-                filtered_jobs=0,
-                jobs=[],
-                resume_profile=resume_profile,
-                search_params=request.dict()
-            )
-        
-        # Match jobs to resume
-        matched_jobs = job_matcher(jobs, resume_profile)
-        
-        # Filter by match score threshold
-        high_match_jobs = [
-            job for job in matched_jobs 
-            if job.get('match_score', 0) >= request.match_score_threshold
-        ]
-        
-        # Apply semantic/LLM filtering
-        filtered_jobs = filter_jobs(
-            high_match_jobs, 
-            request.user_prompt, 
-            use_llm=request.use_llm_filtering
-        )
-        
-        # Save search results to storage
-        search_results = {
-            "search_params": request.dict(),
-            "total_jobs": len(jobs),
-            "filtered_jobs": len(filtered_jobs),
-            "jobs": filtered_jobs[:20],  # Limit for UI performance
-            "timestamp": datetime.now().isoformat()
-        }
-        await storage.save_search_results(session_id, search_results)
+        if mode == "async":
+            async def runner(task, emit):
+                return await execute_search(session_id, request, resume_profile, progress=emit, wait_for_slot=True)
+            
+            task = task_manager.submit(session_id, runner)
+            return JSONResponse(status_code=202, content={
+                "task_id": task.id,
+                "status": task.status,
+                "status_url": f"/tasks/{task.id}",
+                "events_url": f"/tasks/{task.id}/events",
+            })
+        elif mode != "sync":
+            raise HTTPException(status_code=400, detail="Mode must be 'sync' or 'async'")
         
-        return JobSearchResponse(
-            session_id=session_id,
-            total_jobs=len(jobs),
-            filtered_jobs=len(filtered_jobs),
-            jobs=filtered_jobs[:20],
-            resume_profile=resume_profile,
-            search_params=request.dict()
-        )
+        return await execute_search(session_id, request, resume_profile)
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Job search failed: {str(e)}")
 
+@app.get("/tasks/{task_id}")
+async def get_task(task_id: str):
+    """Status, stage, partial top-k results and (when completed) the full search result"""
+    task = task_manager.get(task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return task.to_dict()
+
+@app.get("/tasks/{task_id}/events")
+async def task_events(task_id: str):
+    """Server-sent events: stage progress, partial top-k per scored page, completion"""
+    task = task_manager.get(task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    
+    async def stream():
+        async for entry in task_manager.subscribe(task):
+            yield format_sse(entry)
+    
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.get("/search-results/{session_id}")
-async def get_search_results(session_id: str):
-    """Get saved search results"""
+async def get_search_results(session_id: str, offset: int = 0, limit: int = 50):
+    """Get one page of the saved search results; ``next_offset`` is null on the last page"""
     try:
-        results = await storage.get_search_results(session_id)
+        if limit < 1 or limit > MAX_STREAM_LIMIT or offset < 0:
+            raise HTTPException(status_code=400, detail=f"limit must be 1-{MAX_STREAM_LIMIT} and offset >= 0")
+        results = await storage.get_search_results_page(session_id, offset, limit)
         if not results:
             raise HTTPException(status_code=404, detail="Search results not found")
-        return results
+        end = offset + len(results["jobs"])
+        return {**results, "offset": offset, "next_offset": end if end < results["stored_jobs"] else None}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve results: {str(e)}")
 
+@app.get("/search-results/{session_id}/stream")
+async def stream_search_results(session_id: str, cursor: Optional[str] = None, limit: int = 100, fields: Optional[str] = None):
+    """Stream the ranked jobs of the latest search as NDJSON
+    
+    fields=title,company,match_score selects (dotted paths allowed, e.g. raw.job_description);
+    the X-Next-Cursor response header continues from the last returned job.
+    """
+    try:
+        # Only the cursor's range is read; its run timestamp is checked against the run that was read
+        cursor_timestamp, offset = decode_cursor(cursor) if cursor else (None, 0)
+        limit = max(1, min(limit, MAX_STREAM_LIMIT))
+        results = await storage.get_search_results_page(session_id, offset, limit)
+        if not results:
+            raise HTTPException(status_code=404, detail="Search results not found")
+        
+        jobs = results["jobs"]
+        run_timestamp = results.get("timestamp", "")
+        if cursor:
+            check_cursor_run(cursor_timestamp, run_timestamp)
+        end = offset + len(jobs)
+        
+        headers = {"X-Total-Count": str(results["stored_jobs"])}
+        if end < results["stored_jobs"]:
+            headers["X-Next-Cursor"] = encode_cursor(run_timestamp, end)
+        
+        return StreamingResponse(
+            iter_ndjson(jobs, parse_fields(fields), offset),
+            media_type="application/x-ndjson",
+            headers=headers
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to stream results: {str(e)}")
+
+@app.get("/sessions/{session_id}/top-jobs")
+async def top_jobs(session_id: str, limit: int = 50, days: float = 7):
+    """Best-scoring distinct jobs across every search of the session in the last ``days`` days"""
+    try:
+        if limit < 1 or limit > MAX_STREAM_LIMIT or days <= 0:
+            raise HTTPException(status_code=400, detail=f"limit must be 1-{MAX_STREAM_LIMIT} and days > 0")
+        jobs = await storage.top_jobs(session_id, limit, since=time.time() - days * 86400)
+        return {"session_id": session_id, "days": days, "jobs": jobs}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to retrieve top jobs: {str(e)}")
+
 @app.get("/export-results/{session_id}")
 async def export_results(session_id: str, format: str = "csv"):
-    """Export search results as CSV or JSON"""
+    """Export search results as CSV, gzip-compressed CSV, Parquet, XLSX or JSON
+    
+    File formats are streamed straight into the response in fixed-size chunks; nothing is written to disk.
+    """
     try:
         results = await storage.get_search_results(session_id)
         if not results:
             raise HTTPException(status_code=404, detail="Search results not found")
         
-        if format.lower() == "csv":
-            csv_content = await storage.export_to_csv(results)
-            return FileResponse(
-                csv_content,
-                media_type="text/csv",
-                filename=f"job_results_{session_id[:8]}.csv"
-            )
-        elif format.lower() == "json":
+        format = format.lower()
+        if format == "json":
             return JSONResponse(results)
-        else:
-            raise HTTPException(status_code=400, detail="Format must be 'csv' or 'json'")
-            
+        if format not in EXPORT_FORMATS:
+            raise HTTPException(status_code=400, detail=f"Format must be one of: {', '.join([*EXPORT_FORMATS, 'json'])}")
+        if format == "parquet" and not PARQUET_AVAILABLE:
+            raise HTTPException(status_code=501, detail="Parquet export is not available (pyarrow not installed)")
+        
+        media_type, extension = EXPORT_FORMATS[format]
+        return StreamingResponse(
+            iter_export(results.get("jobs", []), format),
+            media_type=media_type,
+            headers={"Content-Disposition": f'attachment; filename="job_results_{session_id[:8]}.{extension}"'}
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Export failed: {str(e)}")
 
@@ -229,15 +495,77 @@ async def delete_session(session_id: str):
     try:
         await storage.delete_session(session_id)
         return {"message": "Session deleted successfully"}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Session deletion failed: {str(e)}")
 
+@app.get("/jobs/search")
+async def search_warehouse(q: str = "", location: str = "", days: Optional[float] = None, limit: int = 50, offset: int = 0):
+    """Full-text search over every job fetched so far (local warehouse, no API call)"""
+    try:
+        warehouse = get_warehouse()
+        if warehouse is None:
+            raise HTTPException(status_code=501, detail="Job warehouse is disabled (WAREHOUSE_ENABLED=false)")
+        if limit < 1 or limit > MAX_STREAM_LIMIT or offset < 0 or (days is not None and days <= 0):
+            raise HTTPException(status_code=400, detail=f"limit must be 1-{MAX_STREAM_LIMIT}, offset >= 0 and days > 0")
+        
+        start = time.perf_counter()
+        jobs = await io_executor.run(warehouse.search, q, location, days, limit, offset)
+        return {
+            "jobs": jobs,
+            "count": len(jobs),
+            "took_ms": round((time.perf_counter() - start) * 1000, 2),
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Warehouse search failed: {str(e)}")
+
+@app.get("/history")
+async def search_history(start: Optional[date] = None, end: Optional[date] = None, session_id: Optional[str] = None,
+                         min_score: Optional[float] = None, fields: Optional[str] = None, limit: int = 1000):
+    """Archived search runs, one row per (session, run, job)
+    
+    Only the selected ``fields`` (default: all) and the date partitions between ``start`` and ``end`` are read.
+    """
+    try:
+        if archive is None:
+            raise HTTPException(status_code=501, detail="Search history archive is not available (pyarrow not installed)")
+        if limit < 1 or limit > MAX_STREAM_LIMIT:
+            raise HTTPException(status_code=400, detail=f"limit must be 1-{MAX_STREAM_LIMIT}")
+        columns = parse_fields(fields)
+        known = {name for name, _ in ARCHIVE_COLUMNS} | {"date"}
+        if columns and not set(columns) <= known:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(set(columns) - known))}")
+        
+        # The scan stops after ``limit`` rows; the total is counted separately without materializing rows
+        table, total = await asyncio.gather(
+            io_executor.run(archive.query, columns, start, end, session_id, min_score, limit),
+            io_executor.run(archive.count, start, end, session_id, min_score),
+        )
+        return {
+            "rows": table.to_pylist(),
+            "total": total,
+            "truncated": total > limit,
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to query search history: {str(e)}")
+
 @app.get("/sessions")
-async def list_sessions():
-    """List all sessions (for admin/debugging)"""
+async def list_sessions(limit: int = 100, offset: int = 0):
+    """List sessions, most recently used first (for admin/debugging)
+    
+    Served from the session index in one read; page with ``offset=next_offset``.
+    """
     try:
-        sessions = await storage.list_sessions()
-        return {"sessions": sessions}
+        if limit < 1 or limit > MAX_STREAM_LIMIT or offset < 0:
+            raise HTTPException(status_code=400, detail=f"limit must be 1-{MAX_STREAM_LIMIT} and offset >= 0")
+        return await storage.list_session_page(limit, offset)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list sessions: {str(e)}")
 
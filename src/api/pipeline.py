@@ -0,0 +1,125 @@
+"""
+Job search pipeline for the API
+Fetching runs on the I/O executor, matching and filtering on the CPU (process) executor
+"""
+import hashlib
+import json
+import os
+from typing import Callable, Dict, List, Tuple
+
+from jobtracker.fetcher.fetcher import JobFetcher
+from jobtracker.filter.filter import JobFilter
+from jobtracker.filter.llm_filter import filter_jobs
+from jobtracker.matcher.matcher import job_matcher
+from jobtracker.metrics import collect_metrics, metrics
+from jobtracker.warehouse import fetch_with_warehouse, get_warehouse
+
+
+MAX_PAGES = 10
+
+
+def fetch_jobs(keywords: str, location: str, posted_within_days: int, page: int = 1) -> List[Dict]:
+    """Fetch one page of jobs (blocking HTTP, or a warehouse read when the page was fetched recently)"""
+    fetcher = JobFetcher(os.getenv("RAPIDAPI_KEY"))
+    return fetch_with_warehouse(get_warehouse(), fetcher, keywords, location, posted_within_days, page)
+
+
+def match_jobs(jobs: List[Dict], resume_profile: Dict, semantic_weight: float, skill_weight: float) -> List[Dict]:
+    """Score one batch of jobs against the resume (CPU executor)"""
+    return job_matcher(jobs, resume_profile, semantic_weight=semantic_weight, skill_weight=skill_weight)
+
+
+def threshold_and_filter(jobs: List[Dict], match_score_threshold: float,
+                         user_prompt: str, use_llm: bool) -> List[Dict]:
+    """Apply the match threshold and semantic/LLM filter to the scored jobs (CPU executor)"""
+    high_match_jobs = [
+        job for job in jobs
+        if job.get('match_score', 0) >= match_score_threshold
+    ]
+    return filter_jobs(high_match_jobs, user_prompt, use_llm=use_llm)
+
+
+def search_cache_key(params: Dict, resume_profile: Dict) -> Tuple:
+    """Normalized search parameters + resume content hash + scoring weights"""
+    def normalize(text: str) -> str:
+        return " ".join(str(text).lower().split())
+
+    resume_hash = resume_profile.get("content_hash") or hashlib.sha256(
+        json.dumps(resume_profile, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+    return (
+        normalize(params["keywords"]),
+        normalize(params["location"]),
+        int(params["posted_within_days"]),
+        normalize(params["user_prompt"]),
+        float(params["match_score_threshold"]),
+        bool(params["use_llm_filtering"]),
+        max(1, min(int(params.get("pages", 1)), MAX_PAGES)),
+        resume_hash,
+        float(params["semantic_weight"]),
+        float(params["skill_weight"]),
+    )
+
+
+def job_summary(job: Dict) -> Dict:
+    return {
+        "id": job.get("id"),
+        "title": job.get("title"),
+        "company": job.get("company"),
+        "match_score": job.get("match_score"),
+        "apply_url": job.get("apply_url"),
+    }
+
+
+def _no_progress(event: str, **data):
+    pass
+
+
+async def run_search(params: Dict, resume_profile: Dict, io_executor, cpu_executor,
+                     progress: Callable[..., None] = _no_progress, top_k: int = 10) -> Dict:
+    """Run the search pipeline page by page; returns total/filtered counts and the ranked jobs
+
+    ``progress(event, **data)`` receives stage changes and, after each fetched page is
+    scored, the current top-k jobs.
+    """
+    pages = max(1, min(int(params.get("pages", 1)), MAX_PAGES))
+    seen_ids = set()
+    scored: List[Dict] = []
+    total_jobs = 0
+
+    for page in range(1, pages + 1):
+        progress("stage", stage="fetch", page=page, pages=pages)
+        with metrics.stage("fetch") as stage:
+            jobs = await io_executor.run(
+                fetch_jobs, params["keywords"], params["location"], params["posted_within_days"], page
+            )
+            stage.jobs_out = len(jobs)
+        with metrics.stage("dedup", jobs_in=len(jobs)) as stage:
+            jobs = JobFilter(jobs).deduplicate(seen_ids)  # No persistence for API demo
+            seen_ids.update(job.get("id") for job in jobs)
+            stage.jobs_out = len(jobs)
+        if not jobs:
+            break
+        total_jobs += len(jobs)
+
+        # embed/match stages are timed inside the worker process and merged back here
+        progress("stage", stage="match", page=page, pages=pages)
+        matched, snapshot = await cpu_executor.run(
+            collect_metrics, match_jobs, jobs, resume_profile, params["semantic_weight"], params["skill_weight"]
+        )
+        metrics.merge(snapshot)
+        scored.extend(matched)
+        scored.sort(key=lambda job: job.get("match_score", 0), reverse=True)
+        progress("partial", page=page, scored_jobs=len(scored), top_jobs=[job_summary(j) for j in scored[:top_k]])
+
+    if not scored:
+        return {"total_jobs": 0, "filtered_jobs": 0, "jobs": []}
+
+    progress("stage", stage="filter")
+    with metrics.stage("filter", jobs_in=len(scored)) as stage:
+        filtered_jobs = await cpu_executor.run(
+            threshold_and_filter, scored, params["match_score_threshold"],
+            params["user_prompt"], params["use_llm_filtering"]
+        )
+        stage.jobs_out = len(filtered_jobs)
+    return {"total_jobs": total_jobs, "filtered_jobs": len(filtered_jobs), "jobs": filtered_jobs}
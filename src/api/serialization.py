@@ -0,0 +1,123 @@
+"""
+Storage serialization
+Compact encoding (orjson or msgpack) plus zstd/gzip compression behind a small format header; plain JSON still reads
+"""
+import gzip
+import json
+import os
+from typing import Any, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# MAGIC + encoding byte + compression byte. Legacy objects are JSON text and start with "{", "[" or whitespace.
+MAGIC = b"JT\x01"
+ENCODINGS = {"json": b"j", "msgpack": b"m"}
+COMPRESSIONS = {"none": b"n", "gzip": b"g", "zstd": b"z"}
+
+
+def _default(value):
+    # numpy scalars become plain numbers; anything else (datetimes, ...) falls back to str like json.dumps(default=str)
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+class Serializer:
+    """Encodes storage objects as MAGIC + format bytes + payload; ``loads`` reads any format, legacy JSON included"""
+
+    def __init__(self, encoding: str = "json", compression: str = "none", level: int = 3):
+        if encoding not in ENCODINGS:
+            raise ValueError(f"Unknown storage encoding: {encoding}")
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown storage compression: {compression}")
+        if encoding == "msgpack" and not MSGPACK_AVAILABLE:
+            raise ValueError("STORAGE_ENCODING=msgpack needs the msgpack package")
+        if compression == "zstd" and not ZSTD_AVAILABLE:
+            raise ValueError("STORAGE_COMPRESSION=zstd needs the zstandard package")
+        self.encoding = encoding
+        self.compression = compression
+        self.level = level
+        self.header = MAGIC + ENCODINGS[encoding] + COMPRESSIONS[compression]
+
+    @classmethod
+    def from_env(cls) -> "Serializer":
+        """STORAGE_ENCODING=json|msgpack, STORAGE_COMPRESSION=zstd|gzip|none (default: zstd when installed, else gzip)"""
+        return cls(
+            encoding=os.getenv("STORAGE_ENCODING", "json"),
+            compression=os.getenv("STORAGE_COMPRESSION", "zstd" if ZSTD_AVAILABLE else "gzip"),
+            level=int(os.getenv("STORAGE_COMPRESSION_LEVEL", "3")),
+        )
+
+    def dumps(self, data: Any) -> bytes:
+        return self.header + _compress(self.compression, _encode(self.encoding, data), self.level)
+
+    def loads(self, payload: Union[bytes, str]) -> Any:
+        return loads(payload)
+
+    def describe(self) -> str:
+        return f"{self.encoding}+{self.compression}"
+
+
+def _encode(encoding: str, data: Any) -> bytes:
+    if encoding == "msgpack":
+        return msgpack.packb(data, default=_default, use_bin_type=True)
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, default=_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+def _decode(encoding: bytes, raw: bytes) -> Any:
+    if encoding == ENCODINGS["msgpack"]:
+        if not MSGPACK_AVAILABLE:
+            raise ValueError("Stored object is msgpack-encoded but msgpack is not installed")
+        return msgpack.unpackb(raw, raw=False, strict_map_key=False)
+    return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+
+
+def _compress(compression: str, raw: bytes, level: int) -> bytes:
+    if compression == "zstd":
+        return zstandard.ZstdCompressor(level=level).compress(raw)
+    if compression == "gzip":
+        # mtime=0: identical objects give identical bytes
+        return gzip.compress(raw, compresslevel=min(max(level, 1), 9), mtime=0)
+    return raw
+
+
+def _decompress(compression: bytes, raw: bytes) -> bytes:
+    if compression == COMPRESSIONS["zstd"]:
+        if not ZSTD_AVAILABLE:
+            raise ValueError("Stored object is zstd-compressed but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompressobj().decompress(raw)
+    if compression == COMPRESSIONS["gzip"]:
+        return gzip.decompress(raw)
+    return raw
+
+
+def loads(payload: Union[bytes, str]) -> Any:
+    """Decode a stored object of any format; headerless payloads are legacy JSON text"""
+    if isinstance(payload, str):
+        return json.loads(payload)
+    if not payload.startswith(MAGIC):
+        return orjson.loads(payload) if ORJSON_AVAILABLE else json.loads(payload)
+    encoding, compression = payload[len(MAGIC):len(MAGIC) + 1], payload[len(MAGIC) + 1:len(MAGIC) + 2]
+    return _decode(encoding, _decompress(compression, payload[len(MAGIC) + 2:]))
+
+
+# Shared instance for the storage backends
+serializer = Serializer.from_env()
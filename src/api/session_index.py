@@ -0,0 +1,48 @@
+"""
+Session index manifest
+One JSON document mapping session id -> created/last-used timestamps, so listing sessions is a single read
+"""
+import time
+from typing import Dict, Optional
+
+INDEX_BLOB = "index/sessions.json"
+# last_used is only rewritten when it is at least this stale, so busy sessions don't rewrite the manifest on every call
+TOUCH_INTERVAL_SECONDS = 300
+
+
+def empty_manifest() -> Dict:
+    return {"version": 1, "sessions": {}}
+
+
+def touch(manifest: Dict, session_id: str, now: Optional[float] = None,
+          min_interval: float = TOUCH_INTERVAL_SECONDS) -> bool:
+    """Record use of a session; returns False when the manifest did not need to change"""
+    now = now if now is not None else time.time()
+    entry = manifest["sessions"].get(session_id)
+    if entry is None:
+        manifest["sessions"][session_id] = {"created_at": now, "last_used": now}
+        return True
+    if now - entry["last_used"] < min_interval:
+        return False
+    entry["last_used"] = now
+    return True
+
+
+def remove(manifest: Dict, session_id: str) -> bool:
+    return manifest["sessions"].pop(session_id, None) is not None
+
+
+def page(manifest: Dict, limit: int, offset: int = 0) -> Dict:
+    """Most recently used first"""
+    entries = sorted(
+        ({"session_id": sid, **entry} for sid, entry in manifest["sessions"].items()),
+        key=lambda entry: entry["last_used"],
+        reverse=True,
+    )
+    selected = entries[offset:offset + limit]
+    next_offset = offset + len(selected)
+    return {
+        "sessions": selected,
+        "total": len(entries),
+        "next_offset": next_offset if next_offset < len(entries) else None,
+    }
@@ -4,329 +4,596 @@ Handles resume uploads, search results storage, and file management
 """
 import os
 import json
-import csv
-import io
+import asyncio
+import time
 from datetime import datetime
-from typing import Dict, List, Optional
-import tempfile
+from typing import BinaryIO, Dict, List, Optional, Union
+
+from api.cache import SingleFlight, TTLCache
+from api.serialization import serializer
+from api.session_index import INDEX_BLOB, TOUCH_INTERVAL_SECONDS, empty_manifest, page, remove, touch
+from api.storage_base import StorageBackend, page_results
+from api.storage_sqlite import SQLiteStorage
+from jobtracker.metrics import metrics
 
 try:
-    from azure.storage.blob import BlobServiceClient, BlobClient, ContainerClient
-    from azure.core.exceptions import ResourceNotFoundError
+    from azure.core import MatchConditions
+    from azure.core.exceptions import ResourceExistsError, ResourceModifiedError, ResourceNotFoundError
+    from azure.core.pipeline.transport import AioHttpTransport
+    from azure.storage.blob.aio import BlobServiceClient, ExponentialRetry
+    import aiohttp
     AZURE_AVAILABLE = True
 except ImportError:
     AZURE_AVAILABLE = False
-    print("Azure Storage SDK not installed. Using local file storage as fallback.")
+    print("Azure Storage SDK not installed. Using local SQLite storage as fallback.")
+
+CHUNK_SIZE = 4 * 1024 * 1024
+# Blob batch requests accept at most 256 sub-requests
+BATCH_DELETE_SIZE = 256
+INDEX_UPDATE_ATTEMPTS = 5
+# latest.json holds {LATEST_REF: <search blob name>} instead of a second copy of the results
+LATEST_REF = "$ref"
+# A run's jobs are stored in page blobs of this many jobs, so a range read downloads only the pages it covers
+RESULT_PAGE_SIZE = 100
+
+
+class AzureBlobStorage(StorageBackend):
+    """Azure Blob Storage client for job tracker data
 
-class AzureBlobStorage:
-    """Azure Blob Storage client for job tracker data"""
+    Blob operations use the native async SDK over one pooled aiohttp session;
+    the SQLite fallback (and JSON encoding of large payloads) runs on the I/O executor.
+    """
     
-    def __init__(self):
-        if AZURE_AVAILABLE:
-            self.connection_string = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
-            self.container_name = os.getenv("AZURE_STORAGE_CONTAINER", "jobtracker")
-            
-            if self.connection_string:
-                self.blob_service_client = BlobServiceClient.from_connection_string(
-                    self.connection_string
-                )
-                self._ensure_container_exists()
-            else:
-                print("Azure Storage connection string not found. Using local storage.")
-                self.blob_service_client = None
-        else:
-            self.blob_service_client = None
+    def __init__(self, executor=None, local: Optional[SQLiteStorage] = None):
+        # Bounded I/O executor (api.executors) for blocking local work
+        self.executor = executor
+        self.connection_string = os.getenv("AZURE_STORAGE_CONNECTION_STRING") if AZURE_AVAILABLE else None
+        self.container_name = os.getenv("AZURE_STORAGE_CONTAINER", "jobtracker")
+        self.connect_timeout = float(os.getenv("AZURE_STORAGE_CONNECT_TIMEOUT", "10"))
+        self.read_timeout = float(os.getenv("AZURE_STORAGE_READ_TIMEOUT", "60"))
+        self.max_connections = int(os.getenv("AZURE_STORAGE_MAX_CONNECTIONS", "32"))
+        # The SDK default backs off from 15s, so an unreachable account stalls requests for over a minute
+        self.retry_total = int(os.getenv("AZURE_STORAGE_RETRY_TOTAL", "3"))
+        self.retry_backoff = float(os.getenv("AZURE_STORAGE_RETRY_BACKOFF", "0.5"))
+        self.delete_concurrency = int(os.getenv("AZURE_STORAGE_DELETE_CONCURRENCY", "4"))
+        if AZURE_AVAILABLE and not self.connection_string:
+            print("Azure Storage connection string not found. Using local storage.")
+        
+        # aiohttp sessions belong to the running event loop, so the client is created on first use
+        self.blob_service_client = None
+        self._session = None
+        self._client_lock = asyncio.Lock()
+        # session id -> when this process last recorded it in the index
+        self._touched: Dict[str, float] = {}
         
         # Fallback to local storage
-        self.local_storage_path = os.path.join(os.path.dirname(__file__), "../storage")
-        os.makedirs(self.local_storage_path, exist_ok=True)
+        self.local = local or SQLiteStorage(executor=executor)
+    
+    @property
+    def azure_enabled(self) -> bool:
+        return bool(self.connection_string)
+    
+    async def _client(self) -> "BlobServiceClient":
+        if self.blob_service_client is None:
+            async with self._client_lock:
+                if self.blob_service_client is None:
+                    self._session = aiohttp.ClientSession(
+                        connector=aiohttp.TCPConnector(limit=self.max_connections)
+                    )
+                    transport = AioHttpTransport(
+                        session=self._session,
+                        session_owner=False,
+                        connection_timeout=self.connect_timeout,
+                        read_timeout=self.read_timeout,
+                    )
+                    client = BlobServiceClient.from_connection_string(
+                        self.connection_string,
+                        transport=transport,
+                        retry_policy=ExponentialRetry(
+                            initial_backoff=self.retry_backoff, increment_base=2, retry_total=self.retry_total,
+                            random_jitter_range=1
+                        ),
+                    )
+                    try:
+                        await client.create_container(self.container_name)
+                    except ResourceExistsError:
+                        pass
+                    except Exception:
+                        # Unreachable account: retry the whole setup on the next call
+                        await client.close()
+                        await self._session.close()
+                        self._session = None
+                        raise
+                    self.blob_service_client = client
+        return self.blob_service_client
+    
+    async def close(self):
+        """Close the pooled connections (API shutdown)"""
+        if self.blob_service_client is not None:
+            await self.blob_service_client.close()
+            self.blob_service_client = None
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+    
+    async def _upload(self, blob_name: str, data, length: Optional[int] = None) -> str:
+        client = await self._client()
+        blob_client = client.get_blob_client(container=self.container_name, blob=blob_name)
+        await blob_client.upload_blob(data, overwrite=True, length=length)
+        return blob_client.url
     
-    def _ensure_container_exists(self):
-        """Create container if it doesn't exist"""
+    async def _download(self, blob_name: str) -> Optional[bytes]:
+        client = await self._client()
+        blob_client = client.get_blob_client(container=self.container_name, blob=blob_name)
         try:
-            self.blob_service_client.create_container(self.container_name)
-        except Exception:
-            pass  # Container might already exist
+            downloader = await blob_client.download_blob()
+        except ResourceNotFoundError:
+            return None
+        return await downloader.readall()
+    
+    async def _list_names(self, prefix: str) -> List[str]:
+        client = await self._client()
+        container = client.get_container_client(self.container_name)
+        return [blob.name async for blob in container.list_blobs(name_starts_with=prefix)]
+    
+    async def _read_chunks(self, stream: BinaryIO):
+        # The spooled file may be on disk: read it on the executor, not the event loop
+        while True:
+            chunk = await self._run(stream.read, CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
     
-    async def upload_resume(self, session_id: str, filename: str, content: bytes) -> str:
-        """Upload resume file to blob storage"""
+    async def upload_resume(self, session_id: str, filename: str, content: Union[bytes, BinaryIO],
+                            length: Optional[int] = None) -> str:
+        """Upload resume file (bytes or a rewound file-like object) to blob storage"""
         blob_name = f"resumes/{session_id}/{filename}"
-        
-        if self.blob_service_client:
+        if self.azure_enabled:
             try:
-                blob_client = self.blob_service_client.get_blob_client(
-                    container=self.container_name,
-                    blob=blob_name
-                )
-                blob_client.upload_blob(content, overwrite=True)
-                return blob_client.url
+                data = content if isinstance(content, bytes) else self._read_chunks(content)
+                return await self._upload(blob_name, data, length)
             except Exception as e:
                 print(f"Azure upload failed: {e}. Using local storage.")
-        
-        # Fallback to local storage
-        local_path = os.path.join(self.local_storage_path, "resumes", session_id)
-        os.makedirs(local_path, exist_ok=True)
-        file_path = os.path.join(local_path, filename)
-        
-        with open(file_path, "wb") as f:
-            f.write(content)
-        
-        return f"file://{file_path}"
+                if hasattr(content, "seek"):
+                    content.seek(0)
+        return await self.local.upload_resume(session_id, filename, content, length)
     
     async def save_resume_profile(self, session_id: str, resume_profile: Dict) -> str:
         """Save parsed resume profile as JSON"""
-        blob_name = f"profiles/{session_id}/profile.json"
-        content = json.dumps(resume_profile, indent=2).encode('utf-8')
-        
-        if self.blob_service_client:
+        if self.azure_enabled:
             try:
-                blob_client = self.blob_service_client.get_blob_client(
-                    container=self.container_name,
-                    blob=blob_name
-                )
-                blob_client.upload_blob(content, overwrite=True)
-                return blob_client.url
+                url = await self._upload(f"profiles/{session_id}/profile.json", serializer.dumps(resume_profile))
+                await self._touch_session(session_id)
+                return url
             except Exception as e:
                 print(f"Azure upload failed: {e}. Using local storage.")
-        
-        # Fallback to local storage
-        local_path = os.path.join(self.local_storage_path, "profiles", session_id)
-        os.makedirs(local_path, exist_ok=True)
-        file_path = os.path.join(local_path, "profile.json")
-        
-        with open(file_path, "w") as f:
-            json.dump(resume_profile, f, indent=2)
-        
-        return f"file://{file_path}"
+        return await self.local.save_resume_profile(session_id, resume_profile)
+    
+    async def save_resume_text(self, session_id: str, text: str) -> str:
+        """Save extracted resume text next to the (compact) profile"""
+        if self.azure_enabled:
+            try:
+                return await self._upload(f"profiles/{session_id}/resume.txt", text.encode('utf-8'))
+            except Exception as e:
+                print(f"Azure upload failed: {e}. Using local storage.")
+        return await self.local.save_resume_text(session_id, text)
+    
+    async def get_resume_text(self, session_id: str) -> Optional[str]:
+        """Extracted resume text saved by save_resume_text"""
+        if self.azure_enabled:
+            try:
+                content = await self._download(f"profiles/{session_id}/resume.txt")
+                if content is not None:
+                    return content.decode('utf-8')
+            except Exception as e:
+                print(f"Azure download failed: {e}. Trying local storage.")
+        return await self.local.get_resume_text(session_id)
     
     async def get_resume_profile(self, session_id: str) -> Optional[Dict]:
         """Retrieve resume profile by session ID"""
-        blob_name = f"profiles/{session_id}/profile.json"
-        
-        if self.blob_service_client:
+        if self.azure_enabled:
             try:
-                blob_client = self.blob_service_client.get_blob_client(
-                    container=self.container_name,
-                    blob=blob_name
-                )
-                content = blob_client.download_blob().readall()
-                return json.loads(content.decode('utf-8'))
-            except ResourceNotFoundError:
-                pass
+                content = await self._download(f"profiles/{session_id}/profile.json")
+                if content is not None:
+                    return serializer.loads(content)
             except Exception as e:
                 print(f"Azure download failed: {e}. Trying local storage.")
-        
-        # Fallback to local storage
-        file_path = os.path.join(self.local_storage_path, "profiles", session_id, "profile.json")
-        if os.path.exists(file_path):
-            with open(file_path, "r") as f:
-                return json.load(f)
-        
-        return None
+        return await self.local.get_resume_profile(session_id)
     
     async def save_search_results(self, session_id: str, results: Dict) -> str:
-        """Save search results"""
+        """Save the jobs as page blobs and the run as a timestamped blob, then point latest.json at it"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        blob_name = f"results/{session_id}/search_{timestamp}.json"
-        content = json.dumps(results, indent=2, default=str).encode('utf-8')
-        
-        if self.blob_service_client:
+        if self.azure_enabled:
             try:
-                blob_client = self.blob_service_client.get_blob_client(
-                    container=self.container_name,
-                    blob=blob_name
-                )
-                blob_client.upload_blob(content, overwrite=True)
+                blob_name = f"results/{session_id}/search_{timestamp}.json"
+                jobs = results.get("jobs", [])
+                # Large result sets: encode and compress off the event loop
+                pages = await self._run(_encode_pages, jobs)
+                prefix = _page_prefix(blob_name)
+                await asyncio.gather(*[self._upload(f"{prefix}{i:05d}.json", page) for i, page in enumerate(pages)])
+                run = {k: v for k, v in results.items() if k != "jobs"}
+                run["job_pages"] = {"page_size": RESULT_PAGE_SIZE, "count": len(jobs)}
                 
-                # Also save as "latest" for easy retrieval
-                latest_blob_name = f"results/{session_id}/latest.json"
-                latest_blob_client = self.blob_service_client.get_blob_client(
-                    container=self.container_name,
-                    blob=latest_blob_name
-                )
-                latest_blob_client.upload_blob(content, overwrite=True)
+                async def write_run() -> str:
+                    # Each write names the one before it, so these stay in order:
+                    # no run blob points at missing pages, no pointer at a missing run blob
+                    url = await self._upload(blob_name, serializer.dumps(run))
+                    await self._upload(f"results/{session_id}/latest.json", serializer.dumps({LATEST_REF: blob_name}))
+                    return url
                 
-                return blob_client.url
+                # The session index update is independent of the results, so it runs alongside them
+                url, _ = await asyncio.gather(write_run(), self._touch_session(session_id))
+                return url
             except Exception as e:
                 print(f"Azure upload failed: {e}. Using local storage.")
-        
-        # Fallback to local storage
-        local_path = os.path.join(self.local_storage_path, "results", session_id)
-        os.makedirs(local_path, exist_ok=True)
-        
-        file_path = os.path.join(local_path, f"search_{timestamp}.json")
-        with open(file_path, "w") as f:
-            json.dump(results, f, indent=2, default=str)
-        
-        # Save as latest
-        latest_path = os.path.join(local_path, "latest.json")
-        with open(latest_path, "w") as f:
-            json.dump(results, f, indent=2, default=str)
-        
-        return f"file://{file_path}"
+        return await self.local.save_search_results(session_id, results)
     
     async def get_search_results(self, session_id: str) -> Optional[Dict]:
         """Get latest search results for session"""
-        blob_name = f"results/{session_id}/latest.json"
-        
-        if self.blob_service_client:
+        if self.azure_enabled:
             try:
-                blob_client = self.blob_service_client.get_blob_client(
-                    container=self.container_name,
-                    blob=blob_name
-                )
-                content = blob_client.download_blob().readall()
-                return json.loads(content.decode('utf-8'))
-            except ResourceNotFoundError:
-                pass
+                results = await self._load_latest(session_id)
+                if results is not None:
+                    return results
             except Exception as e:
                 print(f"Azure download failed: {e}. Trying local storage.")
-        
-        # Fallback to local storage
-        file_path = os.path.join(self.local_storage_path, "results", session_id, "latest.json")
-        if os.path.exists(file_path):
-            with open(file_path, "r") as f:
-                return json.load(f)
-        
-        return None
+        return await self.local.get_search_results(session_id)
     
-    async def export_to_csv(self, results: Dict) -> str:
-        """Export search results to CSV file"""
-        jobs = results.get("jobs", [])
-        
-        # Create temporary CSV file
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.csv') as f:
-            writer = csv.writer(f)
-            
-            # Write header
-            headers = [
-                "Title", "Company", "Location", "Match Score", "Semantic Score",
-                "Skill Match Score", "Filter Score", "Matched Skills", "Posted Date",
-                "Apply URL", "Source"
-            ]
-            writer.writerow(headers)
-            
-            # Write job data
-            for job in jobs:
-                row = [
-                    job.get("title", ""),
-                    job.get("company", ""),
-                    f"{job.get('city', '')}, {job.get('state', '')}",
-                    job.get("match_score", ""),
-                    job.get("semantic_score", ""),
-                    job.get("skill_match_score", ""),
-                    job.get("filter_score", ""),
-                    ", ".join(job.get("matched_skills", [])),
-                    job.get("posted_at", ""),
-                    job.get("apply_url", ""),
-                    job.get("source", "")
-                ]
-                writer.writerow(row)
-        
-        return f.name
+    async def get_search_results_page(self, session_id: str, offset: int, limit: int) -> Optional[Dict]:
+        """Latest search results, downloading only the page blobs that cover jobs[offset:offset + limit]"""
+        if self.azure_enabled:
+            try:
+                results = await self._load_latest(session_id, offset, limit)
+                if results is not None:
+                    return results
+            except Exception as e:
+                print(f"Azure download failed: {e}. Trying local storage.")
+        return await self.local.get_search_results_page(session_id, offset, limit)
+    
+    async def _load_latest(self, session_id: str, offset: int = 0, limit: Optional[int] = None) -> Optional[Dict]:
+        content = await self._download(f"results/{session_id}/latest.json")
+        if content is None:
+            return None
+        latest = serializer.loads(content)
+        # Blobs written before the pointer format hold a full copy of the results
+        if set(latest) != {LATEST_REF}:
+            return latest if limit is None else page_results(latest, offset, limit)
+        return await self._load_run(latest[LATEST_REF], offset, limit)
+    
+    async def _load_run(self, blob_name: str, offset: int = 0, limit: Optional[int] = None) -> Optional[Dict]:
+        """One search_<timestamp>.json run with its jobs (all, or ``limit`` from ``offset``) read from the page blobs"""
+        content = await self._download(blob_name)
+        if content is None:
+            return None
+        results = await self._run(serializer.loads, content)
+        layout = results.pop("job_pages", None)
+        if layout is None:
+            # Runs saved before paging keep their jobs inline
+            return results if limit is None else page_results(results, offset, limit)
+        count, size = layout["count"], layout["page_size"]
+        end = count if limit is None else min(count, offset + limit)
+        first = offset // size
+        prefix = _page_prefix(blob_name)
+        pages = await asyncio.gather(*[
+            self._download(f"{prefix}{i:05d}.json") for i in range(first, (end - 1) // size + 1)
+        ]) if end > offset else []
+        jobs = await self._run(_decode_pages, pages)
+        results["jobs"] = jobs[offset - first * size:end - first * size]
+        if limit is not None:
+            results["stored_jobs"] = count
+        return results
+    
+    async def top_jobs(self, session_id: str, limit: int = 50, since: Optional[float] = None) -> List[Dict]:
+        """Best-scoring distinct jobs across the session's search_<timestamp>.json blobs since ``since``"""
+        if self.azure_enabled:
+            try:
+                names = await self._list_names(f"results/{session_id}/search_")
+                if since:
+                    names = [name for name in names if _run_time(name) >= since]
+                loaded = await asyncio.gather(*[self._load_run(name) for name in names])
+                runs = [(_run_time(name), results) for name, results in zip(names, loaded) if results is not None]
+                return _merge_top_jobs(runs, limit)
+            except Exception as e:
+                print(f"Azure download failed: {e}. Trying local storage.")
+        return await self.local.top_jobs(session_id, limit, since)
     
+    async def list_archivable_runs(self, before: float) -> List[Dict]:
+        """search_<timestamp>.json blobs older than ``before``; each session's newest (latest.json's target) is kept"""
+        if not self.azure_enabled:
+            return await self.local.list_archivable_runs(before)
+        by_session: Dict[str, List[str]] = {}
+        for name in await self._list_names("results/"):
+            parts = name.split("/")
+            if len(parts) == 3 and parts[2].startswith("search_"):
+                by_session.setdefault(parts[1], []).append(name)
+        runs = []
+        for session_id, names in by_session.items():
+            # Timestamped names sort chronologically
+            for name in sorted(names)[:-1]:
+                created_at = _run_time(name)
+                if created_at < before:
+                    runs.append({"session_id": session_id, "run_id": name, "created_at": created_at})
+        return sorted(runs, key=lambda run: run["created_at"])
+
+    async def load_run_jobs(self, run: Dict) -> List[Dict]:
+        if not self.azure_enabled:
+            return await self.local.load_run_jobs(run)
+        results = await self._load_run(run["run_id"])
+        return results.get("jobs", []) if results is not None else []
+
+    async def delete_runs(self, runs: List[Dict]):
+        if not self.azure_enabled:
+            return await self.local.delete_runs(runs)
+        pages = await asyncio.gather(*[self._list_names(_page_prefix(run["run_id"])) for run in runs])
+        await self._delete_blobs([run["run_id"] for run in runs] + [name for names in pages for name in names])
+
     async def delete_session(self, session_id: str):
         """Delete all data for a session"""
-        if self.blob_service_client:
+        if self.azure_enabled:
             try:
-                # List and delete all blobs for this session
-                blob_list = self.blob_service_client.get_container_client(
-                    self.container_name
-                ).list_blobs(name_starts_with=f"resumes/{session_id}/")
-                
-                for blob in blob_list:
-                    self.blob_service_client.delete_blob(
-                        container=self.container_name,
-                        blob=blob.name
-                    )
-                
-                # Delete profiles and results
-                for prefix in [f"profiles/{session_id}/", f"results/{session_id}/"]:
-                    blob_list = self.blob_service_client.get_container_client(
-                        self.container_name
-                    ).list_blobs(name_starts_with=prefix)
-                    
-                    for blob in blob_list:
-                        self.blob_service_client.delete_blob(
-                            container=self.container_name,
-                            blob=blob.name
-                        )
+                # List the three prefixes concurrently, then delete in batches
+                listings = await asyncio.gather(*[
+                    self._list_names(f"{folder}/{session_id}/") for folder in ("resumes", "profiles", "results")
+                ])
+                await self._delete_blobs([name for names in listings for name in names])
             except Exception as e:
                 print(f"Azure deletion failed: {e}. Trying local storage.")
         
-        # Fallback: delete local storage
-        import shutil
-        for folder in ["resumes", "profiles", "results"]:
-            folder_path = os.path.join(self.local_storage_path, folder, session_id)
-            if os.path.exists(folder_path):
-                shutil.rmtree(folder_path)
+        # Local copies may exist from earlier fallbacks
+        await self.local.delete_session(session_id)
+        self._touched.pop(session_id, None)
+        await self._update_index(lambda manifest: remove(manifest, session_id))
     
-    async def list_sessions(self) -> List[str]:
-        """List all session IDs"""
-        sessions = set()
-        
-        if self.blob_service_client:
+    async def list_session_page(self, limit: Optional[int] = 100, offset: int = 0) -> Dict:
+        """One page of sessions, most recently used first, from a single read of the session index"""
+        if self.azure_enabled:
             try:
-                blob_list = self.blob_service_client.get_container_client(
-                    self.container_name
-                ).list_blobs(name_starts_with="profiles/")
-                
-                for blob in blob_list:
-                    session_id = blob.name.split('/')[1]
-                    sessions.add(session_id)
-                    
-                return list(sessions)
+                client = await self._client()
+                manifest, _ = await self._read_index(client.get_blob_client(self.container_name, INDEX_BLOB))
+                return page(manifest, limit or len(manifest["sessions"]), offset)
             except Exception as e:
                 print(f"Azure listing failed: {e}. Using local storage.")
+        return await self.local.list_session_page(limit, offset)
+    
+    async def _delete_blobs(self, names: List[str]):
+        """Blob batch deletes of up to 256 names, a few batches in flight at once"""
+        client = await self._client()
+        container = client.get_container_client(self.container_name)
+        limit = asyncio.Semaphore(self.delete_concurrency)
         
-        # Fallback: list local sessions
-        profiles_path = os.path.join(self.local_storage_path, "profiles")
-        if os.path.exists(profiles_path):
-            return [d for d in os.listdir(profiles_path) if os.path.isdir(os.path.join(profiles_path, d))]
+        async def delete_one(name: str):
+            try:
+                await container.delete_blob(name)
+            except ResourceNotFoundError:
+                pass
         
-        return []
-
-# Test/utility functions
-async def test_storage():
-    """Test storage functionality"""
-    storage = AzureBlobStorage()
-    
-    print("Testing Azure Blob Storage integration...")
-    
-    # Test session
-    test_session_id = "test-session-123"
-    
-    # Test resume profile
-    test_profile = {
-        "text": "Test resume content",
-        "skills": ["python", "aws", "docker"],
-        "experience_years": 5
-    }
-    
-    await storage.save_resume_profile(test_session_id, test_profile)
-    retrieved_profile = await storage.get_resume_profile(test_session_id)
+        async def delete_batch(batch: List[str]):
+            async with limit:
+                try:
+                    async for _ in await container.delete_blobs(*batch, raise_on_any_failure=False):
+                        pass
+                except Exception as e:
+                    # Batch API unavailable (some emulators/proxies): fall back to individual deletes
+                    print(f"Azure batch delete failed: {e}. Deleting blobs individually.")
+                    await asyncio.gather(*[delete_one(name) for name in batch])
+        
+        batches = [names[i:i + BATCH_DELETE_SIZE] for i in range(0, len(names), BATCH_DELETE_SIZE)]
+        await asyncio.gather(*[delete_batch(batch) for batch in batches])
     
-    print(f"Profile saved and retrieved: {retrieved_profile is not None}")
+    # Session index: one manifest blob instead of listing every profile blob (SQLite keeps its own sessions table)
+    async def _touch_session(self, session_id: str):
+        last = self._touched.get(session_id)
+        now = time.time()
+        if last is not None and now - last < TOUCH_INTERVAL_SECONDS:
+            return
+        await self._update_index(lambda manifest: touch(manifest, session_id, now))
+        self._touched[session_id] = now
     
-    # Test search results
-    test_results = {
-        "jobs": [{"title": "Test Job", "company": "Test Corp", "match_score": 85}],
-        "total_jobs": 1
-    }
+    async def _update_index(self, mutate):
+        """Read-modify-write of the index; an ETag precondition makes concurrent writers retry"""
+        if not self.azure_enabled:
+            return
+        try:
+            await self._update_blob_index(mutate)
+        except Exception as e:
+            # The index is derived data; never fail the request over it
+            print(f"Session index update failed: {e}")
     
-    await storage.save_search_results(test_session_id, test_results)
-    retrieved_results = await storage.get_search_results(test_session_id)
+    async def _update_blob_index(self, mutate):
+        client = await self._client()
+        blob_client = client.get_blob_client(self.container_name, INDEX_BLOB)
+        for _ in range(INDEX_UPDATE_ATTEMPTS):
+            manifest, etag = await self._read_index(blob_client)
+            # A freshly rebuilt index (no etag) is persisted even if this change was already in it
+            if not mutate(manifest) and etag is not None:
+                return
+            data = json.dumps(manifest).encode('utf-8')
+            try:
+                if etag is None:
+                    await blob_client.upload_blob(data, overwrite=False)
+                else:
+                    await blob_client.upload_blob(
+                        data, overwrite=True, etag=etag, match_condition=MatchConditions.IfNotModified
+                    )
+                return
+            except (ResourceExistsError, ResourceModifiedError):
+                continue  # another writer got there first: re-read and re-apply
+        print(f"Session index update gave up after {INDEX_UPDATE_ATTEMPTS} conflicting writes")
     
-    print(f"Results saved and retrieved: {retrieved_results is not None}")
+    async def _read_index(self, blob_client):
+        """(manifest, etag); a missing index is rebuilt from the session prefixes (etag None)"""
+        try:
+            downloader = await blob_client.download_blob()
+        except ResourceNotFoundError:
+            return await self._rebuild_blob_index(), None
+        return json.loads(await downloader.readall()), downloader.properties.etag
     
-    # List sessions
-    sessions = await storage.list_sessions()
-    print(f"Sessions found: {sessions}")
+    async def _rebuild_blob_index(self) -> Dict:
+        # One-time migration for containers written before the index existed: one entry per profiles/<id>/ prefix
+        client = await self._client()
+        container = client.get_container_client(self.container_name)
+        manifest = empty_manifest()
+        now = time.time()
+        async for prefix in container.walk_blobs(name_starts_with="profiles/", delimiter="/"):
+            session_id = prefix.name.split('/')[1]
+            manifest["sessions"][session_id] = {"created_at": now, "last_used": now}
+        return manifest
     
-    # Cleanup
-    await storage.delete_session(test_session_id)
-    print("Test cleanup completed")
+def _run_time(blob_name: str) -> float:
+    """Epoch seconds from results/<session>/search_<%Y%m%d_%H%M%S>.json"""
+    stamp = blob_name.rsplit("search_", 1)[1][:-len(".json")]
+    return datetime.strptime(stamp, "%Y%m%d_%H%M%S").timestamp()
+
+
+def _page_prefix(blob_name: str) -> str:
+    """results/<session>/search_<ts>.json -> results/<session>/pages/search_<ts>/ (outside the search_ listing prefix)"""
+    folder, name = blob_name.rsplit("/", 1)
+    return f"{folder}/pages/{name[:-len('.json')]}/"
+
+
+def _encode_pages(jobs: List[Dict]) -> List[bytes]:
+    return [serializer.dumps(jobs[i:i + RESULT_PAGE_SIZE]) for i in range(0, len(jobs), RESULT_PAGE_SIZE)]
+
+
+def _decode_pages(pages: List[Optional[bytes]]) -> List[Dict]:
+    if any(page is None for page in pages):
+        raise ValueError("search results page blob is missing")
+    return [job for page in pages for job in serializer.loads(page)]
+
+
+def _merge_top_jobs(runs, limit: int) -> List[Dict]:
+    """runs: [(run time, results)]; best score per job id, highest first (same shape as SQLiteStorage.top_jobs)"""
+    best: Dict = {}
+    for found_at, results in runs:
+        for job in results.get("jobs", []):
+            key = job.get("id") or id(job)
+            if key not in best or (job.get("match_score") or 0) > (best[key].get("match_score") or 0):
+                best[key] = {**job, "found_at": found_at}
+    return sorted(best.values(), key=lambda job: job.get("match_score") or 0, reverse=True)[:limit]
+
+
+class CachedStorage(StorageBackend):
+    """Read-through LRU/TTL cache of profiles and latest search results in front of another backend
+
+    Saves write through and deletes invalidate, so this process never serves its own stale data.
+    Each API worker has its own cache: a write made by another worker becomes visible here
+    within ``ttl_seconds`` at the latest. Cached dicts are shared; callers must not mutate them.
+    """
+
+    def __init__(self, backend: StorageBackend, max_entries: int = 256, ttl_seconds: float = 60):
+        self.backend = backend
+        self.executor = backend.executor
+        self.profiles = TTLCache(max_entries, ttl_seconds)
+        self.results = TTLCache(max_entries, ttl_seconds)
+        # Concurrent misses for the same session share one backend read
+        self._flight = SingleFlight()
+        # Bumped on every write/delete: a read that started before it must not repopulate the cache
+        self._generation: Dict[str, int] = {}
+
+    @classmethod
+    def from_env(cls, backend: StorageBackend) -> "CachedStorage":
+        return cls(
+            backend,
+            max_entries=int(os.getenv("STORAGE_CACHE_MAX_ENTRIES", "256")),
+            ttl_seconds=float(os.getenv("STORAGE_CACHE_TTL_SECONDS", "60")),
+        )
+
+    async def _read_through(self, cache: TTLCache, kind: str, session_id: str, load):
+        value = cache.get(session_id)
+        if value is not None:
+            metrics.inc("jobtracker_cache_hits_total", cache=f"storage_{kind}")
+            return value
+        metrics.inc("jobtracker_cache_misses_total", cache=f"storage_{kind}")
+        generation = self._generation.get(session_id, 0)
+        value, _ = await self._flight.do((kind, session_id), lambda: load(session_id))
+        if value is not None and self._generation.get(session_id, 0) == generation:
+            cache.set(session_id, value)
+        return value
+
+    def _written(self, session_id: str):
+        self._generation[session_id] = self._generation.get(session_id, 0) + 1
+
+    async def upload_resume(self, session_id: str, filename: str, content: Union[bytes, BinaryIO],
+                            length: Optional[int] = None) -> str:
+        return await self.backend.upload_resume(session_id, filename, content, length)
+
+    async def save_resume_profile(self, session_id: str, resume_profile: Dict) -> str:
+        self._written(session_id)
+        self.profiles.invalidate(session_id)
+        url = await self.backend.save_resume_profile(session_id, resume_profile)
+        self.profiles.set(session_id, resume_profile)
+        return url
+
+    async def save_resume_text(self, session_id: str, text: str) -> str:
+        return await self.backend.save_resume_text(session_id, text)
+
+    async def get_resume_text(self, session_id: str) -> Optional[str]:
+        return await self.backend.get_resume_text(session_id)
+
+    async def get_resume_profile(self, session_id: str) -> Optional[Dict]:
+        return await self._read_through(self.profiles, "profile", session_id, self.backend.get_resume_profile)
+
+    async def save_search_results(self, session_id: str, results: Dict) -> str:
+        self._written(session_id)
+        self.results.invalidate(session_id)
+        url = await self.backend.save_search_results(session_id, results)
+        self.results.set(session_id, results)
+        return url
+
+    async def get_search_results(self, session_id: str) -> Optional[Dict]:
+        return await self._read_through(self.results, "results", session_id, self.backend.get_search_results)
+
+    async def get_search_results_page(self, session_id: str, offset: int, limit: int) -> Optional[Dict]:
+        # Slice a cached full result set; a miss reads just the range and leaves the cache alone
+        results = self.results.get(session_id)
+        if results is not None:
+            metrics.inc("jobtracker_cache_hits_total", cache="storage_results")
+            return page_results(results, offset, limit)
+        return await self.backend.get_search_results_page(session_id, offset, limit)
+
+    async def top_jobs(self, session_id: str, limit: int = 50, since: Optional[float] = None) -> List[Dict]:
+        return await self.backend.top_jobs(session_id, limit, since)
+
+    async def delete_session(self, session_id: str):
+        self._written(session_id)
+        self.profiles.invalidate(session_id)
+        self.results.invalidate(session_id)
+        await self.backend.delete_session(session_id)
+
+    async def list_session_page(self, limit: Optional[int] = 100, offset: int = 0) -> Dict:
+        return await self.backend.list_session_page(limit, offset)
+
+    # Compaction never touches a session's latest run, so cached entries stay valid
+    async def list_archivable_runs(self, before: float) -> List[Dict]:
+        return await self.backend.list_archivable_runs(before)
+
+    async def load_run_jobs(self, run: Dict) -> List[Dict]:
+        return await self.backend.load_run_jobs(run)
+
+    async def delete_runs(self, runs: List[Dict]):
+        await self.backend.delete_runs(runs)
+
+    async def close(self):
+        await self.backend.close()
+
+    def stats(self) -> Dict:
+        return {"profiles": self.profiles.stats(), "results": self.results.stats(),
+                "coalesced": self._flight.coalesced}
+
+
+def create_storage(executor=None) -> StorageBackend:
+    """SQLite unless an Azure connection string is configured; STORAGE_BACKEND=sqlite|azure overrides
+
+    Wrapped in a CachedStorage unless STORAGE_CACHE_MAX_ENTRIES=0.
+    """
+    backend = os.getenv("STORAGE_BACKEND", "").lower()
+    if backend == "sqlite":
+        storage = SQLiteStorage(executor=executor)
+    elif backend == "azure" or (AZURE_AVAILABLE and os.getenv("AZURE_STORAGE_CONNECTION_STRING")):
+        storage = AzureBlobStorage(executor=executor)
+    else:
+        storage = SQLiteStorage(executor=executor)
+    if int(os.getenv("STORAGE_CACHE_MAX_ENTRIES", "256")) > 0:
+        return CachedStorage.from_env(storage)
+    return storage
 
-if __name__ == "__main__":
-    import asyncio
-    asyncio.run(test_storage())
@@ -0,0 +1,92 @@
+"""
+Storage interface shared by the Azure Blob and SQLite backends
+The API only talks to these async methods; api.storage.create_storage picks the backend
+"""
+import asyncio
+from abc import ABC, abstractmethod
+from typing import BinaryIO, Dict, List, Optional, Union
+
+
+class StorageBackend(ABC):
+    """Async storage for resumes, parsed profiles and search results, keyed by session"""
+
+    executor = None
+
+    async def _run(self, fn, *args):
+        # Blocking work goes to the bounded I/O executor (api.executors) when one was given
+        if self.executor is not None:
+            return await self.executor.run(fn, *args)
+        return await asyncio.to_thread(fn, *args)
+
+    @abstractmethod
+    async def upload_resume(self, session_id: str, filename: str, content: Union[bytes, BinaryIO],
+                            length: Optional[int] = None) -> str:
+        """Store the resume file (bytes or a rewound file-like object); returns its URL"""
+
+    @abstractmethod
+    async def save_resume_profile(self, session_id: str, resume_profile: Dict) -> str:
+        """Save parsed resume profile"""
+
+    @abstractmethod
+    async def save_resume_text(self, session_id: str, text: str) -> str:
+        """Save extracted resume text next to the (compact) profile"""
+
+    @abstractmethod
+    async def get_resume_text(self, session_id: str) -> Optional[str]:
+        """Extracted resume text saved by save_resume_text"""
+
+    @abstractmethod
+    async def get_resume_profile(self, session_id: str) -> Optional[Dict]:
+        """Retrieve resume profile by session ID"""
+
+    @abstractmethod
+    async def save_search_results(self, session_id: str, results: Dict) -> str:
+        """Save one search run"""
+
+    @abstractmethod
+    async def get_search_results(self, session_id: str) -> Optional[Dict]:
+        """Get latest search results for session"""
+
+    async def get_search_results_page(self, session_id: str, offset: int, limit: int) -> Optional[Dict]:
+        """Latest search results with only jobs[offset:offset + limit]; ``stored_jobs`` counts all saved jobs"""
+        results = await self.get_search_results(session_id)
+        return page_results(results, offset, limit) if results is not None else None
+
+    @abstractmethod
+    async def top_jobs(self, session_id: str, limit: int = 50, since: Optional[float] = None) -> List[Dict]:
+        """Best-scoring distinct jobs across the session's search runs since ``since`` (epoch seconds)"""
+
+    @abstractmethod
+    async def delete_session(self, session_id: str):
+        """Delete all data for a session"""
+
+    @abstractmethod
+    async def list_session_page(self, limit: Optional[int] = 100, offset: int = 0) -> Dict:
+        """{"sessions": [{session_id, created_at, last_used}], "total", "next_offset"}, most recently used first"""
+
+    # History compaction (api.compaction): runs are {"session_id", "run_id", "created_at"} dicts
+    @abstractmethod
+    async def list_archivable_runs(self, before: float) -> List[Dict]:
+        """Search runs created before ``before``, never including a session's latest run"""
+
+    @abstractmethod
+    async def load_run_jobs(self, run: Dict) -> List[Dict]:
+        """Ranked jobs of one run from ``list_archivable_runs``"""
+
+    @abstractmethod
+    async def delete_runs(self, runs: List[Dict]):
+        """Drop runs once they are archived"""
+
+    async def list_sessions(self) -> List[str]:
+        """List all session IDs"""
+        listing = await self.list_session_page(limit=None)
+        return [entry["session_id"] for entry in listing["sessions"]]
+
+    async def close(self):
+        """Release connections (API shutdown)"""
+
+
+def page_results(results: Dict, offset: int, limit: int) -> Dict:
+    """Copy of a full results dict holding one slice of its jobs"""
+    jobs = results.get("jobs", [])
+    return {**results, "jobs": jobs[offset:offset + limit], "stored_jobs": len(jobs)}
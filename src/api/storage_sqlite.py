@@ -0,0 +1,349 @@
+"""
+SQLite storage backend
+Sessions, profiles, search runs and per-job result rows in one WAL-mode database, indexed for history queries
+"""
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import BinaryIO, Dict, Iterator, List, Optional, Union
+
+from api.serialization import serializer
+from api.storage_base import StorageBackend
+from jobtracker.config import data_path
+
+CHUNK_SIZE = 1024 * 1024
+# Keys of a results dict that have their own columns; anything else is kept in search_runs.extra
+RUN_FIELDS = ("search_params", "total_jobs", "filtered_jobs", "jobs", "timestamp")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_last_used ON sessions (last_used DESC);
+
+CREATE TABLE IF NOT EXISTS resumes (
+    session_id TEXT NOT NULL REFERENCES sessions (session_id) ON DELETE CASCADE,
+    filename TEXT NOT NULL,
+    content BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    uploaded_at REAL NOT NULL,
+    PRIMARY KEY (session_id, filename)
+);
+
+CREATE TABLE IF NOT EXISTS profiles (
+    session_id TEXT PRIMARY KEY REFERENCES sessions (session_id) ON DELETE CASCADE,
+    profile BLOB,
+    resume_text TEXT,
+    updated_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS search_runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL REFERENCES sessions (session_id) ON DELETE CASCADE,
+    created_at REAL NOT NULL,
+    timestamp TEXT,
+    search_params TEXT,
+    total_jobs INTEGER,
+    filtered_jobs INTEGER,
+    extra BLOB
+);
+CREATE INDEX IF NOT EXISTS idx_runs_session_time ON search_runs (session_id, created_at DESC);
+
+CREATE TABLE IF NOT EXISTS job_results (
+    run_id INTEGER NOT NULL REFERENCES search_runs (run_id) ON DELETE CASCADE,
+    session_id TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    rank INTEGER NOT NULL,
+    job_id TEXT,
+    match_score REAL,
+    job BLOB NOT NULL,
+    PRIMARY KEY (run_id, rank)
+);
+-- top-N per session walks this index in score order; created_at in the key filters without touching rows
+CREATE INDEX IF NOT EXISTS idx_results_session_score ON job_results (session_id, match_score DESC, created_at);
+"""
+
+
+class SQLiteStorage(StorageBackend):
+    """Local storage backend; every call opens a short-lived connection on the I/O executor"""
+
+    def __init__(self, path: Optional[str] = None, executor=None):
+        self.executor = executor
+        self.path = os.path.abspath(path or os.getenv("STORAGE_SQLITE_PATH") or data_path("jobtracker.db"))
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._connect() as conn:
+            # WAL persists in the file: readers no longer block the writer (or each other)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.execute("PRAGMA synchronous=NORMAL")  # safe with WAL; fsync at checkpoints only
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _url(self, *parts: str) -> str:
+        return f"sqlite://{self.path}#{'/'.join(parts)}"
+
+    @staticmethod
+    def _touch(conn: sqlite3.Connection, session_id: str, now: Optional[float] = None):
+        now = now if now is not None else time.time()
+        conn.execute(
+            "INSERT INTO sessions (session_id, created_at, last_used) VALUES (?, ?, ?) "
+            "ON CONFLICT (session_id) DO UPDATE SET last_used = excluded.last_used",
+            (session_id, now, now),
+        )
+
+    # Blocking implementations (run on the executor)
+    def _upload_resume(self, session_id: str, filename: str, content: Union[bytes, BinaryIO],
+                       length: Optional[int] = None) -> str:
+        now = time.time()
+        with self._connect() as conn:
+            self._touch(conn, session_id, now)
+            if isinstance(content, bytes):
+                conn.execute(
+                    "INSERT OR REPLACE INTO resumes (session_id, filename, content, size, uploaded_at) VALUES (?, ?, ?, ?, ?)",
+                    (session_id, filename, content, len(content), now),
+                )
+            else:
+                if length is None:
+                    length = content.seek(0, os.SEEK_END)
+                    content.seek(0)
+                # Reserve the blob, then stream into it: the file is never held in memory whole
+                cursor = conn.execute(
+                    "INSERT OR REPLACE INTO resumes (session_id, filename, content, size, uploaded_at) VALUES (?, ?, zeroblob(?), ?, ?)",
+                    (session_id, filename, length, length, now),
+                )
+                with conn.blobopen("resumes", "content", cursor.lastrowid) as blob:
+                    while True:
+                        chunk = content.read(CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        blob.write(chunk)
+        return self._url("resumes", session_id, filename)
+
+    def _save_profile_column(self, session_id: str, column: str, value: Union[str, bytes]) -> str:
+        now = time.time()
+        with self._connect() as conn:
+            self._touch(conn, session_id, now)
+            conn.execute(
+                f"INSERT INTO profiles (session_id, {column}, updated_at) VALUES (?, ?, ?) "
+                f"ON CONFLICT (session_id) DO UPDATE SET {column} = excluded.{column}, updated_at = excluded.updated_at",
+                (session_id, value, now),
+            )
+        return self._url("profiles", session_id, column)
+
+    def _get_resume_profile(self, session_id: str) -> Optional[Dict]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT profile FROM profiles WHERE session_id = ?", (session_id,)).fetchone()
+        return serializer.loads(row[0]) if row and row[0] else None
+
+    def _get_resume_text(self, session_id: str) -> Optional[str]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT resume_text FROM profiles WHERE session_id = ?", (session_id,)).fetchone()
+        return row[0] if row else None
+
+    def _save_search_results(self, session_id: str, results: Dict) -> str:
+        now = time.time()
+        jobs = results.get("jobs", [])
+        extra = {k: v for k, v in results.items() if k not in RUN_FIELDS}
+        with self._connect() as conn:
+            self._touch(conn, session_id, now)
+            cursor = conn.execute(
+                "INSERT INTO search_runs (session_id, created_at, timestamp, search_params, total_jobs, filtered_jobs, extra) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    session_id, now, results.get("timestamp") or datetime.now().isoformat(),
+                    json.dumps(results.get("search_params"), default=str),
+                    results.get("total_jobs"), results.get("filtered_jobs"),
+                    serializer.dumps(extra) if extra else None,
+                ),
+            )
+            run_id = cursor.lastrowid
+            conn.executemany(
+                "INSERT INTO job_results (run_id, session_id, created_at, rank, job_id, match_score, job) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (run_id, session_id, now, rank, job.get("id"), job.get("match_score"), serializer.dumps(job))
+                    for rank, job in enumerate(jobs)
+                ),
+            )
+        return self._url("search_runs", str(run_id))
+
+    def _get_search_results(self, session_id: str, offset: int = 0, limit: Optional[int] = None) -> Optional[Dict]:
+        """Latest run; with ``limit``, only the jobs ranked offset..offset+limit-1 are read"""
+        with self._connect() as conn:
+            run = conn.execute(
+                "SELECT run_id, timestamp, search_params, total_jobs, filtered_jobs, extra FROM search_runs "
+                "WHERE session_id = ? ORDER BY created_at DESC, run_id DESC LIMIT 1",
+                (session_id,),
+            ).fetchone()
+            if run is None:
+                return None
+            run_id, timestamp, search_params, total_jobs, filtered_jobs, extra = run
+            # Range scan on the (run_id, rank) primary key
+            jobs = [
+                serializer.loads(job)
+                for (job,) in conn.execute(
+                    "SELECT job FROM job_results WHERE run_id = ? AND rank >= ? ORDER BY rank LIMIT ?",
+                    (run_id, offset, -1 if limit is None else limit),
+                )
+            ]
+            stored_jobs = None
+            if limit is not None:
+                (stored_jobs,) = conn.execute("SELECT COUNT(*) FROM job_results WHERE run_id = ?", (run_id,)).fetchone()
+        results = serializer.loads(extra) if extra else {}
+        results.update({
+            "search_params": json.loads(search_params) if search_params else None,
+            "total_jobs": total_jobs,
+            "filtered_jobs": filtered_jobs,
+            "jobs": jobs,
+            "timestamp": timestamp,
+        })
+        if stored_jobs is not None:
+            results["stored_jobs"] = stored_jobs
+        return results
+
+    def _top_jobs(self, session_id: str, limit: int, since: Optional[float]) -> List[Dict]:
+        # Walks idx_results_session_score best-first; a job seen in several runs counts once (its best score)
+        top: List[Dict] = []
+        seen = set()
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT job_id, job, created_at FROM job_results "
+                "WHERE session_id = ? AND created_at >= ? ORDER BY match_score DESC",
+                (session_id, since or 0),
+            )
+            for job_id, job, created_at in rows:
+                if job_id is not None and job_id in seen:
+                    continue
+                seen.add(job_id)
+                top.append({**serializer.loads(job), "found_at": created_at})
+                if len(top) >= limit:
+                    break
+        return top
+
+    def _list_archivable_runs(self, before: float) -> List[Dict]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT session_id, run_id, created_at FROM search_runs AS r WHERE created_at < ? AND run_id != ("
+                "  SELECT run_id FROM search_runs WHERE session_id = r.session_id ORDER BY created_at DESC, run_id DESC LIMIT 1"
+                ") ORDER BY created_at",
+                (before,),
+            ).fetchall()
+        return [{"session_id": s, "run_id": str(r), "created_at": c} for s, r, c in rows]
+
+    def _load_run_jobs(self, run_id: str) -> List[Dict]:
+        with self._connect() as conn:
+            return [
+                serializer.loads(job)
+                for (job,) in conn.execute("SELECT job FROM job_results WHERE run_id = ? ORDER BY rank", (int(run_id),))
+            ]
+
+    def _delete_runs(self, run_ids: List[int]):
+        with self._connect() as conn:
+            # Cascades to job_results
+            conn.executemany("DELETE FROM search_runs WHERE run_id = ?", ((run_id,) for run_id in run_ids))
+
+    def _delete_session(self, session_id: str):
+        with self._connect() as conn:
+            # Cascades to resumes, profiles, search_runs and job_results
+            conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+            conn.execute("DELETE FROM job_results WHERE session_id = ?", (session_id,))
+
+    def _list_session_page(self, limit: Optional[int], offset: int) -> Dict:
+        with self._connect() as conn:
+            total = conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+            rows = conn.execute(
+                "SELECT session_id, created_at, last_used FROM sessions ORDER BY last_used DESC LIMIT ? OFFSET ?",
+                (limit if limit is not None else -1, offset),
+            ).fetchall()
+        next_offset = offset + len(rows)
+        return {
+            "sessions": [{"session_id": s, "created_at": c, "last_used": u} for s, c, u in rows],
+            "total": total,
+            "next_offset": next_offset if next_offset < total else None,
+        }
+
+    # Async interface
+    async def upload_resume(self, session_id: str, filename: str, content: Union[bytes, BinaryIO],
+                            length: Optional[int] = None) -> str:
+        return await self._run(self._upload_resume, session_id, filename, content, length)
+
+    async def save_resume_profile(self, session_id: str, resume_profile: Dict) -> str:
+        return await self._run(self._save_profile_column, session_id, "profile", serializer.dumps(resume_profile))
+
+    async def save_resume_text(self, session_id: str, text: str) -> str:
+        return await self._run(self._save_profile_column, session_id, "resume_text", text)
+
+    async def get_resume_text(self, session_id: str) -> Optional[str]:
+        return await self._run(self._get_resume_text, session_id)
+
+    async def get_resume_profile(self, session_id: str) -> Optional[Dict]:
+        return await self._run(self._get_resume_profile, session_id)
+
+    async def save_search_results(self, session_id: str, results: Dict) -> str:
+        return await self._run(self._save_search_results, session_id, results)
+
+    async def get_search_results(self, session_id: str) -> Optional[Dict]:
+        return await self._run(self._get_search_results, session_id)
+
+    async def get_search_results_page(self, session_id: str, offset: int, limit: int) -> Optional[Dict]:
+        return await self._run(self._get_search_results, session_id, offset, limit)
+
+    async def top_jobs(self, session_id: str, limit: int = 50, since: Optional[float] = None) -> List[Dict]:
+        return await self._run(self._top_jobs, session_id, limit, since)
+
+    async def delete_session(self, session_id: str):
+        return await self._run(self._delete_session, session_id)
+
+    async def list_session_page(self, limit: Optional[int] = 100, offset: int = 0) -> Dict:
+        return await self._run(self._list_session_page, limit, offset)
+
+    async def list_archivable_runs(self, before: float) -> List[Dict]:
+        return await self._run(self._list_archivable_runs, before)
+
+    async def load_run_jobs(self, run: Dict) -> List[Dict]:
+        return await self._run(self._load_run_jobs, run["run_id"])
+
+    async def delete_runs(self, runs: List[Dict]):
+        return await self._run(self._delete_runs, [int(run["run_id"]) for run in runs])
+
+    def import_json_tree(self, root: str) -> int:
+        """Load a legacy file-based storage directory (profiles/<id>/profile.json, results/<id>/search_*.json)"""
+        imported = 0
+        for session_id in sorted(os.listdir(os.path.join(root, "profiles"))) if os.path.isdir(os.path.join(root, "profiles")) else []:
+            folder = os.path.join(root, "profiles", session_id)
+            if os.path.exists(os.path.join(folder, "profile.json")):
+                with open(os.path.join(folder, "profile.json")) as f:
+                    self._save_profile_column(session_id, "profile", serializer.dumps(json.load(f)))
+            if os.path.exists(os.path.join(folder, "resume.txt")):
+                with open(os.path.join(folder, "resume.txt")) as f:
+                    self._save_profile_column(session_id, "resume_text", f.read())
+            results_folder = os.path.join(root, "results", session_id)
+            if os.path.isdir(results_folder):
+                for name in sorted(n for n in os.listdir(results_folder) if n.startswith("search_")):
+                    with open(os.path.join(results_folder, name)) as f:
+                        self._save_search_results(session_id, json.load(f))
+            imported += 1
+        return imported
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) != 2:
+        print("Usage: python -m api.storage_sqlite <legacy storage dir>")
+        sys.exit(1)
+    count = SQLiteStorage().import_json_tree(sys.argv[1])
+    print(f"Imported {count} sessions")
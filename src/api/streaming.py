@@ -0,0 +1,56 @@
+"""
+NDJSON streaming of ranked search results
+Cursor-based pagination and field selection for GET /search-results/{session_id}/stream
+"""
+import base64
+import json
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+
+def encode_cursor(run_timestamp: str, offset: int) -> str:
+    payload = json.dumps({"ts": run_timestamp, "offset": offset}).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """(run timestamp, offset) encoded in ``cursor``"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return payload.get("ts"), max(int(payload["offset"]), 0)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def check_cursor_run(cursor_timestamp: str, run_timestamp: str):
+    """Rejects cursors issued for a different search run"""
+    if cursor_timestamp != run_timestamp:
+        raise HTTPException(status_code=410, detail="Search results changed since this cursor was issued; restart without a cursor")
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    if not fields:
+        return None
+    return [f.strip() for f in fields.split(",") if f.strip()]
+
+
+def select_fields(job: Dict, fields: Optional[List[str]]) -> Dict:
+    """Project a job onto the requested fields; dotted names reach into nested dicts (raw.job_description)"""
+    if fields is None:
+        return job
+    selected = {}
+    for name in fields:
+        value = job
+        for part in name.split("."):
+            value = value.get(part) if isinstance(value, dict) else None
+        selected[name] = value
+    return selected
+
+
+def iter_ndjson(jobs: Iterable[Dict], fields: Optional[List[str]], start_rank: int) -> Iterator[bytes]:
+    """One JSON object per line, serialized lazily as the response is written"""
+    for rank, job in enumerate(jobs, start_rank + 1):
+        record = select_fields(job, fields)
+        record = {"rank": rank, **record}
+        yield (json.dumps(record, default=str) + "\n").encode("utf-8")
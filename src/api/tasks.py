@@ -0,0 +1,156 @@
+"""
+Background search tasks for the API
+POST /search-jobs?mode=async queues a task; clients poll /tasks/{id} or follow /tasks/{id}/events (SSE)
+"""
+import asyncio
+import json
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from api.executors import Overloaded
+
+TERMINAL_EVENTS = ("completed", "failed")
+
+
+@dataclass
+class SearchTask:
+    """State of one queued/running search, plus its event history for late subscribers"""
+    id: str
+    session_id: str
+    status: str = "queued"
+    stage: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+    partial_results: List[Dict] = field(default_factory=list)
+    result: Optional[Dict] = None
+    error: Optional[str] = None
+    events: List[Dict] = field(default_factory=list)
+    subscribers: List[asyncio.Queue] = field(default_factory=list)
+
+    @property
+    def done(self) -> bool:
+        return self.status in TERMINAL_EVENTS
+
+    def to_dict(self) -> Dict:
+        return {
+            "task_id": self.id,
+            "session_id": self.session_id,
+            "status": self.status,
+            "stage": self.stage,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "partial_results": self.partial_results,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+# A runner receives the task and an emit(event, **data) callback and returns the final result
+TaskRunner = Callable[[SearchTask, Callable[..., None]], Awaitable[Dict]]
+
+
+class TaskManager:
+    """In-process task queue drained by a fixed pool of worker coroutines"""
+
+    def __init__(self, workers: int = 2, max_queued: int = 32, ttl_seconds: int = 3600):
+        self.workers = workers
+        self.max_queued = max_queued
+        self.ttl_seconds = ttl_seconds
+        self.tasks: Dict[str, SearchTask] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+    async def start(self):
+        self._queue = asyncio.Queue(maxsize=self.max_queued)
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def submit(self, session_id: str, runner: TaskRunner) -> SearchTask:
+        self._expire()
+        task = SearchTask(id=str(uuid.uuid4()), session_id=session_id)
+        try:
+            self._queue.put_nowait((task, runner))
+        except asyncio.QueueFull:
+            raise Overloaded("task", status_code=429)
+        self.tasks[task.id] = task
+        self.emit(task, "queued")
+        return task
+
+    def get(self, task_id: str) -> Optional[SearchTask]:
+        return self.tasks.get(task_id)
+
+    def emit(self, task: SearchTask, event: str, **data):
+        """Record an event on the task and fan it out to SSE subscribers"""
+        now = time.time()
+        task.updated_at = now
+        if event in TERMINAL_EVENTS:
+            task.status = event
+        elif event != "queued":
+            task.status = "running"
+        if event == "stage":
+            task.stage = data.get("stage")
+        elif event == "partial":
+            task.partial_results = data.get("top_jobs", [])
+        entry = {"event": event, "time": now, **data}
+        task.events.append(entry)
+        for queue in task.subscribers:
+            queue.put_nowait(entry)
+
+    async def subscribe(self, task: SearchTask, keepalive: float = 15.0) -> AsyncIterator[Optional[Dict]]:
+        """Replay the task's events, then follow new ones until it finishes (None = keepalive)"""
+        queue: asyncio.Queue = asyncio.Queue()
+        task.subscribers.append(queue)
+        try:
+            history = list(task.events)
+            for entry in history:
+                yield entry
+            if any(entry["event"] in TERMINAL_EVENTS for entry in history):
+                return
+            while True:
+                try:
+                    entry = await asyncio.wait_for(queue.get(), timeout=keepalive)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                yield entry
+                if entry["event"] in TERMINAL_EVENTS:
+                    return
+        finally:
+            task.subscribers.remove(queue)
+
+    async def _worker(self):
+        while True:
+            task, runner = await self._queue.get()
+            try:
+                self.emit(task, "started")
+                task.result = await runner(task, lambda event, **data: self.emit(task, event, **data))
+                self.emit(task, "completed", result_summary={
+                    "total_jobs": task.result.get("total_jobs"),
+                    "filtered_jobs": task.result.get("filtered_jobs"),
+                })
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                task.error = getattr(e, "detail", None) or str(e)
+                self.emit(task, "failed", error=task.error)
+            finally:
+                self._queue.task_done()
+
+    def _expire(self):
+        cutoff = time.time() - self.ttl_seconds
+        for task_id in [t.id for t in self.tasks.values() if t.done and t.updated_at < cutoff]:
+            del self.tasks[task_id]
+
+
+def format_sse(entry: Optional[Dict]) -> str:
+    """Server-sent event frame; None becomes a keepalive comment"""
+    if entry is None:
+        return ": keepalive\n\n"
+    return f"event: {entry['event']}\ndata: {json.dumps(entry, default=str)}\n\n"
@@ -0,0 +1,100 @@
+"""
+Streaming resume uploads
+Size cap enforced while the request body streams in, one hashing pass over the spooled file, no in-memory copies
+"""
+import hashlib
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass
+from typing import BinaryIO, Iterable
+
+from fastapi import HTTPException, UploadFile
+from fastapi.responses import JSONResponse
+
+MAX_UPLOAD_BYTES = int(os.getenv("API_MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+CHUNK_SIZE = 1 << 20
+# Multipart boundaries and part headers on top of the file itself
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class UploadTooLarge(HTTPException):
+    def __init__(self, max_bytes: int):
+        super().__init__(status_code=413, detail=f"Upload exceeds the {max_bytes / (1024 * 1024):.1f} MB limit")
+
+
+class UploadSizeLimit:
+    """ASGI middleware rejecting oversized request bodies on ``paths`` before they are fully buffered
+
+    A declared Content-Length over the limit is refused without reading the body;
+    otherwise bytes are counted as they arrive and the request fails with 413 as
+    soon as the limit is crossed (chunked uploads included).
+    """
+
+    def __init__(self, app, max_bytes: int = MAX_UPLOAD_BYTES, paths: Iterable[str] = ("/upload-resume",)):
+        self.app = app
+        self.max_body = max_bytes + MULTIPART_OVERHEAD
+        self.max_bytes = max_bytes
+        self.paths = set(paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        declared = dict(scope["headers"]).get(b"content-length")
+        if declared is not None and declared.isdigit() and int(declared) > self.max_body:
+            error = UploadTooLarge(self.max_bytes)
+            await JSONResponse({"detail": error.detail}, status_code=413)(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body:
+                    raise UploadTooLarge(self.max_bytes)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+@dataclass
+class SpooledUpload:
+    """The upload's spooled file (memory up to 1 MB, then disk), its size and SHA-256"""
+    stream: BinaryIO
+    size: int
+    sha256: str
+
+
+async def spool_upload(file: UploadFile, max_bytes: int = MAX_UPLOAD_BYTES) -> SpooledUpload:
+    """Hash and measure the upload in chunks; the stream is left rewound for the next reader
+
+    Starlette already spools multipart files into a SpooledTemporaryFile, so that
+    file is reused as-is rather than copied into another buffer.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    await file.seek(0)
+    while True:
+        chunk = await file.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > max_bytes:
+            raise UploadTooLarge(max_bytes)
+        digest.update(chunk)
+    await file.seek(0)
+    return SpooledUpload(stream=file.file, size=size, sha256=digest.hexdigest())
+
+
+def spool_to_path(stream: BinaryIO, suffix: str) -> str:
+    """Copy the stream to a named temp file for the parser process (blocking; caller deletes it)"""
+    stream.seek(0)
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
+        shutil.copyfileobj(stream, tmp_file, CHUNK_SIZE)
+    stream.seek(0)
+    return tmp_file.name
@@ -0,0 +1,124 @@
+"""
+Model warmup and readiness for the API
+Loads the models and runs warmup batches in the background until p99 batch latency stops changing; /ready reports it
+"""
+import asyncio
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from jobtracker.metrics import metrics
+from jobtracker.models import preload_enabled, preload_models, warmup_batch
+
+
+def p99(values: List[float]) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(0.99 * (len(ordered) - 1))))]
+
+
+@dataclass
+class WarmupSettings:
+    enabled: bool = True
+    min_rounds: int = 3
+    max_rounds: int = 20
+    batches_per_round: int = 4
+    tolerance: float = 0.1  # relative change in p99 between rounds that counts as stable
+    attempts: int = 3  # model loading/warmup attempts before giving up
+    retry_backoff: float = 2.0  # seconds before the first retry, doubled for each further one
+
+    @classmethod
+    def from_env(cls) -> "WarmupSettings":
+        return cls(
+            enabled=os.getenv("API_WARMUP", "true").lower() == "true",
+            min_rounds=int(os.getenv("API_WARMUP_MIN_ROUNDS", "3")),
+            max_rounds=int(os.getenv("API_WARMUP_MAX_ROUNDS", "20")),
+            batches_per_round=int(os.getenv("API_WARMUP_BATCHES_PER_ROUND", "4")),
+            tolerance=float(os.getenv("API_WARMUP_TOLERANCE", "0.1")),
+            attempts=int(os.getenv("API_WARMUP_ATTEMPTS", "3")),
+            retry_backoff=float(os.getenv("API_WARMUP_RETRY_BACKOFF", "2.0")),
+        )
+
+
+@dataclass
+class Warmup:
+    """Readiness state: starting -> loading -> warming -> ready (or failed after every attempt)"""
+    settings: WarmupSettings = field(default_factory=WarmupSettings.from_env)
+    state: str = "starting"
+    attempts: int = 0
+    rounds: int = 0
+    p99_history: List[float] = field(default_factory=list)
+    stable: bool = False
+    error: Optional[str] = None
+    started_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.state == "ready"
+
+    @property
+    def failed(self) -> bool:
+        return self.state == "failed"
+
+    async def run(self, executor):
+        """Load models and warm up, retrying with backoff; ``failed`` once every attempt has failed"""
+        try:
+            for attempt in range(1, max(self.settings.attempts, 1) + 1):
+                self.attempts = attempt
+                try:
+                    await self._attempt(executor)
+                    return
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self.error = str(e)
+                    metrics.inc("jobtracker_warmup_failures_total")
+                    if attempt < self.settings.attempts:
+                        self.state = "retrying"
+                        await asyncio.sleep(self.settings.retry_backoff * 2 ** (attempt - 1))
+            self.state = "failed"
+        finally:
+            self.finished_at = time.time()
+
+    async def _attempt(self, executor):
+        self.state = "loading"
+        self.rounds, self.p99_history, self.stable = 0, [], False
+        if preload_enabled():
+            # Already loaded (no-op) in gunicorn workers forked from a preloading master
+            await asyncio.to_thread(preload_models)
+        if self.settings.enabled:
+            self.state = "warming"
+            await self._warm(executor)
+        self.state = "ready"
+        self.error = None
+
+    async def _warm(self, executor):
+        previous = None
+        for round_number in range(1, self.settings.max_rounds + 1):
+            # Concurrent batches so every process/thread of the executor gets warmed
+            latencies = await asyncio.gather(
+                *[executor.run(warmup_batch) for _ in range(self.settings.batches_per_round)]
+            )
+            for seconds in latencies:
+                metrics.observe("jobtracker_warmup_batch_seconds", seconds)
+            current = p99(latencies)
+            self.rounds = round_number
+            self.p99_history.append(round(current, 4))
+            if (round_number >= self.settings.min_rounds and previous is not None
+                    and abs(current - previous) <= self.settings.tolerance * previous):
+                self.stable = True
+                return
+            previous = current
+        # Out of rounds: serve anyway rather than stay unready forever; status shows stable=False
+
+    def status(self) -> Dict:
+        return {
+            "status": self.state,
+            "attempts": self.attempts,
+            "rounds": self.rounds,
+            "p99_seconds": self.p99_history,
+            "stable": self.stable,
+            "error": self.error,
+            "elapsed_seconds": round((self.finished_at or time.time()) - self.started_at, 3),
+        }
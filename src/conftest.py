@@ -0,0 +1,15 @@
+import os
+import shutil
+import tempfile
+
+# Keep test runs out of src/storage: every default database, cache and archive path
+# resolves under JOBTRACKER_DATA_DIR. Set before test modules import api.main.
+_data_dir = tempfile.mkdtemp(prefix="jobtracker-test-")
+os.environ["JOBTRACKER_DATA_DIR"] = _data_dir
+for _name in ("STORAGE_SQLITE_PATH", "RESUME_CACHE_PATH", "EMBEDDING_STORE_PATH", "WAREHOUSE_PATH",
+              "ARCHIVE_PATH", "OUTBOX_PATH"):
+    os.environ.pop(_name, None)
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(_data_dir, ignore_errors=True)
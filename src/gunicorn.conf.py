@@ -0,0 +1,36 @@
+"""
+Gunicorn settings for multi-worker serving of api.main:app
+The master imports the app and loads the NLP models once; forked workers share the weights copy-on-write
+"""
+import gc
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+# One worker by default: background tasks (/tasks/{id}), the search/storage caches, admission
+# limits and /metrics live in each worker's memory, so with more workers a task is only visible
+# on the worker that created it. More than one worker is unsupported until that state is shared (see DEPLOYMENT.md).
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = 30
+
+# Import the app in the master so module-level state (and the models below) exists before fork
+preload_app = True
+
+# Workers run CPU work on threads so they use the inherited models instead of spawning fresh processes
+os.environ.setdefault("API_CPU_EXECUTOR", "thread")
+os.environ.setdefault("JOBTRACKER_PRELOAD_MODELS", "1")
+# HF tokenizers' thread pool is not fork-safe
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+
+
+def when_ready(server):
+    """Runs in the master after the app is loaded and before any worker is forked"""
+    from jobtracker.models import preload_enabled, preload_models
+
+    if preload_enabled():
+        server.log.info("Preloading NLP models in the master")
+        preload_models()
+    # Move everything allocated so far out of the GC's reach: collections in the workers
+    # would otherwise touch (and un-share) every page holding these objects
+    gc.freeze()
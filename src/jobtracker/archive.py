@@ -0,0 +1,177 @@
+"""jobtracker.archive
+
+Columnar search-history archive: one row per (session, run, job) with the score
+columns, in Parquet files partitioned by run date (``date=YYYY-MM-DD/``).
+
+Search runs are appended as they are compacted out of storage (and by the CLI
+after each run); ``compact`` merges a partition's small files into one.
+``query`` reads only the requested columns and the partitions in the date range.
+
+Usage:
+    archive = SearchArchive.from_config(config)
+    archive.append(archive_rows("cli", run_id, time.time(), jobs))
+    table = archive.query(["job_id", "match_score"], start=date(2026, 1, 1), session_id="abc")
+"""
+import os
+import uuid
+from datetime import date, datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+from jobtracker.config import data_path
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    ARCHIVE_AVAILABLE = True
+except ImportError:
+    ARCHIVE_AVAILABLE = False
+
+# (column, pyarrow type name); "date" is the partition key and lives in the directory name
+COLUMNS = [
+    ("session_id", "string"),
+    ("run_id", "string"),
+    ("run_at", "timestamp"),
+    ("rank", "int32"),
+    ("job_id", "string"),
+    ("title", "string"),
+    ("company", "string"),
+    ("city", "string"),
+    ("state", "string"),
+    ("source", "string"),
+    ("posted_at", "string"),
+    ("match_score", "float64"),
+    ("semantic_score", "float64"),
+    ("skill_match_score", "float64"),
+    ("filter_score", "float64"),
+]
+
+
+def _schema() -> "pa.Schema":
+    types = {"string": pa.string(), "timestamp": pa.timestamp("s", tz="UTC"), "int32": pa.int32(), "float64": pa.float64()}
+    return pa.schema([(name, types[type_name]) for name, type_name in COLUMNS])
+
+
+def _score(value) -> Optional[float]:
+    return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+def archive_rows(session_id: str, run_id: str, run_at: float, jobs: Iterable[Dict]) -> List[Dict]:
+    """Archive rows for one search run; ``run_at`` is epoch seconds"""
+    run_time = datetime.fromtimestamp(run_at, tz=timezone.utc)
+    return [
+        {
+            "session_id": session_id,
+            "run_id": run_id,
+            "run_at": run_time,
+            "rank": rank,
+            "job_id": job.get("id"),
+            "title": job.get("title"),
+            "company": job.get("company"),
+            "city": job.get("city"),
+            "state": job.get("state"),
+            "source": job.get("source"),
+            "posted_at": str(job["posted_at"]) if job.get("posted_at") is not None else None,
+            "match_score": _score(job.get("match_score")),
+            "semantic_score": _score(job.get("semantic_score")),
+            "skill_match_score": _score(job.get("skill_match_score")),
+            "filter_score": _score(job.get("filter_score")),
+        }
+        for rank, job in enumerate(jobs, 1)
+    ]
+
+
+class SearchArchive:
+    """Date-partitioned Parquet dataset under ``root``"""
+
+    def __init__(self, root: Optional[str] = None):
+        if not ARCHIVE_AVAILABLE:
+            raise RuntimeError("The search archive needs the pyarrow package")
+        self.root = os.path.abspath(root or data_path("archive"))
+        os.makedirs(self.root, exist_ok=True)
+
+    @classmethod
+    def from_config(cls, config) -> "SearchArchive":
+        return cls(config.archive_path or None)
+
+    def _partition(self, day: str) -> str:
+        return os.path.join(self.root, f"date={day}")
+
+    @staticmethod
+    def _write(folder: str, table: "pa.Table"):
+        # Readers never see a half-written file: write to a hidden name (skipped by query), then rename
+        name = f"part-{uuid.uuid4().hex}.parquet"
+        pq.write_table(table, os.path.join(folder, f".{name}"), compression="zstd", row_group_size=100_000)
+        os.replace(os.path.join(folder, f".{name}"), os.path.join(folder, name))
+
+    def append(self, rows: List[Dict]) -> List[str]:
+        """Write rows as one new file per run date; returns the touched partition dates"""
+        by_day: Dict[str, List[Dict]] = {}
+        for row in rows:
+            by_day.setdefault(row["run_at"].date().isoformat(), []).append(row)
+        schema = _schema()
+        for day, day_rows in by_day.items():
+            folder = self._partition(day)
+            os.makedirs(folder, exist_ok=True)
+            table = pa.Table.from_pylist(day_rows, schema=schema)
+            self._write(folder, table)
+        return sorted(by_day)
+
+    def compact(self, day: str) -> int:
+        """Merge the partition's files into one, sorted by session and run; returns the row count"""
+        folder = self._partition(day)
+        files = sorted(f for f in os.listdir(folder) if f.startswith("part-")) if os.path.isdir(folder) else []
+        if len(files) <= 1:
+            return pq.ParquetFile(os.path.join(folder, files[0])).metadata.num_rows if files else 0
+        table = pq.read_table([os.path.join(folder, f) for f in files], schema=_schema())
+        table = table.sort_by([("session_id", "ascending"), ("run_at", "ascending"), ("rank", "ascending")])
+        self._write(folder, table)
+        for f in files:
+            os.remove(os.path.join(folder, f))
+        return table.num_rows
+
+    def partitions(self) -> List[str]:
+        return sorted(name.split("=", 1)[1] for name in os.listdir(self.root) if name.startswith("date="))
+
+    def _dataset(self) -> "ds.Dataset":
+        partition_key = pa.schema([("date", pa.string())])
+        return ds.dataset(
+            self.root, format="parquet", schema=_schema().append(partition_key.field("date")),
+            partitioning=ds.partitioning(partition_key, flavor="hive"),
+            ignore_prefixes=[".", "_"],
+        )
+
+    @staticmethod
+    def _filter(start: Optional[date], end: Optional[date], session_id: Optional[str],
+                min_score: Optional[float]) -> Optional["ds.Expression"]:
+        conditions = []
+        # ISO dates compare correctly as strings; these prune whole partition directories
+        if start is not None:
+            conditions.append(ds.field("date") >= start.isoformat())
+        if end is not None:
+            conditions.append(ds.field("date") <= end.isoformat())
+        if session_id is not None:
+            conditions.append(ds.field("session_id") == session_id)
+        if min_score is not None:
+            conditions.append(ds.field("match_score") >= min_score)
+        condition = None
+        for part in conditions:
+            condition = part if condition is None else condition & part
+        return condition
+
+    def query(self, columns: Optional[List[str]] = None, start: Optional[date] = None, end: Optional[date] = None,
+              session_id: Optional[str] = None, min_score: Optional[float] = None,
+              limit: Optional[int] = None) -> "pa.Table":
+        """Rows with run date in [start, end] (inclusive); only ``columns`` and matching partitions are read
+
+        With ``limit``, the scan stops once that many matching rows have been read.
+        """
+        dataset, condition = self._dataset(), self._filter(start, end, session_id, min_score)
+        if limit is not None:
+            return dataset.head(limit, columns=columns, filter=condition)
+        return dataset.to_table(columns=columns, filter=condition)
+
+    def count(self, start: Optional[date] = None, end: Optional[date] = None, session_id: Optional[str] = None,
+              min_score: Optional[float] = None) -> int:
+        """Number of rows ``query`` would return; reads only the filter columns (or just file metadata)"""
+        return self._dataset().count_rows(filter=self._filter(start, end, session_id, min_score))
@@ -3,6 +3,14 @@ import os
 from dataclasses import dataclass
 from typing import Dict, List
 
+# Local databases and caches live here unless JOBTRACKER_DATA_DIR (or a per-store *_PATH) says otherwise
+DEFAULT_DATA_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "../storage"))
+
+
+def data_path(*parts: str) -> str:
+    """Path under the data directory (JOBTRACKER_DATA_DIR, default src/storage)"""
+    return os.path.join(os.getenv("JOBTRACKER_DATA_DIR") or DEFAULT_DATA_DIR, *parts)
+
 @dataclass
 class JobTrackerConfig:
     """Configuration class for job tracker settings"""
@@ -10,6 +18,24 @@ class JobTrackerConfig:
     # Resume settings
     resume_path: str = ""
     
+    # Parsed resume profile cache (empty path = <data dir>/cache/resume_profiles.db)
+    resume_cache_path: str = ""
+    resume_cache_max_entries: int = 256
+    
+    # Memory-mapped job embedding store (empty path = <data dir>/cache/embeddings); oldest rows are dropped past max entries
+    embedding_store_path: str = ""
+    embedding_store_enabled: bool = True
+    embedding_store_max_entries: int = 200_000
+    
+    # Local job warehouse (empty path = <data dir>/cache/jobs.db); fetched pages younger than this are replayed from it
+    warehouse_path: str = ""
+    warehouse_enabled: bool = True
+    warehouse_fresh_hours: float = 6.0
+    
+    # Columnar search-history archive (empty path = <data dir>/archive); runs older than this are compacted into it
+    archive_path: str = ""
+    archive_after_days: int = 30
+    
     # Job search parameters
     job_keywords: str = "Software Engineer"
     job_location: str = "USA"
@@ -24,6 +50,11 @@ class JobTrackerConfig:
     email_subject: str = "Daily Job Matches"
     max_jobs_in_email: int = 10
     
+    # Email outbox (empty path = <data dir>/outbox.db); the CLI queues its digest and starts a sender process
+    outbox_path: str = ""
+    outbox_max_attempts: int = 8
+    outbox_spawn_sender: bool = True
+    
     # Model settings
     sentence_transformer_model: str = "all-MiniLM-L6-v2"
     
@@ -36,6 +67,16 @@ class JobTrackerConfig:
         """Create config from environment variables"""
         return cls(
             resume_path=os.getenv("RESUME_PATH", ""),
+            resume_cache_path=os.getenv("RESUME_CACHE_PATH", ""),
+            resume_cache_max_entries=int(os.getenv("RESUME_CACHE_MAX_ENTRIES", "256")),
+            embedding_store_path=os.getenv("EMBEDDING_STORE_PATH", ""),
+            embedding_store_enabled=os.getenv("EMBEDDING_STORE_ENABLED", "true").lower() == "true",
+            embedding_store_max_entries=int(os.getenv("EMBEDDING_STORE_MAX_ENTRIES", "200000")),
+            warehouse_path=os.getenv("WAREHOUSE_PATH", ""),
+            warehouse_enabled=os.getenv("WAREHOUSE_ENABLED", "true").lower() == "true",
+            warehouse_fresh_hours=float(os.getenv("WAREHOUSE_FRESH_HOURS", "6")),
+            archive_path=os.getenv("ARCHIVE_PATH", ""),
+            archive_after_days=int(os.getenv("ARCHIVE_AFTER_DAYS", "30")),
             job_keywords=os.getenv("JOB_KEYWORDS", "Software Engineer"),
             job_location=os.getenv("JOB_LOCATION", "USA"),
             posted_within_days=int(os.getenv("POSTED_WITHIN_DAYS", "7")),
@@ -44,6 +85,10 @@ class JobTrackerConfig:
             match_score_threshold=float(os.getenv("MATCH_SCORE_THRESHOLD", "50.0")),
             email_subject=os.getenv("EMAIL_SUBJECT", "Daily Job Matches"),
             max_jobs_in_email=int(os.getenv("MAX_JOBS_IN_EMAIL", "10")),
+            outbox_path=os.getenv("OUTBOX_PATH", ""),
+            outbox_max_attempts=int(os.getenv("OUTBOX_MAX_ATTEMPTS", "8")),
+            outbox_spawn_sender=os.getenv("OUTBOX_SPAWN_SENDER", "true").lower() == "true",
+            sentence_transformer_model=os.getenv("SENTENCE_TRANSFORMER_MODEL", "all-MiniLM-L6-v2"),
         )
 
 # Predefined skill categories for better matching
@@ -62,7 +107,7 @@ TECH_SKILLS = {
     ],
     'devops_tools': [
         'docker', 'kubernetes', 'terraform', 'ansible', 'jenkins', 'gitlab ci',
-        'github actions', 'circleci', 'travis ci', 'helm'
+        'github actions', 'circleci', 'travis ci', 'helm', 'git', 'linux'
     ],
     'databases': [
         'sql', 'postgresql', 'mysql', 'mongodb', 'redis', 'elasticsearch',
@@ -70,11 +115,15 @@ TECH_SKILLS = {
     ],
     'data_science': [
         'machine learning', 'deep learning', 'ai', 'data science', 'pandas', 
-        'numpy', 'tensorflow', 'pytorch', 'scikit-learn', 'spark', 'hadoop'
+        'numpy', 'tensorflow', 'pytorch', 'scikit-learn', 'spark', 'hadoop',
+        'kafka', 'tableau', 'powerbi'
     ],
     'monitoring': [
         'prometheus', 'grafana', 'datadog', 'new relic', 'splunk', 'elk stack',
         'kibana', 'logstash'
+    ],
+    'engineering_practices': [
+        'devops', 'ci/cd', 'microservices', 'api', 'rest', 'graphql'
     ]
 }
 
@@ -1,28 +1,97 @@
 """jobtracker.emailer.email_sender
 
 Simple SMTP email sender with attachment support.
+
+``send`` delivers one message over its own connection. ``send_batch`` delivers
+many over a small pool of authenticated connections (one per worker thread),
+reconnecting after dropped connections and transient 4xx replies, and returns
+one ``SendResult`` per message in input order.
+
+Usage:
+    sender = EmailSender()
+    sender.send("me@example.com", "Daily Job Matches", body, attachment_path="jobs.xlsx")
+    results = sender.send_batch([OutgoingEmail("a@example.com", "Digest", body_a), ...], max_connections=4)
 """
 import os
 import mimetypes
+import queue
 import smtplib
+import threading
+from dataclasses import dataclass
 from email.message import EmailMessage
-from typing import Optional
+from typing import Iterable, List, Optional
+
+from jobtracker.metrics import metrics
+
+
+@dataclass
+class OutgoingEmail:
+    to_address: str
+    subject: str
+    body: str
+    attachment_path: Optional[str] = None
+    # Stable Message-ID, so a resend after an unconfirmed delivery can be recognized as a duplicate
+    message_id: Optional[str] = None
+
+
+@dataclass
+class SendResult:
+    to_address: str
+    ok: bool
+    attempts: int
+    error: Optional[str] = None
+    # Permanent failures (5xx, refused recipient) are not worth retrying
+    permanent: bool = False
+    # Rejected login: the sender's settings are at fault, not the message, so it stays queued
+    config_error: bool = False
+
+
+def _connection_lost(error: Exception) -> bool:
+    # SMTPException subclasses OSError, so socket errors are "OSError but not an SMTP reply"
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code == 421
+    return isinstance(error, smtplib.SMTPServerDisconnected) or (
+        isinstance(error, OSError) and not isinstance(error, smtplib.SMTPException)
+    )
+
+
+def _is_config_error(error: Exception) -> bool:
+    """Failures no message will get past until the SMTP settings are fixed"""
+    return isinstance(error, smtplib.SMTPAuthenticationError)
+
+
+def _is_transient(error: Exception) -> bool:
+    """Dropped connections, socket errors and 4xx replies may succeed on a fresh connection"""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(400 <= code < 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    return _connection_lost(error)
+
 
 class EmailSender:
-    def __init__(self, smtp_server: Optional[str] = None, smtp_port: Optional[int] = None, username: Optional[str] = None, password: Optional[str] = None):
+    def __init__(self, smtp_server: Optional[str] = None, smtp_port: Optional[int] = None, username: Optional[str] = None, password: Optional[str] = None,
+                 use_tls: Optional[bool] = None, auth: Optional[bool] = None, timeout: float = 30):
         self.smtp_server = smtp_server or os.getenv("SMTP_SERVER", "smtp.gmail.com")
         self.smtp_port = int(smtp_port or int(os.getenv("SMTP_PORT", 587)))
         self.username = username or os.getenv("EMAIL_ADDRESS")
         self.password = password or os.getenv("EMAIL_PASSWORD")
+        # STARTTLS and login default on; a local relay or test sink (aiosmtpd) needs neither
+        self.use_tls = use_tls if use_tls is not None else os.getenv("SMTP_USE_TLS", "true").lower() == "true"
+        self.auth = auth if auth is not None else os.getenv("SMTP_AUTH", "true").lower() == "true"
+        self.timeout = timeout
 
-        if not self.username or not self.password:
+        if not self.username or (self.auth and not self.password):
             raise ValueError("EMAIL_ADDRESS and EMAIL_PASSWORD must be set as environment variables or passed in")
 
-    def send(self, to_address: str, subject: str, body: str, attachment_path: Optional[str] = None):
+    def build_message(self, to_address: str, subject: str, body: str, attachment_path: Optional[str] = None,
+                      message_id: Optional[str] = None) -> EmailMessage:
         msg = EmailMessage()
         msg["From"] = self.username
         msg["To"] = to_address
         msg["Subject"] = subject
+        if message_id:
+            msg["Message-ID"] = message_id
         msg.set_content(body)
 
         if attachment_path and os.path.exists(attachment_path):
@@ -33,8 +102,112 @@ class EmailSender:
             with open(attachment_path, "rb") as f:
                 data = f.read()
             msg.add_attachment(data, maintype=maintype, subtype=subtype, filename=os.path.basename(attachment_path))
+        return msg
+
+    def connect(self) -> smtplib.SMTP:
+        """Open an SMTP connection, with STARTTLS and login as configured"""
+        conn = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                conn.starttls()
+            if self.auth:
+                conn.login(self.username, self.password)
+        except Exception:
+            conn.close()
+            raise
+        metrics.inc("jobtracker_smtp_connections_total")
+        return conn
 
-        with smtplib.SMTP(self.smtp_server, self.smtp_port) as s:
-            s.starttls()
-            s.login(self.username, self.password)
+    def send(self, to_address: str, subject: str, body: str, attachment_path: Optional[str] = None):
+        msg = self.build_message(to_address, subject, body, attachment_path)
+        with self.connect() as s:
             s.send_message(msg)
+
+    def send_batch(self, emails: Iterable[OutgoingEmail], max_connections: int = 4, max_attempts: int = 3,
+                   messages_per_connection: int = 100) -> List[SendResult]:
+        """Send every email over at most ``max_connections`` reused connections
+
+        A connection is replaced after ``messages_per_connection`` messages (providers
+        cap messages per session) or when it fails; a transient failure retries the
+        message on the new connection up to ``max_attempts`` times.
+        """
+        emails = list(emails)
+        results: List[Optional[SendResult]] = [None] * len(emails)
+        pending: "queue.Queue[int]" = queue.Queue()
+        for index in range(len(emails)):
+            pending.put(index)
+
+        def worker():
+            conn, sent_on_conn = None, 0
+            try:
+                while True:
+                    try:
+                        index = pending.get_nowait()
+                    except queue.Empty:
+                        return
+                    email = emails[index]
+                    attempts, error = 0, None
+                    while attempts < max_attempts:
+                        attempts += 1
+                        try:
+                            if conn is None or sent_on_conn >= messages_per_connection:
+                                _quit(conn)
+                                conn, sent_on_conn = self.connect(), 0
+                            conn.send_message(self.build_message(
+                                email.to_address, email.subject, email.body, email.attachment_path, email.message_id
+                            ))
+                            sent_on_conn += 1
+                            error = None
+                            break
+                        except Exception as e:
+                            error = e
+                            if _connection_lost(e):
+                                _close(conn)
+                                conn = None
+                            elif conn is not None:
+                                _reset(conn)
+                            if not _is_transient(e):
+                                break
+                    results[index] = SendResult(
+                        email.to_address, error is None, attempts,
+                        error=None if error is None else f"{type(error).__name__}: {error}",
+                        permanent=error is not None and not _is_transient(error) and not _is_config_error(error),
+                        config_error=error is not None and _is_config_error(error),
+                    )
+                    metrics.inc("jobtracker_emails_total", outcome="sent" if error is None else "failed")
+            finally:
+                _quit(conn)
+
+        threads = [threading.Thread(target=worker, name=f"smtp-{i}", daemon=True)
+                   for i in range(max(1, min(max_connections, len(emails))))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+
+def _reset(conn: smtplib.SMTP):
+    # Clear a half-finished transaction (refused recipient, rejected data) so the connection is reusable
+    try:
+        conn.rset()
+    except Exception:
+        pass
+
+
+def _quit(conn: Optional[smtplib.SMTP]):
+    if conn is None:
+        return
+    try:
+        conn.quit()
+    except Exception:
+        _close(conn)
+
+
+def _close(conn: Optional[smtplib.SMTP]):
+    if conn is None:
+        return
+    try:
+        conn.close()
+    except Exception:
+        pass
@@ -0,0 +1,263 @@
+"""jobtracker.emailer.outbox
+
+Durable email outbox: the pipeline enqueues rendered messages into SQLite and
+returns; a separate sender process drains the queue over pooled SMTP
+connections (``EmailSender.send_batch``).
+
+Each message has an idempotency key (unique, so enqueuing the same digest twice
+stores it once) that also becomes its Message-ID. Attachments are stored as
+paths, not copied, and read when the message is sent. Failed sends are retried
+with exponential backoff up to ``max_attempts``; permanent failures (refused
+recipient, missing attachment) stop immediately. A rejected SMTP login is a
+configuration problem, not the message's: the drain stops and the messages stay
+pending without using up attempts. A message claimed by a sender that dies is
+released again once its lease expires.
+
+Usage:
+    outbox = EmailOutbox.from_config(config)
+    outbox.enqueue("me@example.com", "Daily Job Matches", body, attachment_path="outputs/jobs.xlsx")
+    outbox.drain(EmailSender())
+
+CLI:
+    python -m jobtracker.emailer.outbox drain               # send everything due, then exit
+    python -m jobtracker.emailer.outbox run --interval 30   # keep draining
+    python -m jobtracker.emailer.outbox stats
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional
+
+from jobtracker.config import JobTrackerConfig, data_path
+from jobtracker.emailer.email_sender import EmailSender, OutgoingEmail, SendResult
+from jobtracker.metrics import metrics
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    to_address TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    body TEXT NOT NULL,
+    attachment_path TEXT,
+    -- pending -> sending -> sent | failed (pending again after a retryable failure)
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    lease_until REAL,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    sent_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (status, next_attempt_at);
+"""
+
+
+class SenderConfigError(RuntimeError):
+    """The SMTP server rejected the sender's login; raised by ``drain`` after leaving the batch pending"""
+
+
+@dataclass
+class OutboxMessage:
+    id: int
+    idempotency_key: str
+    to_address: str
+    subject: str
+    body: str
+    attachment_path: Optional[str]
+    attempts: int
+
+    def to_email(self) -> OutgoingEmail:
+        return OutgoingEmail(self.to_address, self.subject, self.body, self.attachment_path,
+                             message_id=f"<{self.idempotency_key}@jobtracker>")
+
+
+def idempotency_key(to_address: str, subject: str, body: str, attachment_path: Optional[str] = None) -> str:
+    digest = hashlib.sha256()
+    for part in (to_address, subject, body, attachment_path or ""):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()[:32]
+
+
+class EmailOutbox:
+    """SQLite (WAL) message queue with leases, retry backoff and idempotency keys"""
+
+    def __init__(self, path: Optional[str] = None, max_attempts: int = 8, base_delay: float = 60,
+                 max_delay: float = 3600, lease_seconds: float = 300):
+        self.path = os.path.abspath(path or data_path("outbox.db"))
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.lease_seconds = lease_seconds
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @classmethod
+    def from_config(cls, config: JobTrackerConfig) -> "EmailOutbox":
+        return cls(config.outbox_path or None, config.outbox_max_attempts)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # One short-lived connection per call: the pipeline and sender processes share the file
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def enqueue(self, to_address: str, subject: str, body: str, attachment_path: Optional[str] = None,
+                key: Optional[str] = None) -> str:
+        """Queue a message; returns its idempotency key (re-enqueuing the same key is a no-op)"""
+        attachment_path = os.path.abspath(attachment_path) if attachment_path else None
+        key = key or idempotency_key(to_address, subject, body, attachment_path)
+        now = time.time()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO outbox (idempotency_key, to_address, subject, body, attachment_path, "
+                "next_attempt_at, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, to_address, subject, body, attachment_path, now, now),
+            )
+        metrics.inc("jobtracker_outbox_enqueued_total", outcome="queued" if cursor.rowcount else "duplicate")
+        return key
+
+    def claim(self, limit: int = 50, now: Optional[float] = None) -> List[OutboxMessage]:
+        """Lease up to ``limit`` due messages to this sender (pending, or sending with an expired lease)"""
+        now = now if now is not None else time.time()
+        with self._connect() as conn:
+            # A single UPDATE ... RETURNING: two senders never claim the same message
+            rows = conn.execute(
+                "UPDATE outbox SET status = 'sending', lease_until = ? WHERE id IN ("
+                "  SELECT id FROM outbox WHERE (status = 'pending' AND next_attempt_at <= ?)"
+                "  OR (status = 'sending' AND lease_until <= ?) ORDER BY next_attempt_at LIMIT ?"
+                ") RETURNING id, idempotency_key, to_address, subject, body, attachment_path, attempts",
+                (now + self.lease_seconds, now, now, limit),
+            ).fetchall()
+        return [OutboxMessage(*row) for row in sorted(rows)]
+
+    def backoff(self, attempts: int) -> float:
+        """Seconds before retry number ``attempts``: exponential, capped, with jitter so senders spread out"""
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+    def record(self, message: OutboxMessage, result: SendResult, now: Optional[float] = None) -> str:
+        """Store a send outcome; returns the new status (sent, pending or failed)"""
+        now = now if now is not None else time.time()
+        attempts = message.attempts + 1
+        if result.config_error:
+            attempts, status, next_attempt_at = message.attempts, "pending", now + self.base_delay
+        elif result.ok:
+            status, next_attempt_at = "sent", now
+        elif result.permanent or attempts >= self.max_attempts:
+            status, next_attempt_at = "failed", now
+        else:
+            status, next_attempt_at = "pending", now + self.backoff(attempts)
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE outbox SET status = ?, attempts = ?, next_attempt_at = ?, lease_until = NULL, "
+                "last_error = ?, sent_at = ? WHERE id = ?",
+                (status, attempts, next_attempt_at, result.error, now if result.ok else None, message.id),
+            )
+        return status
+
+    def drain(self, sender: EmailSender, batch_size: int = 50, max_connections: int = 4) -> Dict[str, int]:
+        """Send every message that is due now; returns counts by resulting status
+
+        Raises SenderConfigError (with the claimed messages back to pending) when the login is rejected.
+        """
+        counts = {"sent": 0, "pending": 0, "failed": 0}
+        while True:
+            messages = self.claim(batch_size)
+            if not messages:
+                return counts
+            # The attachment is only referenced: if it is gone, fail rather than send a digest without it
+            missing = [m for m in messages if m.attachment_path and not os.path.exists(m.attachment_path)]
+            outcomes = [
+                (m, SendResult(m.to_address, False, 1, error=f"Attachment not found: {m.attachment_path}", permanent=True))
+                for m in missing
+            ]
+            ready = [m for m in messages if m not in missing]
+            if ready:
+                outcomes.extend(zip(ready, sender.send_batch([m.to_email() for m in ready], max_connections=max_connections)))
+            for message, result in outcomes:
+                status = self.record(message, result)
+                counts[status] += 1
+                metrics.inc("jobtracker_outbox_sends_total", outcome=status)
+            config_errors = [result.error for _, result in outcomes if result.config_error]
+            if config_errors:
+                # Every further message would fail the same way until the settings are fixed
+                raise SenderConfigError(config_errors[0])
+
+    def stats(self) -> Dict:
+        with self._connect() as conn:
+            by_status = dict(conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall())
+            oldest = conn.execute("SELECT MIN(created_at) FROM outbox WHERE status IN ('pending', 'sending')").fetchone()[0]
+        return {"by_status": by_status, "oldest_unsent": oldest}
+
+
+def spawn_sender(log_path: str) -> subprocess.Popen:
+    """Drain the outbox in a detached process, so the caller can exit without waiting for SMTP
+
+    The SMTP settings are checked first (ValueError when EMAIL_ADDRESS/EMAIL_PASSWORD
+    are missing), and the sender's output is appended to ``log_path``.
+    """
+    EmailSender()
+    src_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+    os.makedirs(os.path.dirname(os.path.abspath(log_path)), exist_ok=True)
+    with open(log_path, "ab") as log:
+        return subprocess.Popen(
+            [sys.executable, "-m", "jobtracker.emailer.outbox", "drain"],
+            cwd=src_dir, stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Send queued emails from the outbox")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("drain", help="Send every message that is due, then exit")
+    run = commands.add_parser("run", help="Keep draining the outbox")
+    run.add_argument("--interval", type=float, default=30, help="Seconds between drains")
+    commands.add_parser("stats", help="Message counts by status")
+    args = parser.parse_args()
+
+    outbox = EmailOutbox.from_config(JobTrackerConfig.from_env())
+    if args.command == "stats":
+        print(json.dumps(outbox.stats(), indent=2))
+        return
+    try:
+        sender = EmailSender()
+    except ValueError as e:
+        sys.exit(f"{time.strftime('%Y-%m-%d %H:%M:%S')} outbox sender not started: {e}")
+    max_connections = int(os.getenv("SMTP_MAX_CONNECTIONS", 4))
+    while True:
+        try:
+            counts = outbox.drain(sender, max_connections=max_connections)
+        except SenderConfigError as e:
+            # Messages stay pending; `run` keeps retrying in case the settings are fixed without a restart
+            print(f"{time.strftime('%Y-%m-%d %H:%M:%S')} SMTP login rejected, messages left pending: {e}", file=sys.stderr)
+            if args.command == "drain":
+                sys.exit(1)
+        else:
+            if any(counts.values()):
+                print(json.dumps({"at": time.strftime("%Y-%m-%d %H:%M:%S"), **counts}), flush=True)
+            if args.command == "drain":
+                return
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
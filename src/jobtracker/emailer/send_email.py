@@ -1,8 +1,8 @@
 import os
-from jobtracker.emailer.email_sender import EmailSender
+from jobtracker.emailer.email_sender import EmailSender, OutgoingEmail, SendResult
 from typing import List, Dict
 
-def send_email(jobs: List[Dict], to_address: str, subject: str, attachment_path: str = None):
+def render_email_body(jobs: List[Dict]) -> str:
     """Enhanced email composition with better formatting and insights"""
     
     if not jobs:
@@ -63,5 +63,23 @@ Key Insights:
         
         body = header + "\n".join(job_lines) + insights
     
+    return body
+
+
+def send_email(jobs: List[Dict], to_address: str, subject: str, attachment_path: str = None):
     emailer = EmailSender()
-    emailer.send(to_address=to_address, subject=subject, body=body, attachment_path=attachment_path)
+    emailer.send(to_address=to_address, subject=subject, body=render_email_body(jobs), attachment_path=attachment_path)
+
+
+def send_digests(digests: List[Dict], max_connections: int = None, sender: EmailSender = None) -> List[SendResult]:
+    """Send one digest per recipient over pooled connections
+
+    Each digest is a dict with ``to_address``, ``subject``, ``jobs`` and optionally
+    ``attachment_path``; results are per recipient, in the same order.
+    """
+    emailer = sender or EmailSender()
+    emails = [
+        OutgoingEmail(d["to_address"], d["subject"], render_email_body(d.get("jobs", [])), d.get("attachment_path"))
+        for d in digests
+    ]
+    return emailer.send_batch(emails, max_connections=max_connections or int(os.getenv("SMTP_MAX_CONNECTIONS", 4)))
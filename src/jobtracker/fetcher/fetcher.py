@@ -6,8 +6,23 @@ import os
 import requests
 from typing import List, Dict, Optional
 
+from jobtracker.metrics import metrics
+
 RAPIDAPI_HOST = "jsearch.p.rapidapi.com"
 
+def date_posted_filter(posted_within_days: int) -> str:
+    """Map posted_within_days to JSearch's date_posted values"""
+    if posted_within_days <= 1:
+        return "today"
+    elif posted_within_days <= 3:
+        return "3days"
+    elif posted_within_days <= 7:
+        return "week"
+    elif posted_within_days <= 30:
+        return "month"
+    return "anytime"
+
+
 class JobFetcher:
     """Fetch jobs from public job APIs. Start with JSearch (RapidAPI).
 
@@ -32,33 +47,25 @@ class JobFetcher:
         Returns a list of dicts with keys: id, title, company, city, state, posted_at, apply_url, source
         """
         import sys
-        # Map posted_within_days to API values
-        if posted_within_days <= 1:
-            date_posted = "today"
-        elif posted_within_days <= 3:
-            date_posted = "3days"
-        elif posted_within_days <= 7:
-            date_posted = "week"
-        elif posted_within_days <= 30:
-            date_posted = "month"
-        else:
-            date_posted = "anytime"
         params = {
             "query": keywords,
             "location": location,
-            "date_posted": date_posted,
+            "date_posted": date_posted_filter(posted_within_days),
             "page": page,
             "num_pages": 1,
         }
         try:
             resp = requests.get(self.base_url, headers=self.headers, params=params, timeout=30)
+            self._record_quota(resp)
             resp.raise_for_status()
             payload = resp.json()
         except Exception as e:
             print(f"[JobFetcher] Error fetching jobs: {e}", file=sys.stderr)
             if hasattr(e, 'response') and e.response is not None:
                 print(f"[JobFetcher] Response text: {e.response.text}", file=sys.stderr)
+            metrics.inc("jobtracker_api_requests_total", api="jsearch", outcome="error")
             return []
+        metrics.inc("jobtracker_api_requests_total", api="jsearch", outcome="ok")
 
         if not isinstance(payload, dict) or "data" not in payload:
             print(f"[JobFetcher] Unexpected API response: {payload}", file=sys.stderr)
@@ -82,3 +89,12 @@ class JobFetcher:
         if not jobs:
             print(f"[JobFetcher] No jobs found. Raw API data: {raw}", file=sys.stderr)
         return jobs
+
+    @staticmethod
+    def _record_quota(resp):
+        """Expose RapidAPI's rate-limit headers as quota gauges"""
+        for header, gauge in (("x-ratelimit-requests-limit", "jobtracker_api_quota_limit"),
+                              ("x-ratelimit-requests-remaining", "jobtracker_api_quota_remaining")):
+            value = resp.headers.get(header)
+            if value is not None and value.isdigit():
+                metrics.set(gauge, int(value), api="jsearch")
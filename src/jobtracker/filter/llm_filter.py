@@ -1,10 +1,8 @@
 import os
 import re
 from typing import List, Dict
-from sentence_transformers import SentenceTransformer, util
 
-# Initialize model for semantic filtering
-model = SentenceTransformer('all-MiniLM-L6-v2')
+from jobtracker.models import get_sentence_model
 
 def filter_jobs(jobs: List[Dict], user_prompt: str, use_llm: bool = False) -> List[Dict]:
     """Enhanced job filtering with semantic similarity and optional LLM integration"""
@@ -17,6 +15,8 @@ def filter_jobs(jobs: List[Dict], user_prompt: str, use_llm: bool = False) -> Li
 
 def _semantic_filter(jobs: List[Dict], user_prompt: str) -> List[Dict]:
     """Semantic filtering using sentence transformers"""
+    from sentence_transformers import util
+    model = get_sentence_model()
     prompt_embedding = model.encode(user_prompt, convert_to_tensor=True)
     filtered_jobs = []
     
@@ -0,0 +1,223 @@
+"""jobtracker.matcher.embedding_store
+
+Append-only, memory-mapped store of job text embeddings.
+
+Vectors live in one flat float16 file per model and are read through ``np.memmap``,
+so every API worker (and the CLI) shares the same page-cache pages instead of
+holding private copies. Keys are content hashes of the embedded text, so a job
+seen again in a later search, page or session is not re-encoded.
+
+Writers append under an exclusive file lock (``flock``, ``msvcrt.locking`` on
+Windows): vector rows first, then their keys, so a reader that sees a key can
+always read its row. Once the store holds more than ``max_entries`` rows, the
+writer rewrites the newest rows into a new generation of files (old postings
+age out first) and switches the ``.gen`` pointer to it; readers follow the
+pointer on their next lookup.
+
+Usage:
+    store = EmbeddingStore(data_path("cache", "embeddings"), "all-MiniLM-L6-v2", dim=384)
+    vectors = store.encode(model, job_texts)   # looks up hits, batch-encodes misses
+"""
+import hashlib
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from jobtracker.config import JobTrackerConfig, data_path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+DTYPE = np.float16
+# Compaction keeps this fraction of max_entries, so it runs once per many appends rather than on every one
+COMPACT_TO = 0.75
+
+
+def text_key(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+@contextmanager
+def _exclusive(path: str) -> Iterator[None]:
+    """Cross-process writer lock on ``path``"""
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            return
+        f.seek(0)
+        while True:
+            try:
+                # LK_LOCK itself gives up after ~10 seconds
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                break
+            except OSError:
+                time.sleep(0.1)
+        try:
+            yield
+        finally:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class EmbeddingStore:
+    def __init__(self, directory: Optional[str], model_name: str, dim: int, max_entries: int = 0):
+        self.directory = os.path.abspath(directory or data_path("cache", "embeddings"))
+        self.model_name = model_name
+        self.dim = dim
+        # 0 = unbounded
+        self.max_entries = max_entries
+        os.makedirs(self.directory, exist_ok=True)
+        self._base = os.path.join(self.directory, model_name.replace("/", "__"))
+        self.gen_path = f"{self._base}.gen"
+        self.lock_path = f"{self._base}.lock"
+        self._lock = threading.Lock()
+        self._generation = -1
+        self._switch(self._current_generation())
+
+    def _paths(self, generation: int):
+        # Generation 0 keeps the file names used before compaction existed
+        stem = self._base if generation == 0 else f"{self._base}.{generation}"
+        return f"{stem}.f16", f"{stem}.keys"
+
+    def _current_generation(self) -> int:
+        try:
+            with open(self.gen_path, "rb") as f:
+                return int(f.read() or 0)
+        except FileNotFoundError:
+            return 0
+
+    def _switch(self, generation: int):
+        """Start reading generation ``generation`` from scratch"""
+        self._generation = generation
+        self.data_path, self.keys_path = self._paths(generation)
+        for path in (self.data_path, self.keys_path):
+            open(path, "ab").close()
+        self._index: Dict[str, int] = {}
+        self._keys_offset = 0
+        self._vectors: Optional[np.memmap] = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._index)
+
+    def _refresh(self):
+        """Follow a compaction, then pick up rows appended by other processes since the last read"""
+        generation = self._current_generation()
+        if generation != self._generation:
+            self._switch(generation)
+        if os.path.getsize(self.keys_path) == self._keys_offset:
+            return
+        with open(self.keys_path, "rb") as f:
+            f.seek(self._keys_offset)
+            chunk = f.read()
+        # Only consume complete lines; a writer may be mid-append
+        complete = chunk[:chunk.rfind(b"\n") + 1]
+        for line in complete.splitlines():
+            self._index.setdefault(line.decode("ascii"), len(self._index))
+        self._keys_offset += len(complete)
+        rows = len(self._index)
+        self._vectors = np.memmap(self.data_path, dtype=DTYPE, mode="r", shape=(rows, self.dim)) if rows else None
+
+    def get_many(self, keys: Sequence[str]) -> List[Optional[np.ndarray]]:
+        with self._lock:
+            self._refresh()
+            return [
+                np.asarray(self._vectors[self._index[key]], dtype=np.float32) if key in self._index else None
+                for key in keys
+            ]
+
+    def put_many(self, keys: Sequence[str], vectors: np.ndarray):
+        vectors = np.asarray(vectors, dtype=DTYPE).reshape(-1, self.dim)
+        with self._lock, _exclusive(self.lock_path):
+            self._refresh()
+            new = [(k, v) for k, v in zip(keys, vectors) if k not in self._index]
+            # Duplicate keys within one batch are written once
+            new = list({k: v for k, v in new}.items())
+            if not new:
+                return
+            with open(self.data_path, "r+b") as data:
+                # Drop rows left without keys by a writer that died between the two appends
+                data.truncate(len(self._index) * self.dim * np.dtype(DTYPE).itemsize)
+                data.seek(0, os.SEEK_END)
+                data.write(np.stack([v for _, v in new]).astype(DTYPE).tobytes())
+            with open(self.keys_path, "ab") as f:
+                f.write("".join(f"{k}\n" for k, _ in new).encode("ascii"))
+            self._refresh()
+            if self.max_entries and len(self._index) > self.max_entries:
+                self._compact(int(self.max_entries * COMPACT_TO))
+
+    def compact(self, keep: int):
+        """Rebuild the store with only its ``keep`` newest rows"""
+        with self._lock, _exclusive(self.lock_path):
+            self._refresh()
+            if len(self._index) > keep:
+                self._compact(keep)
+
+    def _compact(self, keep: int):
+        # Caller holds both locks. Rows are in insertion order, so the newest are at the end
+        keys = list(self._index)[len(self._index) - keep:] if keep else []
+        rows = np.array(self._vectors[len(self._index) - keep:]) if keep else np.zeros((0, self.dim), DTYPE)
+        old_paths = (self.data_path, self.keys_path)
+        generation = self._generation + 1
+        data_file, keys_file = self._paths(generation)
+        with open(data_file, "wb") as f:
+            f.write(rows.astype(DTYPE).tobytes())
+        with open(keys_file, "wb") as f:
+            f.write("".join(f"{k}\n" for k in keys).encode("ascii"))
+        tmp = f"{self.gen_path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(str(generation).encode("ascii"))
+        # Readers switch to the new files on their next lookup
+        os.replace(tmp, self.gen_path)
+        self._vectors = None
+        self._refresh()
+        for path in old_paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass  # Windows refuses while another process still maps it; the file is left behind
+
+    def encode(self, model, texts: Sequence[str], batch_size: int = 32) -> np.ndarray:
+        """Embeddings for ``texts`` (float32, one row per text); only unseen texts hit the model"""
+        keys = [text_key(text) for text in texts]
+        found = self.get_many(keys)
+        missing = [i for i, vector in enumerate(found) if vector is None]
+        if missing:
+            encoded = np.asarray(model.encode([texts[i] for i in missing], batch_size=batch_size), dtype=np.float32)
+            self.put_many([keys[i] for i in missing], encoded)
+            for i, vector in zip(missing, encoded):
+                found[i] = vector.astype(DTYPE).astype(np.float32)  # same precision as stored hits
+        if not found:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return np.stack(found)
+
+
+_stores: Dict[str, EmbeddingStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_embedding_store(model, model_name: str) -> Optional[EmbeddingStore]:
+    """Shared store for ``model_name``; None when disabled with EMBEDDING_STORE_ENABLED=false"""
+    config = JobTrackerConfig.from_env()
+    if not config.embedding_store_enabled:
+        return None
+    with _stores_lock:
+        store = _stores.get(model_name)
+        if store is None:
+            store = EmbeddingStore(config.embedding_store_path or None, model_name,
+                                   model.get_sentence_embedding_dimension(),
+                                   max_entries=config.embedding_store_max_entries)
+            _stores[model_name] = store
+    return store
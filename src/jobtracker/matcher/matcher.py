@@ -1,34 +1,76 @@
-from sentence_transformers import SentenceTransformer, util
 from typing import List, Dict
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 
-model = SentenceTransformer('all-MiniLM-L6-v2')
+from jobtracker.matcher.embedding_store import get_embedding_store
+from jobtracker.matcher.skill_bitmap import SkillTaxonomy, SkillBitmapScorer
+from jobtracker.metrics import metrics
+from jobtracker.models import SENTENCE_TRANSFORMER_MODEL, get_sentence_model
+from jobtracker.resume.profile import has_current_embedding, profile_embedding, profile_skill_bitmap, profile_text
 
-def job_matcher(jobs: List[Dict], resume_profile: Dict) -> List[Dict]:
+taxonomy = SkillTaxonomy()
+
+def _resume_embedding(resume_profile: Dict, model):
+    """Stored resume embedding when it came from the same model, otherwise encode the text"""
+    if has_current_embedding(resume_profile, SENTENCE_TRANSFORMER_MODEL):
+        return profile_embedding(resume_profile)
+    text = profile_text(resume_profile)
+    if not text:
+        raise ValueError("Resume profile has no usable embedding and no resume text to encode; re-upload the resume")
+    return np.asarray(model.encode(text), dtype=np.float32)
+
+def _job_embeddings(model, job_texts: List[str]) -> np.ndarray:
+    """Job text embeddings, served from the shared memory-mapped store when enabled"""
+    store = get_embedding_store(model, SENTENCE_TRANSFORMER_MODEL)
+    if store is not None:
+        return store.encode(model, job_texts)
+    return np.asarray(model.encode(job_texts), dtype=np.float32)
+
+def _cosine(vector: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(vector)
+    return (matrix @ vector) / np.maximum(norms, 1e-12)
+
+def job_matcher(jobs: List[Dict], resume_profile: Dict, semantic_weight: float = 0.7, skill_weight: float = 0.3) -> List[Dict]:
     """Enhanced job matcher with semantic similarity and skill matching"""
-    resume_text = resume_profile['text']
     resume_skills = set([s.lower() for s in resume_profile.get('tech_skills', [])])
+    model = get_sentence_model()
     
-    # Pre-compute resume embedding
-    resume_emb = model.encode(resume_text, convert_to_tensor=True)
-    
+    job_texts = []
     for job in jobs:
         job_desc = job.get('raw', {}).get('job_description') or job.get('title', '')
-        job_text = f"{job.get('title', '')} {job_desc}"
-        
+        job_texts.append(f"{job.get('title', '')} {job_desc}")
+    
+    # Pre-computed (cached) or freshly encoded resume embedding, job embeddings in one batch
+    with metrics.stage("embed", jobs_in=len(jobs)) as stage:
+        resume_emb = _resume_embedding(resume_profile, model)
+        job_embs = _job_embeddings(model, job_texts) if job_texts else None
+        stage.jobs_out = len(job_texts)
+    
+    with metrics.stage("match", jobs_in=len(jobs)) as stage:
+        _score_jobs(jobs, job_texts, job_embs, resume_emb, resume_profile, resume_skills, semantic_weight, skill_weight)
+        stage.jobs_out = len(jobs)
+    
+    return sorted(jobs, key=lambda x: x['match_score'], reverse=True)
+
+def _score_jobs(jobs, job_texts, job_embs, resume_emb, resume_profile, resume_skills, semantic_weight, skill_weight):
+    if not jobs:
+        return
+    semantic_scores = _cosine(resume_emb, job_embs)
+    
+    # Skill matching scores for the whole batch as bitmap popcounts
+    skill_taxonomy = taxonomy.extend(resume_skills)
+    scorer = SkillBitmapScorer(skill_taxonomy)
+    skill_scores = scorer.score(profile_skill_bitmap(resume_profile, skill_taxonomy), skill_taxonomy.encode_texts(job_texts))
+    
+    for i, (job, job_text) in enumerate(zip(jobs, job_texts)):
         # Semantic similarity using sentence transformers
-        job_emb = model.encode(job_text, convert_to_tensor=True)
-        semantic_score = float(util.cos_sim(resume_emb, job_emb)[0][0])
+        semantic_score = float(semantic_scores[i])
         
-        # Skill matching score
         job_text_lower = job_text.lower()
-        matched_skills = [skill for skill in resume_skills if skill in job_text_lower]
-        skill_score = len(matched_skills) / max(len(resume_skills), 1) if resume_skills else 0
+        matched_skills = skill_taxonomy.decode(skill_scores.overlap[i])
+        skill_score = float(skill_scores.skill_score[i])
         
-        # Combined score (70% semantic, 30% skill matching)
-        combined_score = (semantic_score * 0.7) + (skill_score * 0.3)
+        # Combined score (default 70% semantic, 30% skill matching)
+        combined_score = (semantic_score * semantic_weight) + (skill_score * skill_weight)
         
         # Experience factor (if job mentions years and we have experience data)
         experience_bonus = 0
@@ -46,5 +88,8 @@ def job_matcher(jobs: List[Dict], resume_profile: Dict) -> List[Dict]:
         job['matched_skills'] = matched_skills
         job['semantic_score'] = round(semantic_score * 100, 2)
         job['skill_match_score'] = round(skill_score * 100, 2)
-    
-    return sorted(jobs, key=lambda x: x['match_score'], reverse=True)
+        job['category_coverage'] = {
+            category: round(float(coverage) * 100, 2)
+            for category, coverage in zip(skill_taxonomy.categories, skill_scores.category_coverage[i])
+            if coverage > 0
+        }
@@ -0,0 +1,171 @@
+"""jobtracker.matcher.skill_bitmap
+
+Fixed-width skill bitmaps indexed by the ``TECH_SKILLS`` taxonomy.
+
+Every skill in the taxonomy owns one bit; a profile (resume or job) is a row of
+``uint64`` words.  Overlap, per-category coverage and weighted skill scores are
+then popcounts over whole job batches instead of per-job string comparisons.
+
+Usage:
+    taxonomy = SkillTaxonomy().extend(resume_skills)
+    scorer = SkillBitmapScorer(taxonomy)
+    scores = scorer.score(taxonomy.encode(resume_skills), taxonomy.encode_texts(job_texts))
+"""
+import hashlib
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from jobtracker.config import TECH_SKILLS
+from jobtracker.skills import SkillExtractor, get_skill_extractor
+
+WORD_BITS = 64
+OTHER_CATEGORY = "other"
+
+# Byte-wise popcount table, used when numpy has no native bitwise_count (< 2.0)
+_POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def popcount(words: np.ndarray) -> np.ndarray:
+    """Count set bits across the last axis of a uint64 word array"""
+    words = np.ascontiguousarray(words, dtype=np.uint64)
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+    as_bytes = words.view(np.uint8).reshape(words.shape[:-1] + (-1,))
+    return _POPCOUNT_TABLE[as_bytes].sum(axis=-1, dtype=np.int64)
+
+
+class SkillTaxonomy:
+    """Maps taxonomy skills to bit positions and category masks"""
+
+    def __init__(self, categories: Optional[Dict[str, List[str]]] = None):
+        self.categories_map = {
+            category: [s.lower() for s in skills]
+            for category, skills in (categories if categories is not None else TECH_SKILLS).items()
+        }
+
+        self.skills: List[str] = []
+        self.index: Dict[str, int] = {}
+        skill_categories: List[int] = []
+        self.categories = list(self.categories_map)
+        for cat_idx, category in enumerate(self.categories):
+            for skill in self.categories_map[category]:
+                if skill in self.index:
+                    continue  # first category wins for skills listed twice
+                self.index[skill] = len(self.skills)
+                self.skills.append(skill)
+                skill_categories.append(cat_idx)
+
+        self.n_words = max(1, -(-len(self.skills) // WORD_BITS))
+        self.category_masks = np.zeros((len(self.categories), self.n_words), dtype=np.uint64)
+        for bit, cat_idx in enumerate(skill_categories):
+            self.category_masks[cat_idx, bit // WORD_BITS] |= np.uint64(1 << (bit % WORD_BITS))
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+    @property
+    def fingerprint(self) -> str:
+        """Identifies the bit layout, so stored bitmaps are only decoded with the same taxonomy"""
+        return hashlib.sha1("|".join(self.skills).encode("utf-8")).hexdigest()[:12]
+
+    def extend(self, skills: Iterable[str]) -> "SkillTaxonomy":
+        """Return a taxonomy that also covers skills outside the predefined categories"""
+        extra = sorted({s.lower() for s in skills if s and s.lower() not in self.index})
+        if not extra:
+            return self
+        categories = dict(self.categories_map)
+        categories[OTHER_CATEGORY] = categories.get(OTHER_CATEGORY, []) + extra
+        return SkillTaxonomy(categories)
+
+    def empty(self, n: Optional[int] = None) -> np.ndarray:
+        shape = (self.n_words,) if n is None else (n, self.n_words)
+        return np.zeros(shape, dtype=np.uint64)
+
+    def encode(self, skills: Iterable[str]) -> np.ndarray:
+        """Encode a list of skill names; names outside the taxonomy are ignored"""
+        bitmap = self.empty()
+        for skill in skills:
+            bit = self.index.get(skill.lower())
+            if bit is not None:
+                bitmap[bit // WORD_BITS] |= np.uint64(1 << (bit % WORD_BITS))
+        return bitmap
+
+    def encode_batch(self, skill_lists: Iterable[Iterable[str]]) -> np.ndarray:
+        skill_lists = list(skill_lists)
+        bitmaps = self.empty(len(skill_lists))
+        for row, skills in enumerate(skill_lists):
+            bitmaps[row] = self.encode(skills)
+        return bitmaps
+
+    def encode_texts(self, texts: Iterable[str], extractor: Optional[SkillExtractor] = None) -> np.ndarray:
+        """Encode free text with the shared PhraseMatcher extractor
+
+        Skills added through ``extend`` that the extractor does not know are
+        looked up as substrings.
+        """
+        extractor = extractor or get_skill_extractor()
+        texts = list(texts)
+        extra = [skill for skill in self.skills if skill not in extractor]
+        skill_lists = []
+        for text, found in zip(texts, extractor.extract_texts(texts)):
+            text_lower = text.lower()
+            skill_lists.append(list(found) + [skill for skill in extra if skill in text_lower])
+        return self.encode_batch(skill_lists)
+
+    def decode(self, bitmap: np.ndarray) -> List[str]:
+        """Skill names whose bits are set, in taxonomy order"""
+        bits = np.unpackbits(np.ascontiguousarray(bitmap, dtype=np.uint64).view(np.uint8), bitorder="little")
+        return [self.skills[i] for i in np.flatnonzero(bits[:len(self.skills)])]
+
+
+@dataclass
+class SkillScores:
+    """Batch skill scores for one resume against N jobs"""
+    overlap: np.ndarray            # (n_jobs, n_words) resume & job bitmaps
+    matched_count: np.ndarray      # (n_jobs,)
+    skill_score: np.ndarray        # (n_jobs,) matched / resume skill count, 0..1
+    category_coverage: np.ndarray  # (n_jobs, n_categories) 0..1, 0 where resume has no skills in category
+    weighted_score: np.ndarray     # (n_jobs,) category-weighted coverage, 0..1
+
+
+class SkillBitmapScorer:
+    """Scores resume/job skill overlap with popcounts over whole job batches"""
+
+    def __init__(self, taxonomy: Optional[SkillTaxonomy] = None, category_weights: Optional[Dict[str, float]] = None):
+        self.taxonomy = taxonomy or SkillTaxonomy()
+        weights = category_weights or {}
+        self.category_weights = np.array(
+            [weights.get(category, 1.0) for category in self.taxonomy.categories], dtype=np.float64
+        )
+
+    def score(self, resume_bitmap: np.ndarray, job_bitmaps: np.ndarray) -> SkillScores:
+        job_bitmaps = np.atleast_2d(job_bitmaps)
+        overlap = job_bitmaps & resume_bitmap
+        matched_count = popcount(overlap)
+
+        resume_count = int(popcount(resume_bitmap))
+        skill_score = matched_count / resume_count if resume_count else np.zeros(len(job_bitmaps))
+
+        masks = self.taxonomy.category_masks
+        resume_per_category = popcount(resume_bitmap & masks)                    # (n_categories,)
+        matched_per_category = popcount(overlap[:, None, :] & masks[None, :, :])  # (n_jobs, n_categories)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            category_coverage = np.where(
+                resume_per_category > 0, matched_per_category / np.maximum(resume_per_category, 1), 0.0
+            )
+
+        weighted_total = float((self.category_weights * resume_per_category).sum())
+        if weighted_total:
+            weighted_score = (matched_per_category * self.category_weights).sum(axis=1) / weighted_total
+        else:
+            weighted_score = np.zeros(len(job_bitmaps))
+
+        return SkillScores(
+            overlap=overlap,
+            matched_count=matched_count,
+            skill_score=skill_score,
+            category_coverage=category_coverage,
+            weighted_score=weighted_score,
+        )
@@ -0,0 +1,237 @@
+"""jobtracker.metrics
+
+Lightweight in-process metrics: counters, gauges, histograms and per-stage timers.
+
+The API exposes the registry in Prometheus text format on ``/metrics``; the CLI
+writes the same data as a JSON run report. Work done in executor processes is
+collected with ``collect_metrics`` and merged into the parent's registry.
+
+Usage:
+    with metrics.stage("fetch") as stage:
+        jobs = fetcher.fetch_jsearch(...)
+        stage.jobs_out = len(jobs)
+    metrics.inc("jobtracker_cache_hits_total", cache="resume")
+"""
+import bisect
+import multiprocessing
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+STAGES = ("fetch", "dedup", "parse", "embed", "match", "filter", "storage", "email")
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+    def merge(self, other: Dict):
+        for i, c in enumerate(other["counts"]):
+            self.counts[i] += c
+        self.sum += other["sum"]
+        self.count += other["count"]
+
+    def to_dict(self) -> Dict:
+        return {"buckets": list(self.buckets), "counts": list(self.counts), "sum": self.sum, "count": self.count}
+
+
+class StageTimer:
+    """Handle yielded by ``MetricsRegistry.stage``; set ``jobs_out`` before the block ends"""
+
+    def __init__(self, name: str, jobs_in: Optional[int]):
+        self.name = name
+        self.jobs_in = jobs_in
+        self.jobs_out: Optional[int] = None
+        self.seconds = 0.0
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters: Dict[str, Dict[Labels, float]] = {}
+        self.gauges: Dict[str, Dict[Labels, float]] = {}
+        self.histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self.started_at = time.time()
+        # Set by ``collecting``: this thread records into a separate registry
+        self._local = threading.local()
+
+    def _collector(self) -> Optional["MetricsRegistry"]:
+        return getattr(self._local, "collector", None)
+
+    @contextmanager
+    def collecting(self) -> Iterator["MetricsRegistry"]:
+        """Record this thread's metrics into a fresh registry instead of this one for the duration of the block"""
+        previous = self._collector()
+        self._local.collector = MetricsRegistry()
+        try:
+            yield self._local.collector
+        finally:
+            self._local.collector = previous
+
+    def inc(self, name: str, value: float = 1, **labels):
+        collector = self._collector()
+        if collector is not None:
+            return collector.inc(name, value, **labels)
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            key = _labels(labels)
+            series[key] = series.get(key, 0) + value
+
+    def set(self, name: str, value: float, **labels):
+        collector = self._collector()
+        if collector is not None:
+            return collector.set(name, value, **labels)
+        with self._lock:
+            self.gauges.setdefault(name, {})[_labels(labels)] = value
+
+    def observe(self, name: str, value: float, **labels):
+        collector = self._collector()
+        if collector is not None:
+            return collector.observe(name, value, **labels)
+        with self._lock:
+            series = self.histograms.setdefault(name, {})
+            key = _labels(labels)
+            if key not in series:
+                series[key] = Histogram()
+            series[key].observe(value)
+
+    @contextmanager
+    def stage(self, name: str, jobs_in: Optional[int] = None) -> Iterator[StageTimer]:
+        """Time a pipeline stage and count the jobs going in and out of it"""
+        timer = StageTimer(name, jobs_in)
+        start = time.perf_counter()
+        outcome = "ok"
+        try:
+            yield timer
+        except BaseException:
+            outcome = "error"
+            raise
+        finally:
+            timer.seconds = time.perf_counter() - start
+            self.observe("jobtracker_stage_duration_seconds", timer.seconds, stage=name)
+            self.inc("jobtracker_stage_runs_total", stage=name, outcome=outcome)
+            if timer.jobs_in is not None:
+                self.inc("jobtracker_stage_jobs_in_total", timer.jobs_in, stage=name)
+            if timer.jobs_out is not None:
+                self.inc("jobtracker_stage_jobs_out_total", timer.jobs_out, stage=name)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "counters": {n: [[list(k), v] for k, v in s.items()] for n, s in self.counters.items()},
+                "gauges": {n: [[list(k), v] for k, v in s.items()] for n, s in self.gauges.items()},
+                "histograms": {n: [[list(k), h.to_dict()] for k, h in s.items()] for n, s in self.histograms.items()},
+            }
+
+    def merge(self, snapshot: Dict):
+        """Add a snapshot taken in another process (see ``collect_metrics``)"""
+        with self._lock:
+            for name, series in snapshot.get("counters", {}).items():
+                target = self.counters.setdefault(name, {})
+                for key, value in series:
+                    key = tuple(tuple(kv) for kv in key)
+                    target[key] = target.get(key, 0) + value
+            for name, series in snapshot.get("gauges", {}).items():
+                target = self.gauges.setdefault(name, {})
+                for key, value in series:
+                    target[tuple(tuple(kv) for kv in key)] = value
+            for name, series in snapshot.get("histograms", {}).items():
+                target = self.histograms.setdefault(name, {})
+                for key, hist in series:
+                    key = tuple(tuple(kv) for kv in key)
+                    if key not in target:
+                        target[key] = Histogram(hist["buckets"])
+                    target[key].merge(hist)
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.gauges.clear()
+            self.histograms.clear()
+            self.started_at = time.time()
+
+    def report(self) -> Dict:
+        """JSON-friendly run report: per-stage timings and job counts plus all raw series"""
+        snapshot = self.snapshot()
+        stages = {}
+        for key, hist in self.histograms.get("jobtracker_stage_duration_seconds", {}).items():
+            stage = dict(key)["stage"]
+            stages[stage] = {"runs": hist.count, "seconds_total": round(hist.sum, 4),
+                             "seconds_avg": round(hist.sum / hist.count, 4) if hist.count else 0.0}
+        for direction in ("in", "out"):
+            for key, value in self.counters.get(f"jobtracker_stage_jobs_{direction}_total", {}).items():
+                stages.setdefault(dict(key)["stage"], {})[f"jobs_{direction}"] = value
+        ordered = {name: stages[name] for name in STAGES if name in stages}
+        ordered.update({name: data for name, data in stages.items() if name not in ordered})
+        return {
+            "started_at": self.started_at,
+            "elapsed_seconds": round(time.time() - self.started_at, 4),
+            "stages": ordered,
+            **snapshot,
+        }
+
+    def render_prometheus(self) -> str:
+        lines: List[str] = []
+
+        def fmt(labels: Labels, extra: Labels = ()) -> str:
+            pairs = list(labels) + list(extra)
+            if not pairs:
+                return ""
+            escaped = ",".join('{}="{}"'.format(k, v.replace("\\", "\\\\").replace('"', '\\"')) for k, v in pairs)
+            return "{" + escaped + "}"
+
+        with self._lock:
+            for name, series in sorted(self.counters.items()):
+                lines.append(f"# TYPE {name} counter")
+                lines.extend(f"{name}{fmt(k)} {v}" for k, v in series.items())
+            for name, series in sorted(self.gauges.items()):
+                lines.append(f"# TYPE {name} gauge")
+                lines.extend(f"{name}{fmt(k)} {v}" for k, v in series.items())
+            for name, series in sorted(self.histograms.items()):
+                lines.append(f"# TYPE {name} histogram")
+                for key, hist in series.items():
+                    cumulative = 0
+                    for bound, count in zip(hist.buckets, hist.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{fmt(key, (('le', str(bound)),))} {cumulative}")
+                    lines.append(f"{name}_bucket{fmt(key, (('le', '+Inf'),))} {hist.count}")
+                    lines.append(f"{name}_sum{fmt(key)} {hist.sum}")
+                    lines.append(f"{name}_count{fmt(key)} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry
+metrics = MetricsRegistry()
+
+
+def collect_metrics(fn: Callable, *args, **kwargs):
+    """Run ``fn`` in an executor process and return (result, metrics snapshot) for the parent to merge
+
+    On a thread executor ``fn`` already records into this process's registry, so
+    the snapshot is empty. In a worker process only this call's metrics are
+    collected (into a fresh registry), so concurrent calls on other threads of
+    the same worker and anything the worker recorded before are left alone.
+    """
+    if multiprocessing.parent_process() is None:
+        return fn(*args, **kwargs), {}
+    with metrics.collecting() as collected:
+        result = fn(*args, **kwargs)
+    return result, collected.snapshot()
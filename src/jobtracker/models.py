@@ -0,0 +1,110 @@
+"""jobtracker.models
+
+Shared, lazily loaded NLP models.
+
+Models are loaded on first use instead of at import time, so importing the CLI,
+the API or the tests does not pay for spaCy or MiniLM until a resume is actually
+parsed or a job is actually embedded. Every module gets the same instance.
+
+Set JOBTRACKER_PRELOAD_MODELS=1 to load everything up front instead (see
+``preload_models``): under gunicorn with ``preload_app`` the master loads the
+models once and forked workers share the weights copy-on-write.
+
+Usage:
+    nlp = get_nlp()
+    tokenizer = get_tokenizer()
+    model = get_sentence_model()
+"""
+import os
+import threading
+import time
+from typing import Dict
+
+from jobtracker.config import JobTrackerConfig
+
+SPACY_MODEL = "en_core_web_sm"
+# resume_parser only needs tokens, stop-word flags (lexical attributes) and NER
+SPACY_EXCLUDE = ["tagger", "parser", "attribute_ruler", "lemmatizer", "senter"]
+
+# Configured once in JobTrackerConfig (SENTENCE_TRANSFORMER_MODEL env var)
+SENTENCE_TRANSFORMER_MODEL = JobTrackerConfig.from_env().sentence_transformer_model
+
+# Representative inputs for warmup_batch: short resume/job snippets of mixed length
+WARMUP_TEXTS = [
+    "Senior DevOps Engineer with Kubernetes, Terraform and AWS experience",
+    "Data scientist - Python, pandas, scikit-learn, SQL; builds ML models in production",
+    "Junior software engineer, Java and Spring Boot, REST APIs, CI/CD with Jenkins",
+    "Frontend developer React TypeScript GraphQL",
+    "Site reliability engineer responsible for on-call, observability (Prometheus, Grafana), "
+    "incident response and capacity planning across multi-region Linux fleets",
+    "Machine learning engineer: PyTorch, MLOps, feature stores, model serving",
+    "Cloud architect designing Azure landing zones, networking and identity",
+    "Backend engineer Go microservices Kafka PostgreSQL Redis",
+]
+
+_lock = threading.Lock()
+_nlp = None
+_tokenizer = None
+_sentence_models: Dict[str, object] = {}
+
+
+def get_nlp():
+    """Return the shared spaCy pipeline, loading it with unused components excluded"""
+    global _nlp
+    if _nlp is None:
+        with _lock:
+            if _nlp is None:
+                import spacy
+                _nlp = spacy.load(SPACY_MODEL, exclude=SPACY_EXCLUDE)
+    return _nlp
+
+
+def get_tokenizer():
+    """Return a shared blank English pipeline: tokenizer only, no trained components"""
+    global _tokenizer
+    if _tokenizer is None:
+        with _lock:
+            if _tokenizer is None:
+                import spacy
+                _tokenizer = spacy.blank("en")
+    return _tokenizer
+
+
+def get_sentence_model(name: str = SENTENCE_TRANSFORMER_MODEL):
+    """Return the shared SentenceTransformer for ``name``"""
+    model = _sentence_models.get(name)
+    if model is None:
+        with _lock:
+            model = _sentence_models.get(name)
+            if model is None:
+                from sentence_transformers import SentenceTransformer
+                model = SentenceTransformer(name)
+                _sentence_models[name] = model
+    return model
+
+
+def preload_enabled() -> bool:
+    return os.getenv("JOBTRACKER_PRELOAD_MODELS", "0").lower() in ("1", "true")
+
+
+def preload_models():
+    """Load every shared model now rather than on first use
+
+    Only loads weights; no inference runs here, so it is safe in a process that
+    forks afterwards (torch/OpenMP thread pools start on the first encode).
+    """
+    get_nlp()
+    get_tokenizer()
+    get_sentence_model()
+
+
+def warmup_batch() -> float:
+    """Run one batch through spaCy and the sentence model; returns the seconds it took
+
+    The first calls pay for model loading, allocator growth and thread-pool startup,
+    so callers repeat this until the latency settles.
+    """
+    start = time.perf_counter()
+    list(get_nlp().pipe(WARMUP_TEXTS))
+    get_sentence_model().encode(WARMUP_TEXTS, batch_size=len(WARMUP_TEXTS))
+    return time.perf_counter() - start
@@ -0,0 +1,124 @@
+"""jobtracker.resume.bulk
+
+Bulk resume ingestion for batches of hundreds of PDF/DOCX files.
+
+Text extraction (pdfplumber / python-docx, pure Python and CPU bound) runs in a
+process pool; the extracted texts are fed to ``nlp.pipe`` in chunks, so spaCy
+batches documents instead of paying a full ``nlp(text)`` call per file.
+Profiles are yielded as they complete and per-file failures (extraction, spaCy
+or profile building) are reported as results instead of aborting the batch.
+
+Usage:
+    for result in bulk_resume_parser(paths, workers=4):
+        if result.ok:
+            save(result.path, result.profile)
+        else:
+            print(f"{result.path}: {result.error}")
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from jobtracker.models import get_nlp
+from jobtracker.resume.parser import build_profile, extract_text
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx")
+
+
+@dataclass
+class BulkParseResult:
+    """Outcome of parsing one resume in a batch"""
+    path: str
+    profile: Optional[Dict] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def find_resumes(directory: str) -> list:
+    """All PDF/DOCX files below ``directory``, sorted"""
+    return sorted(
+        os.path.join(root, name)
+        for root, _, files in os.walk(directory)
+        for name in files
+        if name.lower().endswith(SUPPORTED_EXTENSIONS)
+    )
+
+
+def _parse_chunk(nlp, chunk: List[Tuple[str, str]], batch_size: int, n_process: int) -> Iterator[BulkParseResult]:
+    """Profiles for one chunk of (text, path) pairs through a single ``nlp.pipe`` call"""
+    try:
+        docs = list(nlp.pipe([text for text, _ in chunk], batch_size=batch_size, n_process=n_process))
+    except Exception:
+        # One bad document fails the whole pipe call: redo the chunk per document so only it is reported
+        docs = []
+        for text, _ in chunk:
+            try:
+                docs.append(nlp(text))
+            except Exception as e:
+                docs.append(e)
+
+    for doc, (text, path) in zip(docs, chunk):
+        if isinstance(doc, Exception):
+            yield BulkParseResult(path, error=f"NLP processing failed: {doc}")
+            continue
+        try:
+            yield BulkParseResult(path, profile=build_profile(text, doc))
+        except Exception as e:
+            yield BulkParseResult(path, error=f"Profile extraction failed: {e}")
+
+
+def bulk_resume_parser(
+    resume_paths: Iterable[str],
+    workers: Optional[int] = None,
+    batch_size: int = 32,
+    n_process: int = 1,
+) -> Iterator[BulkParseResult]:
+    """Parse many resumes, yielding a BulkParseResult per file as it completes
+
+    ``workers`` sizes the text-extraction process pool; ``batch_size`` and
+    ``n_process`` are passed to ``nlp.pipe``.
+    """
+    nlp = get_nlp()
+    # Enough documents per pipe call to fill every spaCy process with a full batch
+    chunk_size = batch_size * max(1, n_process)
+    chunk: List[Tuple[str, str]] = []
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(extract_text, path): path for path in resume_paths}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                chunk.append((future.result(), path))
+            except Exception as e:
+                yield BulkParseResult(path, error=f"Text extraction failed: {e}")
+                continue
+            if len(chunk) >= chunk_size:
+                yield from _parse_chunk(nlp, chunk, batch_size, n_process)
+                chunk = []
+        if chunk:
+            yield from _parse_chunk(nlp, chunk, batch_size, n_process)
+
+
+if __name__ == "__main__":
+    import json
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: python -m jobtracker.resume.bulk <resume-dir> [output.jsonl]")
+        sys.exit(1)
+
+    paths = find_resumes(sys.argv[1])
+    out = open(sys.argv[2], "w") if len(sys.argv) > 2 else sys.stdout
+    parsed = failed = 0
+    for result in bulk_resume_parser(paths):
+        if result.ok:
+            parsed += 1
+            out.write(json.dumps({"path": result.path, "profile": result.profile}) + "\n")
+        else:
+            failed += 1
+            print(f"❌ {result.path}: {result.error}", file=sys.stderr)
+    print(f"✅ Parsed {parsed}/{len(paths)} resumes ({failed} failed)", file=sys.stderr)
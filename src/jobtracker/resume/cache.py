@@ -0,0 +1,146 @@
+"""jobtracker.resume.cache
+
+Persistent resume profile cache keyed by content hash.
+
+Profiles are stored in a local SQLite file keyed by SHA-256 of the resume bytes
+plus ``PARSER_VERSION``, together with the resume embedding, so a re-uploaded
+resume skips both spaCy/pdfplumber parsing and MiniLM encoding. The least
+recently used entries are evicted once ``max_entries`` is exceeded.
+
+Usage:
+    cache = ResumeProfileCache()
+    profile = cached_resume_parser("resume.pdf", cache)
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import BinaryIO, Callable, Dict, Iterator, Optional
+
+import numpy as np
+
+from jobtracker.config import JobTrackerConfig, data_path
+from jobtracker.models import SENTENCE_TRANSFORMER_MODEL, get_sentence_model
+from jobtracker.metrics import metrics
+from jobtracker.resume.parser import PARSER_VERSION, resume_parser
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS resume_profiles (
+    cache_key TEXT PRIMARY KEY,
+    profile TEXT NOT NULL,
+    embedding BLOB,
+    embedding_model TEXT,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_resume_profiles_last_used ON resume_profiles(last_used);
+"""
+
+
+def content_hash(source: BinaryIO, chunk_size: int = 1 << 20) -> str:
+    """SHA-256 hex digest of a binary stream, read in chunks"""
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: source.read(chunk_size), b""):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_hash(path: str) -> str:
+    with open(path, "rb") as f:
+        return content_hash(f)
+
+
+class ResumeProfileCache:
+    """SQLite-backed LRU cache of parsed resume profiles and their embeddings"""
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 256, clock: Callable[[], float] = time.time):
+        self.path = os.path.abspath(path or data_path("cache", "resume_profiles.db"))
+        self.max_entries = max_entries
+        # Source of last_used timestamps (the LRU order); injectable so eviction is testable on coarse clocks
+        self.clock = clock
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @classmethod
+    def from_config(cls, config: JobTrackerConfig) -> "ResumeProfileCache":
+        return cls(config.resume_cache_path or None, config.resume_cache_max_entries)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # One short-lived connection per call keeps the cache safe across threads and processes
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def make_key(sha256: str) -> str:
+        return f"{sha256}:{PARSER_VERSION}"
+
+    def get(self, sha256: str) -> Optional[Dict]:
+        key = self.make_key(sha256)
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT profile, embedding, embedding_model FROM resume_profiles WHERE cache_key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE resume_profiles SET last_used = ? WHERE cache_key = ?", (self.clock(), key))
+
+        profile = json.loads(row[0])
+        if row[1] is not None:
+            profile["embedding"] = np.frombuffer(row[1], dtype=np.float32).tolist()
+            profile["embedding_model"] = row[2]
+        return profile
+
+    def put(self, sha256: str, profile: Dict, embedding: Optional[np.ndarray] = None, embedding_model: Optional[str] = None):
+        stored = {k: v for k, v in profile.items() if k not in ("embedding", "embedding_model")}
+        blob = np.asarray(embedding, dtype=np.float32).tobytes() if embedding is not None else None
+        now = self.clock()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO resume_profiles VALUES (?, ?, ?, ?, ?, ?)",
+                (self.make_key(sha256), json.dumps(stored), blob, embedding_model, now, now),
+            )
+            conn.execute(
+                """DELETE FROM resume_profiles WHERE cache_key NOT IN (
+                       SELECT cache_key FROM resume_profiles ORDER BY last_used DESC LIMIT ?)""",
+                (self.max_entries,),
+            )
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM resume_profiles")
+
+
+def cached_resume_parser(resume_path: str, cache: Optional[ResumeProfileCache] = None, sha256: Optional[str] = None) -> Dict:
+    """resume_parser with a content-hash cache; also attaches the resume embedding
+
+    The returned profile carries ``content_hash``, ``embedding`` and ``embedding_model``
+    so job_matcher can skip re-encoding the resume.
+    """
+    cache = cache or ResumeProfileCache.from_config(JobTrackerConfig.from_env())
+    sha256 = sha256 or file_hash(resume_path)
+
+    profile = cache.get(sha256)
+    if profile is not None:
+        metrics.inc("jobtracker_cache_hits_total", cache="resume")
+        return profile
+    metrics.inc("jobtracker_cache_misses_total", cache="resume")
+
+    with metrics.stage("parse"):
+        profile = resume_parser(resume_path)
+    profile["content_hash"] = sha256
+    with metrics.stage("embed"):
+        embedding = get_sentence_model().encode(profile["text"])
+    cache.put(sha256, profile, embedding, SENTENCE_TRANSFORMER_MODEL)
+
+    profile["embedding"] = np.asarray(embedding, dtype=np.float32).tolist()
+    profile["embedding_model"] = SENTENCE_TRANSFORMER_MODEL
+    return profile
@@ -1,57 +1,49 @@
 import os
 from typing import Dict, List
-import spacy
-import pdfplumber
 from docx import Document
 from collections import Counter
 import re
 
-nlp = spacy.load("en_core_web_sm")
+from jobtracker.models import get_nlp
+from jobtracker.resume.pdf_text import PdfLimits, extract_pdf_text
+from jobtracker.skills import get_skill_extractor
 
-# Enhanced skill/tech extraction from resume PDF/DOCX
-def resume_parser(resume_path: str) -> Dict:
-    text = ""
+# Bump whenever the profile produced by resume_parser changes, so cached profiles are rebuilt
+PARSER_VERSION = "4"
+
+def extract_text(resume_path: str, pdf_limits: PdfLimits = None) -> str:
+    """Extract plain text from a PDF/DOCX resume"""
     if resume_path.lower().endswith(".pdf"):
-        with pdfplumber.open(resume_path) as pdf:
-            for page in pdf.pages:
-                text += page.extract_text() + "\n"
+        return extract_pdf_text(resume_path, pdf_limits or PdfLimits.from_env())
     elif resume_path.lower().endswith(".docx"):
         doc = Document(resume_path)
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
+        parts = [paragraph.text for paragraph in doc.paragraphs]
         for table in doc.tables:
             for row in table.rows:
                 for cell in row.cells:
-                    text += cell.text + "\n"
+                    parts.append(cell.text)
+        return "\n".join(parts)
     else:
         raise ValueError(f"Unsupported file format: {resume_path}")
-    
-    # Enhanced skill extraction with predefined tech skills
-    
-    # Enhanced skill extraction with predefined tech skills
-    tech_skills = {
-        'python', 'java', 'javascript', 'typescript', 'react', 'node.js', 'angular', 'vue',
-        'docker', 'kubernetes', 'aws', 'azure', 'gcp', 'terraform', 'ansible', 'jenkins',
-        'git', 'linux', 'sql', 'postgresql', 'mongodb', 'redis', 'elasticsearch',
-        'devops', 'ci/cd', 'microservices', 'api', 'rest', 'graphql', 'kafka',
-        'machine learning', 'ai', 'data science', 'pandas', 'numpy', 'tensorflow',
-        'pytorch', 'scikit-learn', 'spark', 'hadoop', 'tableau', 'powerbi'
-    }
-    
-    doc = nlp(text)
+
+# Enhanced skill/tech extraction from resume PDF/DOCX
+def resume_parser(resume_path: str) -> Dict:
+    text = extract_text(resume_path)
+    return build_profile(text, get_nlp()(text))
+
+def build_profile(text: str, doc) -> Dict:
+    """Build the resume profile from extracted text and its spaCy doc"""
     tokens = [t.text.lower() for t in doc if t.is_alpha and not t.is_stop]
     
     # Extract entities and tech skills
     entities = [ent.text.lower() for ent in doc.ents if ent.label_ in ("ORG", "PRODUCT", "PERSON", "GPE")]
-    found_skills = []
     
-    # Match tech skills in text
-    text_lower = text.lower()
-    for skill in tech_skills:
-        if skill in text_lower:
-            found_skills.append(skill)
+    # Match tech skills from the shared taxonomy in one pass over the doc
+    skill_matches = get_skill_extractor().extract(doc)
+    found_skills = list(skill_matches)
     
     # Extract years of experience with regex
+    text_lower = text.lower()
     experience_pattern = r'(\d+)[\+\s]*(?:years?|yrs?)\s*(?:of\s*)?(?:experience|exp)'
     experience_matches = re.findall(experience_pattern, text_lower)
     total_experience = max([int(x) for x in experience_matches], default=0)
@@ -65,6 +57,8 @@ def resume_parser(resume_path: str) -> Dict:
         "text": text,
         "skills": all_skills,
         "tech_skills": found_skills,
+        "skill_counts": {skill: match.count for skill, match in skill_matches.items()},
+        "top_terms": common[:15],
         "tokens": tokens,
         "experience_years": total_experience,
         "entities": entities
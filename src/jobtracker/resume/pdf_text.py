@@ -0,0 +1,176 @@
+"""jobtracker.resume.pdf_text
+
+Bounded, page-parallel PDF text extraction.
+
+pdfminer (under pdfplumber) is pure Python, so long PDFs are split into page
+chunks extracted by one shared module-level process pool. Pages are collected in
+order into a list buffer and extraction stops early once ``max_chars`` of text
+are collected, the page limit is reached or the time budget is spent; workers
+still busy past the deadline are terminated. Inside a pool worker already (the
+API's CPU executor, bulk ingestion) pages are extracted serially instead, since
+that pool provides the parallelism. Pages without a text layer
+(``extract_text()`` returning ``None``) contribute an empty string.
+
+Usage:
+    text = extract_pdf_text("resume.pdf", PdfLimits(max_pages=10))
+"""
+import io
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Union
+
+import pdfplumber
+
+PdfSource = Union[str, bytes]
+
+
+class PdfTooLargeError(ValueError):
+    """Raised when a PDF exceeds the configured byte limit"""
+
+
+@dataclass
+class PdfLimits:
+    """Limits applied to a single PDF extraction"""
+    max_pages: int = 20
+    max_bytes: int = 10 * 1024 * 1024
+    timeout_seconds: float = 30.0
+    max_chars: int = 100_000     # stop once this much text has been collected
+    workers: int = 2
+    pages_per_chunk: int = 4     # also bounds how far a timed-out worker can overrun
+
+    @classmethod
+    def from_env(cls) -> "PdfLimits":
+        return cls(
+            max_pages=int(os.getenv("PDF_MAX_PAGES", "20")),
+            max_bytes=int(os.getenv("PDF_MAX_BYTES", str(10 * 1024 * 1024))),
+            timeout_seconds=float(os.getenv("PDF_TIMEOUT_SECONDS", "30")),
+            max_chars=int(os.getenv("PDF_MAX_CHARS", "100000")),
+            workers=int(os.getenv("PDF_WORKERS", "2")),
+        )
+
+
+def _open(source: PdfSource):
+    return pdfplumber.open(io.BytesIO(source) if isinstance(source, bytes) else source)
+
+
+def _page_text(page) -> str:
+    """Text of one page; scanned/empty or unparsable pages yield an empty string"""
+    try:
+        return page.extract_text() or ""
+    except Exception:
+        return ""
+
+
+def _extract_pages(source: PdfSource, page_numbers: Sequence[int]) -> List[str]:
+    """Extract the given pages; runs in a worker process for parallel extraction"""
+    with _open(source) as pdf:
+        return [_page_text(pdf.pages[i]) for i in page_numbers]
+
+
+def _source_size(source: PdfSource) -> int:
+    return len(source) if isinstance(source, bytes) else os.path.getsize(source)
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """The shared extraction pool, started on first use (and restarted after a timeout)"""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None and _pool_workers != workers:
+            _pool.shutdown(wait=False)
+            _pool = None
+        if _pool is None:
+            _pool, _pool_workers = ProcessPoolExecutor(max_workers=workers), workers
+        return _pool
+
+
+def _terminate_pool(pool: ProcessPoolExecutor):
+    """Kill a pool whose workers are stuck past the deadline; the next extraction starts a fresh one"""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    # ProcessPoolExecutor has no public way to stop a running task, so terminate its processes
+    processes = list((pool._processes or {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        process.terminate()
+
+
+def _in_worker_process() -> bool:
+    return multiprocessing.parent_process() is not None
+
+
+def _collect_serial(pdf, page_numbers: Sequence[int], limits: PdfLimits, deadline: float, pages: List[str]):
+    """Append page texts in order until the page list, ``max_chars`` or the deadline runs out"""
+    collected = sum(len(p) for p in pages)
+    for i in page_numbers:
+        text = _page_text(pdf.pages[i])
+        pages.append(text)
+        collected += len(text)
+        if collected >= limits.max_chars or time.monotonic() > deadline:
+            break
+
+
+def extract_pdf_text(source: PdfSource, limits: PdfLimits = None) -> str:
+    """Extract text from a PDF path or bytes within the given limits"""
+    limits = limits or PdfLimits()
+    size = _source_size(source)
+    if size > limits.max_bytes:
+        raise PdfTooLargeError(f"PDF is {size} bytes, limit is {limits.max_bytes}")
+
+    deadline = time.monotonic() + limits.timeout_seconds
+    pages: List[str] = []
+    with _open(source) as pdf:
+        n_pages = min(len(pdf.pages), limits.max_pages)
+        # Typical one-to-three page resume, or already in a pool worker: no (further) process pool
+        if limits.workers <= 1 or n_pages <= limits.pages_per_chunk or _in_worker_process():
+            _collect_serial(pdf, range(n_pages), limits, deadline, pages)
+            return "\n".join(pages)[:limits.max_chars]
+
+    chunks = [range(start, min(start + limits.pages_per_chunk, n_pages))
+              for start in range(0, n_pages, limits.pages_per_chunk)]
+    collected = 0
+    pool = _get_pool(limits.workers)
+    try:
+        # Keep at most `workers` chunks in flight and consume them in page order,
+        # so no further chunks are submitted once enough text has been collected
+        in_flight = [pool.submit(_extract_pages, source, chunk) for chunk in chunks[:limits.workers]]
+        next_chunk = len(in_flight)
+        while in_flight:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                chunk_pages = in_flight[0].result(timeout=remaining)
+            except FutureTimeoutError:
+                break
+            in_flight.pop(0)
+            pages.extend(chunk_pages)
+            collected += sum(len(p) for p in chunk_pages)
+            if collected >= limits.max_chars:
+                break
+            if next_chunk < len(chunks):
+                in_flight.append(pool.submit(_extract_pages, source, chunks[next_chunk]))
+                next_chunk += 1
+    except RuntimeError:
+        # BrokenProcessPool, or submit after shutdown: another extraction timed out and terminated
+        # the shared pool while this one was using it, so finish this one serially
+        done = len(pages)
+        with _open(source) as pdf:
+            _collect_serial(pdf, range(done, n_pages), limits, deadline, pages)
+        return "\n".join(pages)[:limits.max_chars]
+
+    # Cancel what was never started; workers still running past the deadline are killed
+    still_running = [future for future in in_flight if not future.cancel() and not future.done()]
+    if still_running:
+        _terminate_pool(pool)
+    return "\n".join(pages)[:limits.max_chars]
@@ -0,0 +1,107 @@
+"""jobtracker.resume.profile
+
+Compact, versioned resume profile format.
+
+The full profile from ``resume_parser`` carries the resume text, every token and
+duplicate entities. What searches actually need is a few KB: the skills (list and
+taxonomy bitmap), experience, top terms and the resume embedding, stored as
+base64 float16. The raw text is stored separately by the caller.
+
+Format (``format_version`` 2):
+    {
+        "format_version": 2,
+        "parser_version": "4",
+        "content_hash": "<sha256>",
+        "tech_skills": [...], "skill_counts": {...}, "skills": [...], "top_terms": [...],
+        "skills_bitmap": "<hex of uint64 words>", "taxonomy": "<fingerprint>",
+        "experience_years": 5,
+        "embedding": "<base64 float16>", "embedding_model": "all-MiniLM-L6-v2"
+    }
+
+Profiles without ``format_version`` are the original full format and remain
+readable by every helper here. Compact profiles have no ``text``; when their
+embedding is missing or from another model, callers attach the stored resume
+text as ``resume_text`` so it can be re-encoded.
+"""
+import base64
+from typing import Dict, Optional
+
+import numpy as np
+
+from jobtracker.matcher.skill_bitmap import SkillTaxonomy
+from jobtracker.resume.parser import PARSER_VERSION
+
+PROFILE_FORMAT_VERSION = 2
+
+_default_taxonomy = SkillTaxonomy()
+
+
+def encode_embedding(embedding) -> str:
+    return base64.b64encode(np.asarray(embedding, dtype=np.float16).tobytes()).decode("ascii")
+
+
+def decode_embedding(encoded: str) -> np.ndarray:
+    return np.frombuffer(base64.b64decode(encoded), dtype=np.float16).astype(np.float32)
+
+
+def is_compact(profile: Dict) -> bool:
+    return profile.get("format_version", 1) >= PROFILE_FORMAT_VERSION
+
+
+def compact_profile(profile: Dict, taxonomy: Optional[SkillTaxonomy] = None) -> Dict:
+    """Compact profile from a full resume_parser / cached_resume_parser profile"""
+    if is_compact(profile):
+        return profile
+    taxonomy = taxonomy or _default_taxonomy
+    tech_skills = profile.get("tech_skills", [])
+
+    compact = {
+        "format_version": PROFILE_FORMAT_VERSION,
+        "parser_version": PARSER_VERSION,
+        "content_hash": profile.get("content_hash"),
+        "tech_skills": tech_skills,
+        "skill_counts": profile.get("skill_counts", {}),
+        "skills": profile.get("skills", []),
+        "top_terms": profile.get("top_terms", []),
+        "skills_bitmap": taxonomy.encode(tech_skills).tobytes().hex(),
+        "taxonomy": taxonomy.fingerprint,
+        "experience_years": profile.get("experience_years", 0),
+    }
+    embedding = profile.get("embedding")
+    if embedding is not None:
+        compact["embedding"] = embedding if isinstance(embedding, str) else encode_embedding(embedding)
+        compact["embedding_model"] = profile.get("embedding_model")
+    return compact
+
+
+def without_embedding(profile: Dict) -> Dict:
+    """Profile for API responses: clients have no use for the embedding (or an attached resume text)"""
+    return {k: v for k, v in profile.items() if k not in ("embedding", "resume_text")}
+
+
+def profile_embedding(profile: Dict) -> Optional[np.ndarray]:
+    """Stored resume embedding as float32, from either profile format"""
+    embedding = profile.get("embedding")
+    if embedding is None:
+        return None
+    if isinstance(embedding, str):
+        return decode_embedding(embedding)
+    return np.asarray(embedding, dtype=np.float32)
+
+
+def has_current_embedding(profile: Dict, model_name: str) -> bool:
+    """Whether the stored embedding can be used as is (present and from ``model_name``)"""
+    return profile.get("embedding") is not None and profile.get("embedding_model") == model_name
+
+
+def profile_text(profile: Dict) -> Optional[str]:
+    """Resume text to re-encode from: ``text`` (full format) or ``resume_text`` (attached to compact profiles)"""
+    return profile.get("text") or profile.get("resume_text")
+
+
+def profile_skill_bitmap(profile: Dict, taxonomy: SkillTaxonomy) -> np.ndarray:
+    """Skill bitmap for ``taxonomy``; the stored bitmap is used when its layout matches"""
+    stored = profile.get("skills_bitmap")
+    if stored and profile.get("taxonomy") == taxonomy.fingerprint:
+        return np.frombuffer(bytes.fromhex(stored), dtype=np.uint64).copy()
+    return taxonomy.encode(profile.get("tech_skills", []))
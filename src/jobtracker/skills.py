@@ -0,0 +1,77 @@
+"""jobtracker.skills
+
+Skill extraction shared by the resume parser and the job matcher.
+
+A spaCy ``PhraseMatcher`` is compiled once from ``config.ALL_TECH_SKILLS``
+(case-insensitive, on token boundaries) and finds every skill in a single pass
+over a doc, so growing the vocabulary does not slow extraction linearly the way
+``skill in text`` checks per skill did. Docs from the full resume pipeline and
+from the blank tokenizer used for job descriptions can both be matched.
+
+Usage:
+    extractor = get_skill_extractor()
+    matches = extractor.extract("Python developer with AWS and CI/CD")
+    matches["aws"].count, matches["aws"].positions
+"""
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from jobtracker.config import ALL_TECH_SKILLS
+from jobtracker.models import get_tokenizer
+
+
+@dataclass
+class SkillMatch:
+    """Occurrences of one skill in a text"""
+    skill: str
+    count: int = 0
+    positions: List[Tuple[int, int]] = field(default_factory=list)  # (start_char, end_char)
+
+
+class SkillExtractor:
+    """PhraseMatcher over a fixed skill vocabulary"""
+
+    def __init__(self, skills: Iterable[str] = None, nlp=None):
+        from spacy.matcher import PhraseMatcher
+
+        self.nlp = nlp or get_tokenizer()
+        self.skills = sorted({s.lower() for s in (skills if skills is not None else ALL_TECH_SKILLS)})
+        self._skill_set = set(self.skills)
+        self.matcher = PhraseMatcher(self.nlp.vocab, attr="LOWER")
+        for skill in self.skills:
+            self.matcher.add(skill, [self.nlp.make_doc(skill)])
+
+    def __contains__(self, skill: str) -> bool:
+        return skill.lower() in self._skill_set
+
+    def extract(self, doc_or_text) -> Dict[str, SkillMatch]:
+        """Skills found in a spaCy doc (any pipeline) or raw text, most frequent first"""
+        doc = self.nlp.make_doc(doc_or_text) if isinstance(doc_or_text, str) else doc_or_text
+        found: Dict[str, SkillMatch] = {}
+        for match_id, start, end in self.matcher(doc):
+            skill = self.nlp.vocab.strings[match_id]
+            span = doc[start:end]
+            match = found.setdefault(skill, SkillMatch(skill))
+            match.count += 1
+            match.positions.append((span.start_char, span.end_char))
+        return dict(sorted(found.items(), key=lambda item: (-item[1].count, item[1].positions[0])))
+
+    def extract_texts(self, texts: Iterable[str], batch_size: int = 256) -> Iterator[Dict[str, SkillMatch]]:
+        """Tokenize a batch of texts (no other pipeline components) and extract skills from each"""
+        for doc in self.nlp.tokenizer.pipe(texts, batch_size=batch_size):
+            yield self.extract(doc)
+
+
+_lock = threading.Lock()
+_extractor: Optional[SkillExtractor] = None
+
+
+def get_skill_extractor() -> SkillExtractor:
+    """Return the shared extractor compiled from the TECH_SKILLS taxonomy"""
+    global _extractor
+    if _extractor is None:
+        with _lock:
+            if _extractor is None:
+                _extractor = SkillExtractor()
+    return _extractor
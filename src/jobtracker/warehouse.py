@@ -0,0 +1,288 @@
+"""jobtracker.warehouse
+
+Local job warehouse: every fetched posting is upserted by job id into SQLite,
+with an FTS5 index over title, company, description and location, so searches
+can be answered offline instead of with another paid API call.
+
+Each JSearch request is also logged as a coverage entry (query, location,
+date window, page -> job ids). ``fetch_with_warehouse`` replays a page from the
+warehouse while its entry is fresher than ``fresh_hours`` and only calls the
+API for windows that are not covered.
+
+Usage:
+    warehouse = get_warehouse()
+    jobs = fetch_with_warehouse(warehouse, fetcher, "python developer", "USA", posted_within_days=7)
+    hits = warehouse.search("python developer", location="Austin", posted_within_days=7)
+
+CLI:
+    python -m jobtracker.warehouse search "python developer" --location Austin --days 7
+    python -m jobtracker.warehouse stats
+"""
+import argparse
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+from jobtracker.config import JobTrackerConfig, data_path
+from jobtracker.fetcher.fetcher import JobFetcher, date_posted_filter
+from jobtracker.metrics import metrics
+
+# Location values that mean "anywhere in the US" (every JSearch result), not a place to match
+NATIONWIDE = {"", "usa", "us", "united states", "remote"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    title TEXT,
+    company TEXT,
+    description TEXT,
+    location TEXT,
+    posted_ts REAL,
+    source TEXT,
+    job TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_posted ON jobs (posted_ts DESC);
+
+-- External-content index: the text lives once, in jobs; triggers keep the index in step
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5 (
+    title, company, description, location,
+    content='jobs', content_rowid='rowid', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS jobs_ai AFTER INSERT ON jobs BEGIN
+    INSERT INTO jobs_fts (rowid, title, company, description, location)
+    VALUES (new.rowid, new.title, new.company, new.description, new.location);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_ad AFTER DELETE ON jobs BEGIN
+    INSERT INTO jobs_fts (jobs_fts, rowid, title, company, description, location)
+    VALUES ('delete', old.rowid, old.title, old.company, old.description, old.location);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_au AFTER UPDATE ON jobs BEGIN
+    INSERT INTO jobs_fts (jobs_fts, rowid, title, company, description, location)
+    VALUES ('delete', old.rowid, old.title, old.company, old.description, old.location);
+    INSERT INTO jobs_fts (rowid, title, company, description, location)
+    VALUES (new.rowid, new.title, new.company, new.description, new.location);
+END;
+
+CREATE TABLE IF NOT EXISTS fetch_coverage (
+    keywords TEXT NOT NULL,
+    location TEXT NOT NULL,
+    date_posted TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    fetched_at REAL NOT NULL,
+    job_ids TEXT NOT NULL,
+    PRIMARY KEY (keywords, location, date_posted, page)
+);
+"""
+
+
+def _normalize(text: str) -> str:
+    return " ".join(str(text or "").lower().split())
+
+
+def _posted_ts(value) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def _location_text(job: Dict) -> str:
+    raw = job.get("raw") or {}
+    parts = [job.get("city"), job.get("state"), raw.get("job_country")]
+    if raw.get("job_is_remote"):
+        parts.append("remote")
+    return " ".join(str(p) for p in parts if p)
+
+
+def _match_terms(text: str) -> str:
+    # Each word as a quoted prefix term: user input can't inject FTS syntax, "engineer" also finds "engineers"
+    return " ".join(f'"{word}"*' for word in re.findall(r"\w+", text.lower()))
+
+
+class JobWarehouse:
+    """SQLite (WAL) store of normalized jobs with a full-text index and a fetch-coverage log"""
+
+    def __init__(self, path: Optional[str] = None, fresh_hours: float = 6):
+        self.path = os.path.abspath(path or data_path("cache", "jobs.db"))
+        self.fresh_seconds = fresh_hours * 3600
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @classmethod
+    def from_config(cls, config: JobTrackerConfig) -> "JobWarehouse":
+        return cls(config.warehouse_path or None, config.warehouse_fresh_hours)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # One short-lived connection per call: safe across API I/O threads and processes
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def upsert(self, jobs: List[Dict], now: Optional[float] = None) -> int:
+        """Insert new jobs and refresh existing ones (same job id); returns the number written"""
+        now = now if now is not None else time.time()
+        rows = [
+            (
+                job["id"], job.get("title"), job.get("company"),
+                (job.get("raw") or {}).get("job_description"), _location_text(job),
+                _posted_ts(job.get("posted_at")), job.get("source"),
+                json.dumps(job, separators=(",", ":"), default=str), now, now,
+            )
+            for job in jobs if job.get("id")
+        ]
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO jobs (job_id, title, company, description, location, posted_ts, source, job, first_seen, last_seen) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (job_id) DO UPDATE SET title = excluded.title, company = excluded.company, "
+                "description = excluded.description, location = excluded.location, posted_ts = excluded.posted_ts, "
+                "source = excluded.source, job = excluded.job, last_seen = excluded.last_seen",
+                rows,
+            )
+        return len(rows)
+
+    def search(self, keywords: str = "", location: str = "", posted_within_days: Optional[float] = None,
+               limit: int = 50, offset: int = 0) -> List[Dict]:
+        """Best full-text matches first (BM25, title weighted highest), then most recently posted"""
+        conditions, params = [], []
+        match = []
+        if _match_terms(keywords):
+            match.append(f"{{title company description}} : ({_match_terms(keywords)})")
+        if _normalize(location) not in NATIONWIDE and _match_terms(location):
+            match.append(f"location : ({_match_terms(location)})")
+        if posted_within_days is not None:
+            conditions.append("jobs.posted_ts >= ?")
+            params.append(time.time() - posted_within_days * 86400)
+
+        if match:
+            sql = ("SELECT jobs.job FROM jobs_fts JOIN jobs ON jobs.rowid = jobs_fts.rowid "
+                   "WHERE jobs_fts MATCH ?")
+            params.insert(0, " AND ".join(match))
+            order = "bm25(jobs_fts, 10.0, 3.0, 1.0, 1.0), jobs.posted_ts DESC"
+        else:
+            sql = "SELECT jobs.job FROM jobs WHERE 1"
+            order = "jobs.posted_ts DESC"
+        for condition in conditions:
+            sql += f" AND {condition}"
+        sql += f" ORDER BY {order} LIMIT ? OFFSET ?"
+        with self._connect() as conn:
+            rows = conn.execute(sql, (*params, limit, offset)).fetchall()
+        return [json.loads(job) for (job,) in rows]
+
+    def covered_page(self, keywords: str, location: str, posted_within_days: int, page: int) -> Optional[List[Dict]]:
+        """The jobs a fresh earlier fetch of this exact page returned, or None when the window is not covered"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT fetched_at, job_ids FROM fetch_coverage "
+                "WHERE keywords = ? AND location = ? AND date_posted = ? AND page = ?",
+                (_normalize(keywords), _normalize(location), date_posted_filter(posted_within_days), page),
+            ).fetchone()
+            if row is None or time.time() - row[0] > self.fresh_seconds:
+                return None
+            job_ids = json.loads(row[1])
+            if not job_ids:
+                return []
+            found = dict(conn.execute(
+                f"SELECT job_id, job FROM jobs WHERE job_id IN ({','.join('?' * len(job_ids))})", job_ids
+            ).fetchall())
+        return [json.loads(found[job_id]) for job_id in job_ids if job_id in found]
+
+    def record_fetch(self, keywords: str, location: str, posted_within_days: int, page: int, jobs: List[Dict]):
+        """Store a fetched page and mark its window as covered"""
+        now = time.time()
+        self.upsert(jobs, now)
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO fetch_coverage (keywords, location, date_posted, page, fetched_at, job_ids) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (_normalize(keywords), _normalize(location), date_posted_filter(posted_within_days), page, now,
+                 json.dumps([job["id"] for job in jobs if job.get("id")])),
+            )
+
+    def stats(self) -> Dict:
+        with self._connect() as conn:
+            jobs = conn.execute("SELECT COUNT(*), MIN(first_seen), MAX(last_seen) FROM jobs").fetchone()
+            windows = conn.execute(
+                "SELECT COUNT(*) FROM fetch_coverage WHERE fetched_at >= ?", (time.time() - self.fresh_seconds,)
+            ).fetchone()[0]
+        return {"jobs": jobs[0], "first_seen": jobs[1], "last_seen": jobs[2], "fresh_windows": windows}
+
+
+def fetch_with_warehouse(warehouse: Optional[JobWarehouse], fetcher: JobFetcher, keywords: str, location: str,
+                         posted_within_days: int, page: int = 1) -> List[Dict]:
+    """JobFetcher.fetch_jsearch, answered from the warehouse when this page was fetched recently"""
+    if warehouse is None:
+        return fetcher.fetch_jsearch(keywords=keywords, location=location,
+                                     posted_within_days=posted_within_days, page=page)
+    jobs = warehouse.covered_page(keywords, location, posted_within_days, page)
+    if jobs is not None:
+        metrics.inc("jobtracker_cache_hits_total", cache="warehouse")
+        return jobs
+    metrics.inc("jobtracker_cache_misses_total", cache="warehouse")
+    jobs = fetcher.fetch_jsearch(keywords=keywords, location=location,
+                                 posted_within_days=posted_within_days, page=page)
+    # An empty page may be an API error (fetch_jsearch returns [] then): don't mark it covered
+    if jobs:
+        warehouse.record_fetch(keywords, location, posted_within_days, page, jobs)
+    return jobs
+
+
+_warehouse: Optional[JobWarehouse] = None
+_warehouse_lock = threading.Lock()
+
+
+def get_warehouse() -> Optional[JobWarehouse]:
+    """Shared warehouse for this process; None when disabled with WAREHOUSE_ENABLED=false"""
+    global _warehouse
+    config = JobTrackerConfig.from_env()
+    if not config.warehouse_enabled:
+        return None
+    with _warehouse_lock:
+        if _warehouse is None:
+            _warehouse = JobWarehouse.from_config(config)
+    return _warehouse
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the local job warehouse")
+    commands = parser.add_subparsers(dest="command", required=True)
+    search = commands.add_parser("search", help="Full-text search over stored jobs")
+    search.add_argument("keywords", nargs="?", default="")
+    search.add_argument("--location", default="")
+    search.add_argument("--days", type=float, default=None, help="Only jobs posted within this many days")
+    search.add_argument("--limit", type=int, default=20)
+    commands.add_parser("stats", help="Stored jobs and fresh coverage windows")
+    args = parser.parse_args()
+
+    warehouse = JobWarehouse.from_config(JobTrackerConfig.from_env())
+    if args.command == "stats":
+        print(json.dumps(warehouse.stats(), indent=2))
+        return
+    start = time.perf_counter()
+    jobs = warehouse.search(args.keywords, args.location, args.days, args.limit)
+    elapsed = (time.perf_counter() - start) * 1000
+    for job in jobs:
+        print(f"{job.get('title')} | {job.get('company')} | {job.get('city')}, {job.get('state')} | "
+              f"{job.get('posted_at')} | {job.get('apply_url')}")
+    print(f"{len(jobs)} jobs in {elapsed:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,13 +2,18 @@
 # Features: Resume parsing (PDF/DOCX), AI-powered matching, LLM filtering, smart email reports
 
 import os
+import json
 from jobtracker.fetcher.fetcher import JobFetcher
 from jobtracker.filter.filter import JobFilter
-from jobtracker.resume.parser import resume_parser
+from jobtracker.resume.cache import ResumeProfileCache, cached_resume_parser
 from jobtracker.matcher.matcher import job_matcher
 from jobtracker.filter.llm_filter import filter_jobs
-from jobtracker.emailer.send_email import send_email
+from jobtracker.emailer.send_email import render_email_body
+from jobtracker.emailer.outbox import EmailOutbox, spawn_sender
 from jobtracker.config import JobTrackerConfig
+from jobtracker.metrics import metrics
+from jobtracker.archive import ARCHIVE_AVAILABLE, SearchArchive, archive_rows
+from jobtracker.warehouse import fetch_with_warehouse, get_warehouse
 import pandas as pd
 from datetime import datetime
 from dotenv import load_dotenv
@@ -27,7 +32,25 @@ def save_seen_ids(path: str, ids):
             f.write(f"{i}\n")
 
 
+def write_run_report(outputs_dir: str) -> str:
+    """Dump per-stage timings and counters for this run as JSON"""
+    report_path = os.path.join(outputs_dir, f"run_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(outputs_dir, exist_ok=True)
+    with open(report_path, "w") as f:
+        json.dump(metrics.report(), f, indent=2)
+    return report_path
+
+
 def main():
+    outputs_dir = os.path.join(os.path.dirname(__file__), "../outputs")
+    try:
+        run(outputs_dir)
+    finally:
+        report_path = write_run_report(outputs_dir)
+        print(f"⏱️  Run report: {report_path}")
+
+
+def run(outputs_dir: str):
     # Load configuration
     config = JobTrackerConfig.from_env()
     
@@ -54,18 +77,20 @@ def main():
         
     fetcher = JobFetcher(rapidapi_key)
     print(f"🔎 Fetching jobs...")
-    jobs = fetcher.fetch_jsearch(
-        keywords=config.job_keywords, 
-        location=config.job_location, 
-        posted_within_days=config.posted_within_days
-    )
+    with metrics.stage("fetch") as stage:
+        jobs = fetch_with_warehouse(
+            get_warehouse(), fetcher, config.job_keywords, config.job_location, config.posted_within_days
+        )
+        stage.jobs_out = len(jobs)
     print(f"📊 Found {len(jobs)} initial jobs")
 
     # Deduplicate
-    seen_path = os.path.join(os.path.dirname(__file__), "../outputs", "seen_jobs.csv")
+    seen_path = os.path.join(outputs_dir, "seen_jobs.csv")
     os.makedirs(os.path.dirname(seen_path), exist_ok=True)
     seen_ids = load_seen_ids(seen_path)
-    jobs = JobFilter(jobs).deduplicate(seen_ids)
+    with metrics.stage("dedup", jobs_in=len(jobs)) as stage:
+        jobs = JobFilter(jobs).deduplicate(seen_ids)
+        stage.jobs_out = len(jobs)
     print(f"🆕 {len(jobs)} new jobs after deduplication")
 
     if not jobs:
@@ -78,7 +103,7 @@ def main():
         return
         
     print(f"📄 Parsing resume...")
-    resume_profile = resume_parser(config.resume_path)
+    resume_profile = cached_resume_parser(config.resume_path, ResumeProfileCache.from_config(config))
     print(f"✅ Extracted {len(resume_profile['tech_skills'])} tech skills and {resume_profile['experience_years']} years experience")
 
     # Match jobs to resume
@@ -86,12 +111,14 @@ def main():
     matched_jobs = job_matcher(jobs, resume_profile)
 
     # Filter by minimum match score
-    high_match_jobs = [job for job in matched_jobs if job.get('match_score', 0) >= config.match_score_threshold]
-    print(f"📈 {len(high_match_jobs)} jobs above {config.match_score_threshold}% match threshold")
-
-    # Apply LLM/semantic filtering
-    print(f"🎯 Applying smart filtering...")
-    filtered_jobs = filter_jobs(high_match_jobs, config.user_prompt, use_llm=config.use_llm_filtering)
+    with metrics.stage("filter", jobs_in=len(matched_jobs)) as stage:
+        high_match_jobs = [job for job in matched_jobs if job.get('match_score', 0) >= config.match_score_threshold]
+        print(f"📈 {len(high_match_jobs)} jobs above {config.match_score_threshold}% match threshold")
+
+        # Apply LLM/semantic filtering
+        print(f"🎯 Applying smart filtering...")
+        filtered_jobs = filter_jobs(high_match_jobs, config.user_prompt, use_llm=config.use_llm_filtering)
+        stage.jobs_out = len(filtered_jobs)
     print(f"✨ {len(filtered_jobs)} jobs after filtering")
 
     if not filtered_jobs:
@@ -116,25 +143,43 @@ def main():
         for j in filtered_jobs[:config.max_jobs_in_email]
     ])
     
-    out_path = os.path.join(os.path.dirname(__file__), "../outputs", f"jobs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx")
-    df.to_excel(out_path, index=False)
+    out_path = os.path.join(outputs_dir, f"jobs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx")
+    with metrics.stage("storage", jobs_in=len(df)):
+        df.to_excel(out_path, index=False)
     print(f"📊 Saved results to: {out_path}")
 
+    # Keep the full ranked run for history analysis (the xlsx only carries the emailed top jobs)
+    if ARCHIVE_AVAILABLE:
+        run_at = datetime.now()
+        SearchArchive.from_config(config).append(
+            archive_rows("cli", run_at.strftime("%Y%m%d_%H%M%S"), run_at.timestamp(), filtered_jobs)
+        )
+
     # Update seen jobs
     all_ids = set(list(seen_ids) + [j["id"] for j in filtered_jobs if j.get("id")])
     save_seen_ids(seen_path, all_ids)
 
-    # Send enhanced email
+    # Queue the enhanced email; a separate sender process delivers it (with retries) so SMTP never holds up the run
     email_address = os.getenv("EMAIL_ADDRESS")
     if email_address:
-        print(f"📧 Sending email to {email_address}...")
-        send_email(
-            filtered_jobs[:config.max_jobs_in_email], 
-            to_address=email_address, 
-            subject=f"{config.email_subject} - {len(filtered_jobs)} Matches", 
-            attachment_path=out_path
-        )
-        print("✅ Email sent successfully!")
+        with metrics.stage("email", jobs_in=len(filtered_jobs[:config.max_jobs_in_email])):
+            EmailOutbox.from_config(config).enqueue(
+                to_address=email_address,
+                subject=f"{config.email_subject} - {len(filtered_jobs)} Matches",
+                body=render_email_body(filtered_jobs[:config.max_jobs_in_email]),
+                attachment_path=out_path,
+            )
+        print(f"📧 Email to {email_address} queued in the outbox")
+        if config.outbox_spawn_sender:
+            sender_log = os.path.join(outputs_dir, "outbox_sender.log")
+            try:
+                spawn_sender(sender_log)
+                print(f"   Sending in the background (log: {sender_log})")
+            except ValueError as e:
+                print(f"❌ Email left in the outbox, sender not started: {e}")
+                print("   Fix the SMTP settings, then run: python -m jobtracker.emailer.outbox drain")
+        else:
+            print("   Deliver it with: python -m jobtracker.emailer.outbox drain")
     else:
         print("⚠️  EMAIL_ADDRESS not configured, skipping email")
 
@@ -0,0 +1,74 @@
+"""
+Compare bytes written and load time of stored search results per storage format
+Usage: python measure_storage_formats.py [results.json]   (default: 200 synthetic jobs with full raw payloads)
+"""
+import json
+import random
+import string
+import sys
+import time
+from typing import Dict
+
+from api.serialization import MSGPACK_AVAILABLE, ZSTD_AVAILABLE, Serializer, loads
+
+REPEAT = 20
+
+
+def synthetic_results(count: int = 200) -> Dict:
+    # Distinct ~3 KB descriptions per job; identical text would overstate compression
+    rng = random.Random(0)
+    vocabulary = ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(2, 10))) for _ in range(3000)]
+
+    def description() -> str:
+        return " ".join(rng.choice(vocabulary) for _ in range(450))
+
+    return {
+        "search_params": {"keywords": "python developer", "location": "USA"},
+        "total_jobs": count,
+        "filtered_jobs": count,
+        "timestamp": "2026-01-01T00:00:00",
+        "jobs": [
+            {
+                "id": f"job-{i}", "title": f"Python Developer {i}", "company": f"Company {i % 17}",
+                "city": "Austin", "state": "TX", "match_score": 90 - i * 0.1, "semantic_score": 0.8,
+                "skill_match_score": 0.7, "filter_score": 65, "matched_skills": ["python", "sql", "aws"],
+                "apply_url": f"https://example.com/jobs/{i}", "source": "jsearch",
+                "raw": {"job_id": f"job-{i}", "job_description": description(), "job_highlights": {"Qualifications": ["Python"] * 10}},
+            }
+            for i in range(count)
+        ],
+    }
+
+
+def load_ms(payload) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        loads(payload)
+    return (time.perf_counter() - start) / REPEAT * 1000
+
+
+def main(results: Dict):
+    # Before: indent=2 JSON, written twice (search_<ts>.json + latest.json)
+    legacy = json.dumps(results, indent=2, default=str).encode("utf-8")
+    print(f"{'format':<16}{'object KB':>11}{'per search KB':>15}{'load ms':>10}")
+    print(f"{'legacy json':<16}{len(legacy) / 1024:>11.1f}{2 * len(legacy) / 1024:>15.1f}{load_ms(legacy):>10.2f}")
+
+    formats = [("json", c) for c in ("none", "gzip", "zstd")]
+    formats += [("msgpack", c) for c in ("none", "gzip", "zstd")]
+    for encoding, compression in formats:
+        if (encoding == "msgpack" and not MSGPACK_AVAILABLE) or (compression == "zstd" and not ZSTD_AVAILABLE):
+            continue
+        serializer = Serializer(encoding, compression)
+        payload = serializer.dumps(results)
+        # After: one results object plus a small latest.json pointer
+        pointer = serializer.dumps({"$ref": "results/<session>/search_20260101_000000.json"})
+        per_search = len(payload) + len(pointer)
+        print(f"{serializer.describe():<16}{len(payload) / 1024:>11.1f}{per_search / 1024:>15.1f}{load_ms(payload):>10.2f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        with open(sys.argv[1]) as f:
+            main(json.load(f))
+    else:
+        main(synthetic_results())
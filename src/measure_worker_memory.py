@@ -0,0 +1,49 @@
+"""
+Report RSS / PSS / shared / private memory of a gunicorn master and its workers
+Usage: python measure_worker_memory.py <master_pid>   (Linux only, reads /proc/<pid>/smaps_rollup)
+"""
+import os
+import sys
+from typing import Dict, List
+
+FIELDS = {"Rss": "rss", "Pss": "pss", "Shared_Clean": "shared", "Shared_Dirty": "shared",
+          "Private_Clean": "private", "Private_Dirty": "private"}
+
+
+def children(pid: int) -> List[int]:
+    found = []
+    for task in os.listdir(f"/proc/{pid}/task"):
+        with open(f"/proc/{pid}/task/{task}/children") as f:
+            found.extend(int(child) for child in f.read().split())
+    return found
+
+
+def memory(pid: int) -> Dict[str, int]:
+    totals = {"rss": 0, "pss": 0, "shared": 0, "private": 0}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            key = parts[0].rstrip(":")
+            if key in FIELDS:
+                totals[FIELDS[key]] += int(parts[1])  # kB
+    return totals
+
+
+def main(master: int):
+    rows = [("master", master)] + [("worker", pid) for pid in children(master)]
+    print(f"{'role':<8}{'pid':>8}{'RSS MB':>10}{'PSS MB':>10}{'shared MB':>11}{'private MB':>12}")
+    pss_total = 0
+    for role, pid in rows:
+        m = memory(pid)
+        pss_total += m["pss"]
+        print(f"{role:<8}{pid:>8}{m['rss'] / 1024:>10.1f}{m['pss'] / 1024:>10.1f}"
+              f"{m['shared'] / 1024:>11.1f}{m['private'] / 1024:>12.1f}")
+    # PSS splits shared pages between the processes mapping them, so it sums to real usage
+    print(f"Total PSS: {pss_total / 1024:.1f} MB across {len(rows)} processes")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print(__doc__.strip())
+        sys.exit(1)
+    main(int(sys.argv[1]))
@@ -0,0 +1,90 @@
+import asyncio
+import time
+
+from api.cache import SingleFlight, TTLCache
+
+
+def test_ttl_cache_lru_and_expiry():
+    cache = TTLCache(max_entries=2, ttl_seconds=0.05)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)  # evicts "b", the least recently used
+    assert cache.get("b") is None and cache.get("a") == 1
+    time.sleep(0.06)
+    assert cache.get("a") is None
+    assert cache.stats()["hits"] == 2
+
+
+def test_single_flight_coalesces_identical_calls():
+    flight = SingleFlight()
+    calls = []
+
+    async def pipeline():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"jobs": []}
+
+    async def scenario():
+        return await asyncio.gather(*(flight.do("same-search", pipeline) for _ in range(5)))
+
+    results = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert [shared for _, shared in results].count(False) == 1
+    assert all(result is results[0][0] for result, _ in results)
+
+
+def test_single_flight_survives_leader_cancellation():
+    flight = SingleFlight()
+    release = asyncio.Event()
+    calls = []
+
+    async def pipeline():
+        calls.append(1)
+        await release.wait()
+        return {"jobs": []}
+
+    async def scenario():
+        leader = asyncio.ensure_future(flight.do("same-search", pipeline))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.do("same-search", pipeline))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.gather(leader, return_exceptions=True)
+        release.set()
+        return leader, await follower
+
+    leader, (result, shared) = asyncio.run(scenario())
+    assert leader.cancelled()
+    assert result == {"jobs": []} and shared
+    assert len(calls) == 1 and flight._in_flight == {}
+
+
+def test_single_flight_cancels_work_when_every_caller_left():
+    flight = SingleFlight()
+    started = asyncio.Event()
+
+    async def pipeline():
+        started.set()
+        await asyncio.sleep(60)
+
+    async def scenario():
+        callers = [asyncio.ensure_future(flight.do("same-search", pipeline)) for _ in range(2)]
+        await started.wait()
+        work = flight._in_flight["same-search"]
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.gather(work, return_exceptions=True)
+        return work
+
+    assert asyncio.run(scenario()).cancelled()
+    assert flight._in_flight == {}
+
+
+if __name__ == "__main__":
+    test_ttl_cache_lru_and_expiry()
+    test_single_flight_coalesces_identical_calls()
+    test_single_flight_survives_leader_cancellation()
+    test_single_flight_cancels_work_when_every_caller_left()
+    print("Search cache and single-flight OK")
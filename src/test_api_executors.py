@@ -0,0 +1,58 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from api.executors import AdmissionLimiter, BoundedExecutor, Overloaded
+from jobtracker.metrics import metrics
+
+
+def test_bounded_executor_rejects_when_full():
+    release = threading.Event()
+    executor = BoundedExecutor("io", ThreadPoolExecutor(max_workers=1), max_workers=1, max_queue=1)
+
+    async def scenario():
+        running = [asyncio.ensure_future(executor.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        try:
+            await executor.run(release.wait)
+        except Overloaded as e:
+            assert e.status_code == 503 and "Retry-After" in e.headers
+        else:
+            raise AssertionError("third call should have been rejected")
+        release.set()
+        await asyncio.gather(*running)
+        assert executor.stats() == {"in_flight": 0, "limit": 2, "rejected": 1}
+        assert metrics.counters["jobtracker_executor_rejected_total"][(("executor", "io"),)] >= 1
+
+    asyncio.run(scenario())
+    executor.shutdown()
+
+
+def test_accepted_work_waits_for_a_slot_instead_of_failing():
+    limiter = AdmissionLimiter("search", 1, status_code=429)
+
+    async def scenario():
+        order = []
+
+        async def task(name):
+            async with limiter.slot():
+                order.append(f"{name} start")
+                await asyncio.sleep(0.02)
+                order.append(f"{name} end")
+
+        with limiter:
+            waiting = [asyncio.ensure_future(task(name)) for name in ("a", "b")]
+            await asyncio.sleep(0.02)
+            assert order == []
+        await asyncio.gather(*waiting)
+        # One at a time, never rejected
+        assert order == ["a start", "a end", "b start", "b end"]
+        assert limiter.stats() == {"in_flight": 0, "limit": 1, "rejected": 0}
+
+    asyncio.run(scenario())
+
+
+if __name__ == "__main__":
+    test_bounded_executor_rejects_when_full()
+    test_accepted_work_waits_for_a_slot_instead_of_failing()
+    print("Bounded executor admission OK")
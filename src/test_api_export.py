@@ -0,0 +1,59 @@
+import csv
+import gzip
+import io
+
+import openpyxl
+
+from api.export import PARQUET_AVAILABLE, ROWS_PER_CHUNK, iter_export
+
+JOBS = [
+    {"id": str(i), "title": f"Engineer <{i}> & Co\x0b", "company": "Acme", "city": "Austin", "state": "TX",
+     "match_score": 90 - i * 0.01, "matched_skills": ["python", "sql"], "apply_url": "https://example.com"}
+    for i in range(3 * ROWS_PER_CHUNK + 7)
+]
+
+
+def _export(format: str):
+    chunks = list(iter_export(iter(JOBS), format))
+    return chunks, b"".join(chunks)
+
+
+def test_csv_streams_in_chunks():
+    chunks, data = _export("csv")
+    assert len(chunks) == 4
+    rows = list(csv.reader(io.StringIO(data.decode("utf-8"))))
+    assert rows[0][0] == "Title" and len(rows) == len(JOBS) + 1
+    assert rows[1][2] == "Austin, TX" and rows[1][7] == "python, sql"
+
+
+def test_csv_gzip():
+    _, data = _export("csv.gz")
+    assert gzip.decompress(data) == _export("csv")[1]
+
+
+def test_xlsx_opens_in_openpyxl():
+    chunks, data = _export("xlsx")
+    assert len(chunks) > 3
+    sheet = openpyxl.load_workbook(io.BytesIO(data)).active
+    assert sheet.max_row == len(JOBS) + 1
+    assert sheet["A2"].value == "Engineer <0> & Co" and sheet["D2"].value == 90
+
+
+def test_parquet_columns():
+    if not PARQUET_AVAILABLE:
+        return
+    import pyarrow.parquet as pq
+
+    _, data = _export("parquet")
+    table = pq.read_table(io.BytesIO(data))
+    assert table.num_rows == len(JOBS)
+    assert str(table.schema.field("match_score").type) == "double"
+    assert table.column("semantic_score").null_count == len(JOBS)
+
+
+if __name__ == "__main__":
+    test_csv_streams_in_chunks()
+    test_csv_gzip()
+    test_xlsx_opens_in_openpyxl()
+    test_parquet_columns()
+    print("Export OK")
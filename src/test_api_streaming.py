@@ -0,0 +1,84 @@
+import asyncio
+import json
+import os
+import tempfile
+
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+import api.main as main
+from api.storage_sqlite import SQLiteStorage
+from api.streaming import check_cursor_run, decode_cursor, encode_cursor, iter_ndjson, parse_fields, select_fields
+
+JOB = {"id": "a", "title": "Python Developer", "match_score": 90, "raw": {"job_description": "Build APIs"}}
+
+
+def _status(call, *args):
+    try:
+        call(*args)
+    except HTTPException as e:
+        return e.status_code
+    return None
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor("2026-01-01T00:00:00", 150)) == ("2026-01-01T00:00:00", 150)
+
+
+def test_malformed_cursor_is_400():
+    assert _status(decode_cursor, "not-a-cursor") == 400
+    assert _status(decode_cursor, encode_cursor("ts", 1)[:-4]) == 400
+
+
+def test_cursor_from_another_run_is_410():
+    assert _status(check_cursor_run, "2026-01-01T00:00:00", "2026-01-02T00:00:00") == 410
+    assert _status(check_cursor_run, "2026-01-01T00:00:00", "2026-01-01T00:00:00") is None
+
+
+def test_field_selection():
+    fields = parse_fields(" title, raw.job_description,,salary,raw.missing.deeper ")
+    assert fields == ["title", "raw.job_description", "salary", "raw.missing.deeper"]
+    assert select_fields(JOB, fields) == {
+        "title": "Python Developer", "raw.job_description": "Build APIs", "salary": None, "raw.missing.deeper": None}
+    assert parse_fields("") is None and select_fields(JOB, None) is JOB
+
+    lines = [json.loads(line) for line in iter_ndjson([JOB, JOB], ["id"], start_rank=10)]
+    assert lines == [{"rank": 11, "id": "a"}, {"rank": 12, "id": "a"}]
+
+
+def test_stream_endpoint_pages_with_cursor(monkeypatch):
+    storage = SQLiteStorage(os.path.join(tempfile.mkdtemp(), "jobtracker.db"))
+    monkeypatch.setattr(main, "storage", storage)
+    jobs = [{"id": f"j{i}", "match_score": 100 - i, "raw": {"job_description": f"desc {i}"}} for i in range(5)]
+    asyncio.run(storage.save_search_results("s1", {"timestamp": "2026-01-01T00:00:00", "jobs": jobs}))
+    client = TestClient(main.app)
+
+    response = client.get("/search-results/s1/stream", params={"limit": 2, "fields": "id,raw.job_description"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert response.headers["X-Total-Count"] == "5"
+    assert [json.loads(line) for line in response.text.splitlines()] == [
+        {"rank": 1, "id": "j0", "raw.job_description": "desc 0"},
+        {"rank": 2, "id": "j1", "raw.job_description": "desc 1"},
+    ]
+
+    seen = []
+    cursor = response.headers["X-Next-Cursor"]
+    while cursor:
+        response = client.get("/search-results/s1/stream", params={"limit": 2, "cursor": cursor, "fields": "id"})
+        assert response.status_code == 200
+        seen += [json.loads(line) for line in response.text.splitlines()]
+        cursor = response.headers.get("X-Next-Cursor")
+    assert seen == [{"rank": 3, "id": "j2"}, {"rank": 4, "id": "j3"}, {"rank": 5, "id": "j4"}]
+
+    stale = encode_cursor("2026-01-01T00:00:00", 2)
+    asyncio.run(storage.save_search_results("s1", {"timestamp": "2026-01-02T00:00:00", "jobs": jobs}))
+    assert client.get("/search-results/s1/stream", params={"cursor": stale}).status_code == 410
+    assert client.get("/search-results/s1/stream", params={"cursor": "garbage"}).status_code == 400
+    assert client.get("/search-results/missing/stream").status_code == 404
+
+
+if __name__ == "__main__":
+    import pytest
+
+    pytest.main([__file__, "-q"])
@@ -0,0 +1,143 @@
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+
+import api.main as main
+from api.executors import Overloaded
+from api.pipeline import job_summary
+from api.tasks import SearchTask, TaskManager, format_sse
+
+TOP_JOBS = [job_summary({"id": "j1", "title": "Python Developer", "company": "Acme", "match_score": 0.9})]
+
+
+async def _collect(manager, task, keepalive=15.0):
+    return [entry async for entry in manager.subscribe(task, keepalive=keepalive)]
+
+
+def test_full_queue_is_rejected_with_429():
+    async def scenario():
+        manager = TaskManager(workers=0, max_queued=1)
+        await manager.start()
+        manager.submit("s1", None)
+        try:
+            manager.submit("s2", None)
+        except Overloaded as e:
+            assert e.status_code == 429
+        else:
+            raise AssertionError("second task should have been rejected")
+        assert len(manager.tasks) == 1
+        await manager.stop()
+
+    asyncio.run(scenario())
+
+
+def test_late_subscriber_gets_replay_then_live_events():
+    async def scenario():
+        manager = TaskManager(workers=1)
+        await manager.start()
+        gate = asyncio.Event()
+
+        async def runner(task, emit):
+            emit("stage", stage="match", page=1, pages=1)
+            await gate.wait()
+            emit("partial", page=1, scored_jobs=1, top_jobs=TOP_JOBS)
+            return {"total_jobs": 1, "filtered_jobs": 1, "jobs": []}
+
+        task = manager.submit("s1", runner)
+        while task.stage is None:
+            await asyncio.sleep(0)
+        assert task.status == "running"
+        subscriber = asyncio.create_task(_collect(manager, task))
+        # Subscribed mid-run: the events so far are replayed, the rest arrive live
+        while not task.subscribers:
+            await asyncio.sleep(0)
+        gate.set()
+        events = await subscriber
+
+        assert [e["event"] for e in events] == ["queued", "started", "stage", "partial", "completed"]
+        assert events[3]["top_jobs"] == TOP_JOBS and task.partial_results == TOP_JOBS
+        assert events[-1]["result_summary"] == {"total_jobs": 1, "filtered_jobs": 1}
+        assert task.status == "completed" and task.to_dict()["result"]["total_jobs"] == 1
+        # A finished task only replays
+        assert await _collect(manager, task) == events
+        await manager.stop()
+
+    asyncio.run(scenario())
+
+
+def test_failing_runner_ends_failed():
+    async def scenario():
+        manager = TaskManager(workers=1)
+        await manager.start()
+
+        async def runner(task, emit):
+            emit("stage", stage="fetch")
+            raise RuntimeError("RapidAPI unreachable")
+
+        task = manager.submit("s1", runner)
+        events = await _collect(manager, task)
+        assert [e["event"] for e in events] == ["queued", "started", "stage", "failed"]
+        assert events[-1]["error"] == "RapidAPI unreachable"
+        assert task.status == "failed" and task.error == "RapidAPI unreachable" and task.result is None
+        await manager.stop()
+
+    asyncio.run(scenario())
+
+
+def test_keepalive_while_idle():
+    async def scenario():
+        manager = TaskManager(workers=0)
+        await manager.start()
+        task = manager.submit("s1", None)
+        stream = manager.subscribe(task, keepalive=0.01)
+        assert (await stream.__anext__())["event"] == "queued"
+        assert await stream.__anext__() is None
+        await stream.aclose()
+        assert task.subscribers == []
+        await manager.stop()
+
+    asyncio.run(scenario())
+
+
+def test_sse_framing():
+    entry = {"event": "partial", "time": 1.0, "page": 1, "top_jobs": TOP_JOBS}
+    frame = format_sse(entry)
+    event_line, data_line, blank, end = frame.split("\n")
+    assert event_line == "event: partial"
+    assert data_line.startswith("data: ") and json.loads(data_line[len("data: "):]) == entry
+    assert blank == "" and end == ""
+    assert format_sse(None) == ": keepalive\n\n"
+
+
+def test_task_routes(monkeypatch):
+    manager = TaskManager()
+    monkeypatch.setattr(main, "task_manager", manager)
+    # Recorded directly: the routes only read task state, no workers needed
+    task = SearchTask(id="t1", session_id="s1")
+    manager.tasks[task.id] = task
+    for event, data in [("queued", {}), ("started", {}), ("partial", {"page": 1, "top_jobs": TOP_JOBS}),
+                        ("failed", {"error": "boom"})]:
+        manager.emit(task, event, **data)
+    client = TestClient(main.app)
+
+    response = client.get("/tasks/t1")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "failed" and body["partial_results"] == TOP_JOBS
+
+    response = client.get("/tasks/t1/events")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    frames = [frame for frame in response.text.split("\n\n") if frame]
+    assert [frame.split("\n")[0] for frame in frames] == [
+        "event: queued", "event: started", "event: partial", "event: failed"]
+
+    assert client.get("/tasks/missing").status_code == 404
+    assert client.get("/tasks/missing/events").status_code == 404
+
+
+if __name__ == "__main__":
+    import pytest
+
+    pytest.main([__file__, "-q"])
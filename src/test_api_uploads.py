@@ -0,0 +1,50 @@
+import hashlib
+
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+
+from api.uploads import UploadSizeLimit, spool_upload
+
+app = FastAPI()
+app.add_middleware(UploadSizeLimit, max_bytes=100_000, paths=("/upload",))
+
+
+@app.post("/upload")
+async def upload(file: UploadFile = File(...)):
+    spooled = await spool_upload(file, max_bytes=100_000)
+    return {"size": spooled.size, "sha256": spooled.sha256, "rewound": spooled.stream.read() == await file.read()}
+
+
+client = TestClient(app)
+
+
+def test_spooled_upload_hash_and_size():
+    data = b"resume" * 10_000
+    response = client.post("/upload", files={"file": ("cv.pdf", data)})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["size"] == len(data)
+    assert body["sha256"] == hashlib.sha256(data).hexdigest()
+
+
+def test_declared_length_over_limit_is_rejected():
+    response = client.post("/upload", files={"file": ("cv.pdf", b"x" * 300_000)})
+    assert response.status_code == 413
+
+
+def test_streamed_body_over_limit_is_rejected():
+    def body():
+        yield b'--b\r\nContent-Disposition: form-data; name="file"; filename="cv.pdf"\r\n\r\n'
+        for _ in range(30):
+            yield b"y" * 10_000
+        yield b"\r\n--b--\r\n"
+
+    response = client.post("/upload", content=body(), headers={"content-type": "multipart/form-data; boundary=b"})
+    assert response.status_code == 413
+
+
+if __name__ == "__main__":
+    test_spooled_upload_hash_and_size()
+    test_declared_length_over_limit_is_rejected()
+    test_streamed_body_over_limit_is_rejected()
+    print("API uploads OK")
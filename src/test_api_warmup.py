@@ -0,0 +1,73 @@
+import asyncio
+import time
+
+import api.warmup as warmup_module
+from api.warmup import Warmup, WarmupSettings, p99
+
+
+class InlineExecutor:
+    async def run(self, fn, *args):
+        return fn(*args)
+
+
+def test_p99():
+    assert p99([0.1, 0.2, 0.3]) == 0.3
+    assert p99([float(i) for i in range(1000)]) == 989.0
+
+
+def test_ready_once_latency_settles(monkeypatch):
+    latencies = iter([1.0] * 4 + [0.2] * 4 + [0.21] * 4 + [0.2] * 100)
+    monkeypatch.setattr(warmup_module, "warmup_batch", lambda: next(latencies))
+    warmup = Warmup(WarmupSettings(min_rounds=2, max_rounds=10, batches_per_round=4, tolerance=0.1))
+    assert not warmup.ready
+    asyncio.run(warmup.run(InlineExecutor()))
+    assert warmup.ready and warmup.stable
+    assert warmup.p99_history == [1.0, 0.2, 0.21]
+
+
+def test_failure_is_reported(monkeypatch):
+    def broken():
+        raise OSError("model not found")
+    monkeypatch.setattr(warmup_module, "warmup_batch", broken)
+    warmup = Warmup(WarmupSettings(attempts=2, retry_backoff=0))
+    asyncio.run(warmup.run(InlineExecutor()))
+    assert warmup.failed and not warmup.ready
+    assert warmup.status()["attempts"] == 2
+    assert "model not found" in warmup.status()["error"]
+
+
+def test_retries_with_backoff_before_failing(monkeypatch):
+    calls = []
+
+    def flaky():
+        calls.append(time.monotonic())
+        if len(calls) <= 2:
+            raise OSError("model download interrupted")
+        return 0.1
+    monkeypatch.setattr(warmup_module, "warmup_batch", flaky)
+    warmup = Warmup(WarmupSettings(min_rounds=2, max_rounds=2, batches_per_round=1, attempts=3, retry_backoff=0.02))
+    asyncio.run(warmup.run(InlineExecutor()))
+    assert warmup.ready and warmup.attempts == 3 and warmup.error is None
+    assert warmup.p99_history == [0.1, 0.1]
+    # Backoff doubles: 0.02s before the second attempt, 0.04s before the third
+    assert calls[1] - calls[0] >= 0.02 and calls[2] - calls[1] >= 0.04
+
+
+def test_live_fails_once_warmup_gave_up(monkeypatch):
+    import api.main as main
+    from fastapi.testclient import TestClient
+
+    warmup = Warmup(WarmupSettings())
+    monkeypatch.setattr(main, "warmup", warmup)
+    client = TestClient(main.app)
+    assert client.get("/live").status_code == 200
+    warmup.state, warmup.error = "failed", "model not found"
+    response = client.get("/live")
+    assert response.status_code == 503 and response.json()["error"] == "model not found"
+    assert client.get("/ready").status_code == 503
+
+
+if __name__ == "__main__":
+    import pytest
+
+    pytest.main([__file__, "-q"])
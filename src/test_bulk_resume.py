@@ -0,0 +1,51 @@
+import os
+import tempfile
+
+import spacy
+from docx import Document
+from spacy.language import Language
+
+import jobtracker.resume.bulk as bulk
+from jobtracker.resume.bulk import bulk_resume_parser, find_resumes
+
+
+@Language.component("fail_on_corrupt")
+def fail_on_corrupt(doc):
+    if "CORRUPT" in doc.text:
+        raise ValueError("cannot process document")
+    return doc
+
+
+def _write_docx(path: str, text: str):
+    document = Document()
+    document.add_paragraph(text)
+    document.save(path)
+
+
+def test_bad_documents_are_reported_without_aborting_the_batch(monkeypatch):
+    nlp = spacy.blank("en")
+    nlp.add_pipe("fail_on_corrupt")
+    monkeypatch.setattr(bulk, "get_nlp", lambda: nlp)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in ("alice", "bob", "carol"):
+            _write_docx(os.path.join(tmp, f"{name}.docx"), f"{name} has 5 years of experience with Python and AWS")
+        _write_docx(os.path.join(tmp, "mangled.docx"), "CORRUPT resume text")
+        with open(os.path.join(tmp, "broken.pdf"), "wb") as f:
+            f.write(b"not a pdf")
+
+        results = {os.path.basename(r.path): r for r in bulk_resume_parser(find_resumes(tmp), workers=2, batch_size=2)}
+
+    assert sorted(results) == ["alice.docx", "bob.docx", "broken.pdf", "carol.docx", "mangled.docx"]
+    assert results["broken.pdf"].error.startswith("Text extraction failed")
+    assert results["mangled.docx"].error.startswith("NLP processing failed")
+    for name in ("alice.docx", "bob.docx", "carol.docx"):
+        assert results[name].ok
+        assert results[name].profile["experience_years"] == 5
+        assert "python" in results[name].profile["tech_skills"]
+
+
+if __name__ == "__main__":
+    import pytest
+
+    pytest.main([__file__, "-q"])
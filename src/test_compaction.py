@@ -0,0 +1,70 @@
+import asyncio
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import date, timedelta
+
+from api.compaction import compact_history
+from api.storage_sqlite import SQLiteStorage
+from jobtracker.archive import SearchArchive, archive_rows
+
+DAY = 86400
+
+
+def _jobs(prefix: str, count: int = 3):
+    return [{"id": f"{prefix}-{i}", "title": "Engineer", "company": "Acme", "match_score": 90 - i} for i in range(count)]
+
+
+def test_archive_query_reads_selected_partitions_and_columns():
+    archive = SearchArchive(tempfile.mkdtemp())
+    now = time.time()
+    archive.append(archive_rows("s1", "r1", now - 3 * DAY, _jobs("a")))
+    archive.append(archive_rows("s1", "r2", now - 3 * DAY, _jobs("b")))
+    archive.append(archive_rows("s2", "r3", now, _jobs("c")))
+    assert len(archive.partitions()) == 2
+
+    recent = archive.query(["session_id", "match_score"], start=date.today() - timedelta(days=1))
+    assert recent.column_names == ["session_id", "match_score"]
+    assert set(recent.column("session_id").to_pylist()) == {"s2"}
+    assert archive.query(["job_id"], session_id="s1", min_score=89).num_rows == 4
+    assert archive.query(["job_id"], session_id="s1", limit=2).num_rows == 2
+    assert archive.count(session_id="s1") == 6 and archive.count(session_id="s1", min_score=89) == 4
+
+    old_day = archive.partitions()[0]
+    assert archive.compact(old_day) == 6
+    assert len(os.listdir(os.path.join(archive.root, f"date={old_day}"))) == 1
+    assert archive.query().num_rows == 9
+
+
+def test_compaction_moves_old_runs_and_keeps_latest():
+    async def run():
+        storage = SQLiteStorage(os.path.join(tempfile.mkdtemp(), "jobtracker.db"))
+        for prefix in ("old1", "old2", "latest"):
+            await storage.save_search_results("s1", {"jobs": _jobs(prefix), "total_jobs": 3})
+        await storage.save_search_results("s2", {"jobs": _jobs("only"), "total_jobs": 3})
+        with sqlite3.connect(storage.path) as conn:
+            # Age everything but s1's latest run, and s2's only run (which must be kept anyway)
+            conn.execute("UPDATE search_runs SET created_at = created_at - ? WHERE run_id != 3", (40 * DAY,))
+
+        archive = SearchArchive(tempfile.mkdtemp())
+        summary = await compact_history(storage, archive, older_than_days=30)
+        assert summary["runs"] == 2 and summary["rows"] == 6
+
+        assert (await storage.get_search_results("s1"))["jobs"][0]["id"] == "latest-0"
+        assert (await storage.get_search_results("s2"))["jobs"][0]["id"] == "only-0"
+        assert await storage.list_archivable_runs(time.time()) == []
+        table = archive.query(["session_id", "job_id"])
+        assert sorted(table.column("job_id").to_pylist())[:2] == ["old1-0", "old1-1"]
+        assert set(table.column("session_id").to_pylist()) == {"s1"}
+
+        # Nothing left to archive
+        assert (await compact_history(storage, archive, older_than_days=30))["runs"] == 0
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_archive_query_reads_selected_partitions_and_columns()
+    test_compaction_moves_old_runs_and_keeps_latest()
+    print("Compaction OK")
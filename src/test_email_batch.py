@@ -0,0 +1,108 @@
+import socket
+import threading
+from email import message_from_bytes
+
+from aiosmtpd.controller import Controller
+
+from jobtracker.emailer.email_sender import EmailSender, OutgoingEmail
+from jobtracker.emailer.send_email import send_digests
+
+
+class SinkHandler:
+    """Collects delivered messages; refuses ``reject@`` and answers 421 to the DATA listed in ``fail_data``"""
+
+    def __init__(self, fail_data=()):
+        self.messages = []
+        self.sessions = set()
+        self.data_count = 0
+        self.fail_data = set(fail_data)
+        self.lock = threading.Lock()
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address.startswith("reject@"):
+            return "550 No such user"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        with self.lock:
+            self.data_count += 1
+            if self.data_count in self.fail_data:
+                return "421 Service not available, closing channel"
+            self.sessions.add(session)
+            self.messages.append((envelope.rcpt_tos[0], envelope.content))
+        return "250 Message accepted"
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _sink(handler):
+    controller = Controller(handler, hostname="127.0.0.1", port=_free_port())
+    controller.start()
+    sender = EmailSender("127.0.0.1", controller.port, username="jobs@example.com", use_tls=False, auth=False)
+    return controller, sender
+
+
+def test_batch_reuses_connections_and_reports_each_recipient():
+    handler = SinkHandler()
+    controller, sender = _sink(handler)
+    try:
+        emails = [OutgoingEmail(f"user{i}@example.com", f"Digest {i}", f"body {i}") for i in range(20)]
+        emails.insert(5, OutgoingEmail("reject@example.com", "Digest", "body"))
+        results = sender.send_batch(emails, max_connections=3)
+    finally:
+        controller.stop()
+
+    assert [r.to_address for r in results] == [e.to_address for e in emails]
+    failed = [r for r in results if not r.ok]
+    assert len(failed) == 1 and failed[0].to_address == "reject@example.com"
+    assert failed[0].permanent and failed[0].attempts == 1
+    assert len(handler.messages) == 20
+    # 20 messages over at most 3 connections, not one connection each
+    assert len(handler.sessions) <= 3
+
+
+def test_batch_reconnects_after_transient_failure():
+    handler = SinkHandler(fail_data={2})
+    controller, sender = _sink(handler)
+    try:
+        results = sender.send_batch(
+            [OutgoingEmail(f"user{i}@example.com", "Digest", "body") for i in range(4)], max_connections=1
+        )
+    finally:
+        controller.stop()
+
+    assert all(r.ok for r in results)
+    assert [r.attempts for r in results] == [1, 2, 1, 1]
+    assert sorted(rcpt for rcpt, _ in handler.messages) == [f"user{i}@example.com" for i in range(4)]
+    assert len(handler.sessions) == 2
+
+
+def test_send_digests_renders_each_recipient():
+    handler = SinkHandler()
+    controller, sender = _sink(handler)
+    jobs = [{"title": "DevOps Engineer", "company": "Acme Corp", "match_score": 92.5, "matched_skills": ["AWS"]}]
+    try:
+        results = send_digests(
+            [{"to_address": "a@example.com", "subject": "Jobs", "jobs": jobs},
+             {"to_address": "b@example.com", "subject": "Jobs", "jobs": []}],
+            sender=sender,
+        )
+    finally:
+        controller.stop()
+
+    assert all(r.ok for r in results)
+    bodies = {rcpt: message_from_bytes(content).get_payload(decode=True).decode() for rcpt, content in handler.messages}
+    assert "DevOps Engineer at Acme Corp" in bodies["a@example.com"]
+    assert "No matching jobs found" in bodies["b@example.com"]
+
+
+if __name__ == "__main__":
+    test_batch_reuses_connections_and_reports_each_recipient()
+    test_batch_reconnects_after_transient_failure()
+    test_send_digests_renders_each_recipient()
+    print("Batch email OK")
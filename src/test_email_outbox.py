@@ -0,0 +1,111 @@
+import os
+import tempfile
+import time
+from email import message_from_bytes, policy
+
+import pytest
+from aiosmtpd.controller import Controller
+from aiosmtpd.smtp import AuthResult
+
+from jobtracker.emailer.email_sender import EmailSender, SendResult
+from jobtracker.emailer.outbox import EmailOutbox, SenderConfigError, spawn_sender
+from test_email_batch import SinkHandler, _free_port, _sink
+
+
+def _outbox(**kwargs) -> EmailOutbox:
+    return EmailOutbox(os.path.join(tempfile.mkdtemp(), "outbox.db"), **kwargs)
+
+
+def test_enqueue_is_idempotent_and_drain_delivers_with_attachment():
+    outbox = _outbox()
+    attachment = os.path.join(tempfile.mkdtemp(), "jobs.csv")
+    with open(attachment, "w") as f:
+        f.write("Title,Company\nDevOps Engineer,Acme\n")
+    key = outbox.enqueue("me@example.com", "Daily Job Matches", "body", attachment_path=attachment)
+    assert outbox.enqueue("me@example.com", "Daily Job Matches", "body", attachment_path=attachment) == key
+    outbox.enqueue("other@example.com", "Daily Job Matches", "body")
+    assert outbox.stats()["by_status"] == {"pending": 2}
+
+    handler = SinkHandler()
+    controller, sender = _sink(handler)
+    try:
+        assert outbox.drain(sender) == {"sent": 2, "pending": 0, "failed": 0}
+        # Sent messages are not picked up again
+        assert outbox.drain(sender) == {"sent": 0, "pending": 0, "failed": 0}
+    finally:
+        controller.stop()
+
+    assert outbox.stats()["by_status"] == {"sent": 2}
+    messages = {rcpt: message_from_bytes(content, policy=policy.default) for rcpt, content in handler.messages}
+    assert messages["me@example.com"]["Message-ID"] == f"<{key}@jobtracker>"
+    assert [part.get_filename() for part in messages["me@example.com"].iter_attachments()] == ["jobs.csv"]
+
+
+def test_failures_back_off_then_give_up():
+    outbox = _outbox(max_attempts=2, base_delay=60)
+    outbox.enqueue("me@example.com", "Jobs", "body")
+    now = time.time()
+    [message] = outbox.claim(now=now)
+    assert outbox.claim(now=now) == []
+
+    assert outbox.record(message, SendResult("me@example.com", False, 1, error="421 busy"), now=now) == "pending"
+    assert outbox.claim(now=now + 10) == []
+    [message] = outbox.claim(now=now + 61)
+    assert message.attempts == 1
+    assert outbox.record(message, SendResult("me@example.com", False, 1, error="421 busy"), now=now + 61) == "failed"
+    assert outbox.stats()["by_status"] == {"failed": 1}
+
+
+def test_expired_lease_is_reclaimed_and_missing_attachment_fails():
+    outbox = _outbox(lease_seconds=60)
+    outbox.enqueue("me@example.com", "Jobs", "body")
+    now = time.time()
+    assert len(outbox.claim(now=now)) == 1
+    # The sender that claimed it died; after the lease another sender takes over
+    assert len(outbox.claim(now=now + 61)) == 1
+
+    outbox = _outbox()
+    outbox.enqueue("me@example.com", "Jobs", "body", attachment_path="/nonexistent/jobs.xlsx")
+    handler = SinkHandler()
+    controller, sender = _sink(handler)
+    try:
+        assert outbox.drain(sender) == {"sent": 0, "pending": 0, "failed": 1}
+    finally:
+        controller.stop()
+    assert handler.messages == []
+
+
+@pytest.mark.filterwarnings("ignore:Requiring AUTH while not requiring TLS")
+def test_rejected_login_leaves_messages_pending():
+    outbox = _outbox(max_attempts=1)
+    outbox.enqueue("me@example.com", "Jobs", "body")
+    outbox.enqueue("other@example.com", "Jobs", "body")
+    handler = SinkHandler()
+    # handled=False: aiosmtpd answers the failed login with 535 itself
+    controller = Controller(handler, hostname="127.0.0.1", port=_free_port(), auth_required=True, auth_require_tls=False,
+                            authenticator=lambda *args: AuthResult(success=False, handled=False))
+    controller.start()
+    try:
+        sender = EmailSender("127.0.0.1", controller.port, username="jobs@example.com", password="wrong", use_tls=False)
+        with pytest.raises(SenderConfigError, match="SMTPAuthenticationError"):
+            outbox.drain(sender)
+    finally:
+        controller.stop()
+
+    # Not failed even with max_attempts=1: the login, not the messages, was at fault
+    assert outbox.stats()["by_status"] == {"pending": 2}
+    assert outbox.claim(now=time.time() + 3600)[0].attempts == 0
+    assert handler.messages == []
+
+
+def test_spawn_sender_checks_smtp_settings_first(monkeypatch):
+    monkeypatch.setenv("EMAIL_ADDRESS", "me@example.com")
+    monkeypatch.delenv("EMAIL_PASSWORD", raising=False)
+    log_path = os.path.join(tempfile.mkdtemp(), "outbox_sender.log")
+    with pytest.raises(ValueError, match="EMAIL_PASSWORD"):
+        spawn_sender(log_path)
+    assert not os.path.exists(log_path)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-q"])
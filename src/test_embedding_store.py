@@ -0,0 +1,77 @@
+import os
+import tempfile
+
+import numpy as np
+
+from jobtracker.matcher.embedding_store import EmbeddingStore, text_key
+
+
+class CountingModel:
+    """Stand-in encoder: deterministic vectors, records how many texts it encoded"""
+
+    def __init__(self, dim=8):
+        self.dim = dim
+        self.encoded = 0
+
+    def encode(self, texts, batch_size=32):
+        self.encoded += len(texts)
+        return np.array([[len(t) + i for i in range(self.dim)] for t in texts], dtype=np.float32)
+
+
+def test_encode_only_misses_and_share_between_instances():
+    with tempfile.TemporaryDirectory() as tmp:
+        model = CountingModel()
+        store = EmbeddingStore(tmp, "test-model", dim=8)
+        first = store.encode(model, ["devops engineer", "data scientist"])
+        assert first.shape == (2, 8)
+        assert model.encoded == 2
+
+        second = store.encode(model, ["data scientist", "sre", "devops engineer"])
+        assert model.encoded == 3  # only "sre" was new
+        assert np.array_equal(second[0], first[1])
+        assert np.array_equal(second[2], first[0])
+
+        # A second instance (another worker) sees rows written by the first through the memmap
+        other = EmbeddingStore(tmp, "test-model", dim=8)
+        assert len(other) == 3
+        other.encode(model, ["sre"])
+        assert model.encoded == 3
+
+
+def test_orphan_rows_are_dropped():
+    with tempfile.TemporaryDirectory() as tmp:
+        model = CountingModel()
+        store = EmbeddingStore(tmp, "test-model", dim=8)
+        store.encode(model, ["a"])
+        with open(store.data_path, "ab") as f:
+            f.write(np.zeros(8, dtype=np.float16).tobytes())  # writer died before appending its key
+        vectors = store.encode(model, ["bb"])
+        assert np.array_equal(store.get_many([text_key("bb")])[0], vectors[0])
+        assert not np.array_equal(vectors[0], np.zeros(8))
+
+
+def test_compaction_keeps_newest_rows_and_readers_follow():
+    with tempfile.TemporaryDirectory() as tmp:
+        model = CountingModel()
+        store = EmbeddingStore(tmp, "test-model", dim=8, max_entries=5)
+        reader = EmbeddingStore(tmp, "test-model", dim=8)
+        texts = [f"job {i}" for i in range(5)]
+        vectors = store.encode(model, texts)
+        assert len(reader) == 5
+
+        # The sixth row goes past max_entries: the newest 3 are rewritten into a new generation
+        store.encode(model, ["job 5"])
+        assert len(store) == 3 and len(reader) == 3
+        assert reader.get_many([text_key("job 2")]) == [None]
+        assert np.array_equal(reader.get_many([text_key("job 4")])[0], vectors[4])
+        assert sorted(os.listdir(tmp)) == ["test-model.1.f16", "test-model.1.keys", "test-model.gen", "test-model.lock"]
+
+        reader.compact(0)
+        assert len(store) == 0
+
+
+if __name__ == "__main__":
+    test_encode_only_misses_and_share_between_instances()
+    test_orphan_rows_are_dropped()
+    test_compaction_keeps_newest_rows_and_readers_follow()
+    print("Embedding store OK")
@@ -0,0 +1,84 @@
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from jobtracker.metrics import MetricsRegistry, collect_metrics, metrics
+
+
+def test_stage_timer_counts_jobs():
+    registry = MetricsRegistry()
+    with registry.stage("dedup", jobs_in=10) as stage:
+        stage.jobs_out = 7
+    report = registry.report()
+    assert report["stages"]["dedup"]["runs"] == 1
+    assert report["stages"]["dedup"]["jobs_in"] == 10
+    assert report["stages"]["dedup"]["jobs_out"] == 7
+    json.dumps(report)  # run report must be JSON serializable
+
+
+def test_stage_timer_records_errors():
+    registry = MetricsRegistry()
+    try:
+        with registry.stage("fetch"):
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    runs = registry.counters["jobtracker_stage_runs_total"]
+    assert runs[(("outcome", "error"), ("stage", "fetch"))] == 1
+
+
+def test_prometheus_rendering():
+    registry = MetricsRegistry()
+    registry.inc("jobtracker_cache_hits_total", cache="resume")
+    registry.set("jobtracker_api_quota_remaining", 42, api="jsearch")
+    registry.observe("jobtracker_stage_duration_seconds", 0.3, stage="match")
+    text = registry.render_prometheus()
+    assert "# TYPE jobtracker_cache_hits_total counter" in text
+    assert 'jobtracker_cache_hits_total{cache="resume"} 1' in text
+    assert 'jobtracker_api_quota_remaining{api="jsearch"} 42' in text
+    assert 'jobtracker_stage_duration_seconds_bucket{stage="match",le="0.25"} 0' in text
+    assert 'jobtracker_stage_duration_seconds_bucket{stage="match",le="0.5"} 1' in text
+    assert 'jobtracker_stage_duration_seconds_bucket{stage="match",le="+Inf"} 1' in text
+    assert 'jobtracker_stage_duration_seconds_count{stage="match"} 1' in text
+
+
+def test_collecting_leaves_the_registry_alone():
+    registry = MetricsRegistry()
+    registry.inc("jobtracker_cache_hits_total", cache="resume")
+    with registry.collecting() as collected:
+        registry.inc("jobtracker_cache_hits_total", cache="resume")
+        with registry.stage("embed"):
+            pass
+    assert registry.counters == {"jobtracker_cache_hits_total": {(("cache", "resume"),): 1}}
+    assert collected.counters["jobtracker_cache_hits_total"] == {(("cache", "resume"),): 1}
+    assert collected.report()["stages"]["embed"]["runs"] == 1
+
+
+def _work(n):
+    with metrics.stage("embed", jobs_in=n) as stage:
+        stage.jobs_out = n
+    return n * 2
+
+
+def test_collect_and_merge():
+    # In-process (thread executor) work records straight into the registry
+    assert collect_metrics(_work, 1) == (2, {})
+
+    with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        result, snapshot = pool.submit(collect_metrics, _work, 3).result()
+    assert result == 6
+    parent = MetricsRegistry()
+    parent.merge(snapshot)
+    parent.merge(snapshot)
+    report = parent.report()
+    assert report["stages"]["embed"]["runs"] == 2
+    assert report["stages"]["embed"]["jobs_in"] == 6
+
+
+if __name__ == "__main__":
+    test_stage_timer_counts_jobs()
+    test_stage_timer_records_errors()
+    test_prometheus_rendering()
+    test_collecting_leaves_the_registry_alone()
+    test_collect_and_merge()
+    print("✅ metrics tests passed")
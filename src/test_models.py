@@ -0,0 +1,38 @@
+import subprocess
+import sys
+
+import spacy
+
+import jobtracker.models as models
+from jobtracker.config import JobTrackerConfig
+
+
+def test_importing_models_and_matcher_loads_nothing():
+    # A fresh interpreter: this test process may already have imported spaCy or torch
+    code = (
+        "import sys\n"
+        "import jobtracker.models, jobtracker.matcher.matcher, jobtracker.resume.parser\n"
+        "print(','.join(m for m in ('spacy', 'sentence_transformers', 'torch') if m in sys.modules))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ""
+
+
+def test_models_load_once_on_first_use(monkeypatch):
+    calls = []
+    monkeypatch.setattr(spacy, "load", lambda *args, **kwargs: calls.append(args) or spacy.blank("en"))
+    monkeypatch.setattr(models, "_nlp", None)
+    assert models.get_nlp() is models.get_nlp()
+    assert calls == [(models.SPACY_MODEL,)]
+
+
+def test_model_name_comes_from_config(monkeypatch):
+    assert models.SENTENCE_TRANSFORMER_MODEL == JobTrackerConfig().sentence_transformer_model
+    monkeypatch.setenv("SENTENCE_TRANSFORMER_MODEL", "paraphrase-MiniLM-L3-v2")
+    assert JobTrackerConfig.from_env().sentence_transformer_model == "paraphrase-MiniLM-L3-v2"
+
+
+if __name__ == "__main__":
+    import pytest
+
+    pytest.main([__file__, "-q"])
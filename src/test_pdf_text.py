@@ -0,0 +1,101 @@
+from concurrent.futures import Future
+
+import jobtracker.resume.pdf_text as pdf_text
+from jobtracker.resume.pdf_text import PdfLimits, PdfTooLargeError, extract_pdf_text
+
+
+def _make_pdf(page_texts):
+    """Minimal uncompressed PDF with one text line per page ("" = page without text)"""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>"]
+    kids = " ".join(f"{3 + 2 * i} 0 R" for i in range(len(page_texts)))
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {len(page_texts)} >>")
+    font_id = 3 + 2 * len(page_texts)
+    for i, text in enumerate(page_texts):
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET" if text else ""
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {4 + 2 * i} 0 R "
+                       f"/Resources << /Font << /F1 {font_id} 0 R >> >> >>")
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for i, obj in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{i} 0 obj\n{obj}\nendobj\n".encode()
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{o:010d} 00000 n \n" for o in offsets).encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF".encode()
+    return out
+
+
+pdf = _make_pdf([f"Page {i} Python AWS" if i % 3 else "" for i in range(30)])
+
+
+def test_empty_pages_and_page_limit():
+    text = extract_pdf_text(pdf, PdfLimits(max_pages=10))
+    assert "Page 8" in text and "Page 10" not in text
+
+
+def test_early_cutoff():
+    assert len(extract_pdf_text(pdf, PdfLimits(max_chars=50))) == 50
+
+
+def test_byte_limit():
+    try:
+        extract_pdf_text(pdf, PdfLimits(max_bytes=100))
+    except PdfTooLargeError:
+        return
+    raise AssertionError("expected PdfTooLargeError")
+
+
+class _StuckAfterFirstChunk:
+    """Executor stand-in: the first chunk finishes inline, every later one stays running forever"""
+
+    def __init__(self):
+        self.running = []
+
+    def submit(self, fn, source, chunk):
+        future = Future()
+        future.set_running_or_notify_cancel()
+        if chunk.start == 0:
+            future.set_result(fn(source, chunk))
+        else:
+            self.running.append(future)
+        return future
+
+
+def test_timeout_terminates_pool_and_returns_partial_text(monkeypatch):
+    pool = _StuckAfterFirstChunk()
+    terminated = []
+    monkeypatch.setattr(pdf_text, "_get_pool", lambda workers: pool)
+    monkeypatch.setattr(pdf_text, "_terminate_pool", terminated.append)
+
+    text = extract_pdf_text(pdf, PdfLimits(max_pages=30, pages_per_chunk=2, workers=2, timeout_seconds=0.05))
+    # Pages of the finished chunk are kept; the chunk still running at the deadline gets the pool killed
+    assert text == "\nPage 1 Python AWS"
+    assert terminated == [pool]
+    assert len(pool.running) == 2  # the refill after chunk one, plus the chunk already in flight
+
+
+def test_pool_is_shared_and_replaced_after_termination():
+    limits = PdfLimits(max_pages=30, pages_per_chunk=2, workers=2)
+    assert "Page 29" in extract_pdf_text(pdf, limits)
+    pool = pdf_text._pool
+    extract_pdf_text(pdf, limits)
+    assert pdf_text._pool is pool
+
+    processes = list(pool._processes.values())
+    pdf_text._terminate_pool(pool)
+    assert pdf_text._pool is None
+    for process in processes:
+        process.join(timeout=5)
+        assert not process.is_alive()
+    assert "Page 29" in extract_pdf_text(pdf, limits)
+    assert pdf_text._pool is not pool
+
+
+if __name__ == "__main__":
+    import pytest
+
+    pytest.main([__file__, "-q"])
@@ -0,0 +1,32 @@
+import itertools
+import os
+import tempfile
+
+import numpy as np
+
+from jobtracker.resume.cache import ResumeProfileCache
+
+
+def test_cache_roundtrip_and_lru_eviction():
+    with tempfile.TemporaryDirectory() as tmp:
+        # Strictly increasing access times, however coarse the system clock is
+        ticks = itertools.count(1)
+        cache = ResumeProfileCache(os.path.join(tmp, "profiles.db"), max_entries=2, clock=lambda: float(next(ticks)))
+        profile = {"text": "Python developer", "tech_skills": ["python"], "experience_years": 3}
+
+        cache.put("a" * 64, profile, np.ones(4, dtype=np.float32), "all-MiniLM-L6-v2")
+        cached = cache.get("a" * 64)
+        assert cached["tech_skills"] == ["python"]
+        assert cached["embedding"] == [1.0, 1.0, 1.0, 1.0]
+
+        cache.put("b" * 64, profile)
+        cache.get("a" * 64)  # "a" is now more recently used than "b"
+        cache.put("c" * 64, profile)
+        assert cache.get("b" * 64) is None
+        assert cache.get("a" * 64) is not None
+        assert cache.get("c" * 64) is not None
+
+
+if __name__ == "__main__":
+    test_cache_roundtrip_and_lru_eviction()
+    print("Resume profile cache OK")
@@ -0,0 +1,66 @@
+import json
+
+import numpy as np
+
+from jobtracker.matcher.matcher import _resume_embedding
+from jobtracker.matcher.skill_bitmap import SkillTaxonomy
+from jobtracker.resume.profile import compact_profile, profile_embedding, profile_skill_bitmap
+
+full_profile = {
+    "text": "Senior DevOps engineer. " * 200,
+    "tokens": ["devops", "engineer"] * 400,
+    "entities": ["acme"] * 50,
+    "skills": ["aws", "terraform", "acme"],
+    "tech_skills": ["aws", "terraform"],
+    "skill_counts": {"aws": 3, "terraform": 1},
+    "top_terms": ["devops", "engineer"],
+    "experience_years": 6,
+    "content_hash": "0" * 64,
+    "embedding": np.linspace(-1, 1, 384).tolist(),
+    "embedding_model": "all-MiniLM-L6-v2",
+}
+
+
+def test_compact_profile_is_small_and_lossless_enough():
+    compact = compact_profile(full_profile)
+    assert "text" not in compact and "tokens" not in compact
+    assert len(json.dumps(compact)) < 4096 < len(json.dumps(full_profile))
+    assert np.allclose(profile_embedding(compact), full_profile["embedding"], atol=1e-3)
+
+    taxonomy = SkillTaxonomy()
+    assert taxonomy.decode(profile_skill_bitmap(compact, taxonomy)) == ["aws", "terraform"]
+
+
+class FakeModel:
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, text):
+        self.encoded.append(text)
+        return np.ones(384, dtype=np.float32)
+
+
+def test_compact_profile_without_usable_embedding_is_reencoded_from_resume_text():
+    compact = compact_profile({k: v for k, v in full_profile.items() if k != "embedding"})
+    stale = {**compact_profile(full_profile), "embedding_model": "some-older-model"}
+    for profile in (compact, stale):
+        model = FakeModel()
+        # What the API attaches from storage.get_resume_text
+        embedding = _resume_embedding({**profile, "resume_text": full_profile["text"]}, model)
+        assert model.encoded == [full_profile["text"]] and embedding.shape == (384,)
+
+        try:
+            _resume_embedding(profile, FakeModel())
+        except ValueError:
+            continue
+        raise AssertionError("expected ValueError for a profile with nothing to encode")
+
+    model = FakeModel()
+    assert np.allclose(_resume_embedding(compact_profile(full_profile), model), full_profile["embedding"], atol=1e-3)
+    assert model.encoded == []
+
+
+if __name__ == "__main__":
+    test_compact_profile_is_small_and_lossless_enough()
+    test_compact_profile_without_usable_embedding_is_reencoded_from_resume_text()
+    print(f"Full: {len(json.dumps(full_profile))} bytes, compact: {len(json.dumps(compact_profile(full_profile)))} bytes")
@@ -0,0 +1,49 @@
+import json
+from datetime import datetime
+
+import numpy as np
+
+from api.serialization import MAGIC, ZSTD_AVAILABLE, Serializer, loads
+
+RESULTS = {
+    "total_jobs": 2,
+    "jobs": [
+        {"id": str(i), "title": "Python Developer", "match_score": 81.5, "posted_at": datetime(2026, 1, 2),
+         "raw": {"job_description": "Build data pipelines in Python and SQL. " * 40}}
+        for i in range(2)
+    ],
+}
+
+
+def test_round_trip_every_available_format():
+    compressions = ["none", "gzip"] + (["zstd"] if ZSTD_AVAILABLE else [])
+    for compression in compressions:
+        serializer = Serializer(compression=compression)
+        payload = serializer.dumps(RESULTS)
+        assert payload.startswith(MAGIC)
+        decoded = loads(payload)
+        assert decoded["jobs"][1]["raw"] == RESULTS["jobs"][1]["raw"]
+        assert decoded["jobs"][0]["posted_at"].startswith("2026-01-02")
+
+
+def test_legacy_json_still_reads():
+    legacy = json.dumps({"tech_skills": ["python"]}, indent=2)
+    assert loads(legacy.encode("utf-8")) == {"tech_skills": ["python"]}
+    assert loads(legacy) == {"tech_skills": ["python"]}
+
+
+def test_compressed_is_smaller_than_indented_json():
+    indented = json.dumps(RESULTS, indent=2, default=str).encode("utf-8")
+    assert len(Serializer(compression="gzip").dumps(RESULTS)) < len(indented) / 5
+
+
+def test_numpy_values_encode():
+    assert loads(Serializer().dumps({"score": np.float32(0.5)}))["score"] == 0.5
+
+
+if __name__ == "__main__":
+    test_round_trip_every_available_format()
+    test_legacy_json_still_reads()
+    test_compressed_is_smaller_than_indented_json()
+    test_numpy_values_encode()
+    print("Serialization OK")
@@ -0,0 +1,43 @@
+import asyncio
+import os
+import tempfile
+
+from api.session_index import empty_manifest, page, remove, touch
+from api.storage import AzureBlobStorage
+from api.storage_sqlite import SQLiteStorage
+
+
+def test_touch_and_page():
+    manifest = empty_manifest()
+    assert touch(manifest, "a", now=100)
+    assert touch(manifest, "b", now=200)
+    assert not touch(manifest, "a", now=150, min_interval=300)  # too recent to rewrite
+    assert touch(manifest, "a", now=600, min_interval=300)
+
+    first = page(manifest, limit=1)
+    assert [e["session_id"] for e in first["sessions"]] == ["a"]
+    assert first["total"] == 2 and first["next_offset"] == 1
+    second = page(manifest, limit=1, offset=first["next_offset"])
+    assert [e["session_id"] for e in second["sessions"]] == ["b"]
+    assert second["next_offset"] is None
+
+    assert remove(manifest, "a") and not remove(manifest, "a")
+
+
+def test_local_storage_maintains_index():
+    async def run():
+        storage = AzureBlobStorage(local=SQLiteStorage(os.path.join(tempfile.mkdtemp(), "jobtracker.db")))
+        storage.connection_string = None
+        for i in range(3):
+            await storage.save_resume_profile(f"session-{i}", {"tech_skills": []})
+        assert (await storage.list_session_page(limit=2))["total"] == 3
+        await storage.delete_session("session-1")
+        assert sorted(await storage.list_sessions()) == ["session-0", "session-2"]
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_touch_and_page()
+    test_local_storage_maintains_index()
+    print("Session index OK")
@@ -0,0 +1,34 @@
+from jobtracker.matcher.skill_bitmap import SkillTaxonomy, SkillBitmapScorer, popcount
+
+taxonomy = SkillTaxonomy().extend(["ci/cd"])
+resume_skills = ["python", "aws", "terraform", "docker", "ci/cd"]
+job_texts = [
+    "DevOps Engineer with AWS, Terraform and CI/CD pipelines",
+    "Python developer, Docker, AWS",
+    "Frontend role with React",
+]
+
+
+def test_encode_decode_roundtrip():
+    bitmap = taxonomy.encode(resume_skills)
+    assert popcount(bitmap) == len(resume_skills)
+    assert sorted(taxonomy.decode(bitmap)) == sorted(resume_skills)
+
+
+def test_batch_scores():
+    scorer = SkillBitmapScorer(taxonomy)
+    scores = scorer.score(taxonomy.encode(resume_skills), taxonomy.encode_texts(job_texts))
+    assert list(scores.matched_count) == [3, 3, 0]
+    assert abs(scores.skill_score[0] - 3 / 5) < 1e-9
+    cloud = taxonomy.categories.index("cloud_platforms")
+    assert scores.category_coverage[0, cloud] == 1.0
+    assert scores.weighted_score[2] == 0.0
+
+
+if __name__ == "__main__":
+    test_encode_decode_roundtrip()
+    test_batch_scores()
+    scorer = SkillBitmapScorer(taxonomy)
+    scores = scorer.score(taxonomy.encode(resume_skills), taxonomy.encode_texts(job_texts))
+    for text, overlap, score in zip(job_texts, scores.overlap, scores.skill_score):
+        print(f"{text}: {score:.0%} | Matched Skills: {taxonomy.decode(overlap)}")
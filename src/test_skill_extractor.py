@@ -0,0 +1,19 @@
+from jobtracker.skills import get_skill_extractor
+
+
+def test_single_pass_counts_and_positions():
+    text = "Python and AWS engineer. Built CI/CD on AWS with Node.js; no Rust."
+    matches = get_skill_extractor().extract(text)
+    assert list(matches)[0] == "aws"
+    assert matches["aws"].count == 2
+    start, end = matches["ci/cd"].positions[0]
+    assert text[start:end] == "CI/CD"
+    assert "node.js" in matches and "rust" in matches
+    # token boundaries, not substrings: "engineer" must not match "r" or "go"
+    assert "r" not in matches and "go" not in matches
+
+
+if __name__ == "__main__":
+    test_single_pass_counts_and_positions()
+    for skill, match in get_skill_extractor().extract("Go, Kubernetes, Terraform and more Terraform").items():
+        print(f"{skill}: {match.count} at {match.positions}")
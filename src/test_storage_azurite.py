@@ -0,0 +1,68 @@
+import asyncio
+import io
+import os
+import socket
+import uuid
+
+# Azurite's well-known development account (not a secret)
+AZURITE_CONNECTION_STRING = (
+    "DefaultEndpointsProtocol=http;AccountName=devstoreaccount1;"
+    "AccountKey=Eby8vdM02xNOcqFlqUwJPLlmEtlCDXJ1OUzFT50uSRZ6IFsuFq2UVErCz4I6tq/K1SZFPTOtr/KBHBeksoGMGw==;"
+    "BlobEndpoint=http://127.0.0.1:10000/devstoreaccount1;"
+)
+
+
+def azurite_running(host: str = "127.0.0.1", port: int = 10000) -> bool:
+    try:
+        with socket.create_connection((host, port), timeout=1):
+            return True
+    except OSError:
+        return False
+
+
+async def _roundtrip():
+    os.environ["AZURE_STORAGE_CONNECTION_STRING"] = os.getenv("AZURITE_CONNECTION_STRING", AZURITE_CONNECTION_STRING)
+    os.environ["AZURE_STORAGE_CONTAINER"] = f"test-{uuid.uuid4().hex[:8]}"
+    from api.storage import RESULT_PAGE_SIZE, AzureBlobStorage
+
+    storage = AzureBlobStorage()
+    session_id = str(uuid.uuid4())
+    try:
+        url = await storage.upload_resume(session_id, "cv.txt", io.BytesIO(b"resume " * 100_000), 700_000)
+        assert url.startswith("http"), url  # went to the emulator, not the local fallback
+
+        await storage.save_resume_profile(session_id, {"tech_skills": ["python"]})
+        assert (await storage.get_resume_profile(session_id))["tech_skills"] == ["python"]
+
+        # Timestamped run blob, its job page blobs and a latest.json pointer to it
+        jobs = [{"id": str(i)} for i in range(2 * RESULT_PAGE_SIZE + 50)]
+        await storage.save_search_results(session_id, {"jobs": jobs, "total_jobs": len(jobs)})
+        results_blobs = await storage._list_names(f"results/{session_id}/")
+        assert len(results_blobs) == 2 + 3 and f"results/{session_id}/latest.json" in results_blobs
+        latest = await storage._download(f"results/{session_id}/latest.json")
+        assert len(latest) < 200
+        assert (await storage.get_search_results(session_id))["jobs"] == jobs
+        page = await storage.get_search_results_page(session_id, RESULT_PAGE_SIZE - 5, 10)
+        assert page["jobs"] == jobs[RESULT_PAGE_SIZE - 5:RESULT_PAGE_SIZE + 5] and page["stored_jobs"] == len(jobs)
+
+        assert session_id in await storage.list_sessions()
+        await storage.delete_session(session_id)
+        assert await storage.get_resume_profile(session_id) is None
+        assert session_id not in await storage.list_sessions()
+    finally:
+        client = await storage._client()
+        await client.delete_container(storage.container_name)
+        await storage.close()
+
+
+def test_async_storage_against_azurite():
+    if not azurite_running():
+        print("Azurite not running on 127.0.0.1:10000, skipping (docker compose --profile azurite up azurite)")
+        return
+    asyncio.run(_roundtrip())
+
+
+if __name__ == "__main__":
+    test_async_storage_against_azurite()
+    if azurite_running():
+        print("Async storage OK")
@@ -0,0 +1,109 @@
+import asyncio
+import os
+import tempfile
+
+from api.storage import CachedStorage, create_storage
+from api.storage_sqlite import SQLiteStorage
+
+
+class CountingStorage(SQLiteStorage):
+    def __init__(self, path):
+        super().__init__(path)
+        self.reads = 0
+
+    def _get_search_results(self, session_id, *page):
+        self.reads += 1
+        return super()._get_search_results(session_id, *page)
+
+
+def _backend() -> CountingStorage:
+    return CountingStorage(os.path.join(tempfile.mkdtemp(), "jobtracker.db"))
+
+
+def test_read_through_and_write_through():
+    async def run():
+        backend = _backend()
+        await backend.save_search_results("s1", {"jobs": [{"id": "a"}], "total_jobs": 1})
+        storage = CachedStorage(backend)
+
+        assert (await storage.get_search_results("s1"))["total_jobs"] == 1
+        assert (await storage.get_search_results("s1"))["total_jobs"] == 1
+        assert backend.reads == 1
+        assert storage.results.stats()["hits"] == 1 and storage.results.stats()["misses"] == 1
+        # Pages of cached results are sliced from memory
+        assert (await storage.get_search_results_page("s1", 0, 10))["stored_jobs"] == 1
+        assert backend.reads == 1
+
+        # Write-through: the new results are served without another backend read
+        await storage.save_search_results("s1", {"jobs": [], "total_jobs": 0})
+        assert (await storage.get_search_results("s1"))["total_jobs"] == 0
+        assert backend.reads == 1
+
+        await storage.save_resume_profile("s1", {"tech_skills": ["python"]})
+        assert (await storage.get_resume_profile("s1"))["tech_skills"] == ["python"]
+
+    asyncio.run(run())
+
+
+def test_delete_invalidates():
+    async def run():
+        storage = CachedStorage(_backend())
+        await storage.save_resume_profile("s1", {"tech_skills": []})
+        await storage.save_search_results("s1", {"jobs": []})
+        await storage.delete_session("s1")
+        assert await storage.get_resume_profile("s1") is None
+        assert await storage.get_search_results("s1") is None
+        # Misses are not cached
+        assert storage.results.stats()["entries"] == 0
+
+    asyncio.run(run())
+
+
+def test_concurrent_misses_share_one_read():
+    async def run():
+        backend = _backend()
+        await backend.save_search_results("s1", {"jobs": [], "total_jobs": 3})
+        storage = CachedStorage(backend)
+        results = await asyncio.gather(*[storage.get_search_results("s1") for _ in range(5)])
+        assert all(r["total_jobs"] == 3 for r in results)
+        assert backend.reads == 1
+
+    asyncio.run(run())
+
+
+def test_ttl_expiry_rereads():
+    async def run():
+        backend = _backend()
+        await backend.save_search_results("s1", {"jobs": []})
+        storage = CachedStorage(backend, ttl_seconds=0)
+        await storage.get_search_results("s1")
+        await storage.get_search_results("s1")
+        assert backend.reads == 2
+
+    asyncio.run(run())
+
+
+def test_create_storage_roundtrip(monkeypatch):
+    monkeypatch.setenv("STORAGE_BACKEND", "sqlite")
+    monkeypatch.setenv("STORAGE_SQLITE_PATH", os.path.join(tempfile.mkdtemp(), "jobtracker.db"))
+
+    async def run():
+        storage = create_storage()
+        assert isinstance(storage, CachedStorage)
+        await storage.save_resume_profile("s1", {"text": "Test resume", "skills": ["python", "aws"]})
+        assert (await storage.get_resume_profile("s1"))["skills"] == ["python", "aws"]
+        await storage.save_search_results("s1", {"jobs": [{"title": "Test Job", "match_score": 85}], "total_jobs": 1})
+        assert (await storage.get_search_results("s1"))["jobs"][0]["title"] == "Test Job"
+        assert await storage.list_sessions() == ["s1"]
+
+        await storage.delete_session("s1")
+        assert await storage.list_sessions() == []
+        assert await storage.get_search_results("s1") is None
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    import pytest
+
+    pytest.main([__file__, "-q"])
@@ -0,0 +1,112 @@
+import asyncio
+import io
+import json
+import os
+import sqlite3
+import tempfile
+import time
+
+from api.storage_sqlite import SQLiteStorage
+
+
+def _storage() -> SQLiteStorage:
+    return SQLiteStorage(os.path.join(tempfile.mkdtemp(), "jobtracker.db"))
+
+
+def test_round_trip_and_cascade_delete():
+    async def run():
+        storage = _storage()
+        await storage.upload_resume("s1", "cv.pdf", io.BytesIO(b"%PDF" * 1000))
+        await storage.save_resume_profile("s1", {"tech_skills": ["python"]})
+        await storage.save_resume_text("s1", "resume text")
+        assert (await storage.get_resume_profile("s1"))["tech_skills"] == ["python"]
+        assert await storage.get_resume_text("s1") == "resume text"
+
+        results = {"search_params": {"keywords": "python"}, "total_jobs": 2, "filtered_jobs": 2,
+                   "timestamp": "2026-01-01T00:00:00", "cache_hit": False,
+                   "jobs": [{"id": "a", "match_score": 90}, {"id": "b", "match_score": 80}]}
+        await storage.save_search_results("s1", results)
+        assert await storage.get_search_results("s1") == results
+        page = await storage.get_search_results_page("s1", 1, 10)
+        assert page["jobs"] == [{"id": "b", "match_score": 80}] and page["stored_jobs"] == 2
+        assert page["total_jobs"] == 2 and page["cache_hit"] is False
+
+        await storage.delete_session("s1")
+        assert await storage.get_resume_profile("s1") is None
+        assert await storage.get_search_results("s1") is None
+        assert await storage.get_resume_text("s1") is None
+        with sqlite3.connect(storage.path) as conn:
+            for table in ("resumes", "profiles", "search_runs", "job_results"):
+                assert conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] == 0
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    asyncio.run(run())
+
+
+def test_streamed_resume_is_stored_whole():
+    async def run():
+        storage = _storage()
+        payload = os.urandom(3 * 1024 * 1024 + 17)
+        await storage.upload_resume("s1", "cv.pdf", io.BytesIO(payload), len(payload))
+        with sqlite3.connect(storage.path) as conn:
+            assert conn.execute("SELECT content FROM resumes").fetchone()[0] == payload
+
+    asyncio.run(run())
+
+
+def test_top_jobs_across_runs():
+    async def run():
+        storage = _storage()
+        await storage.save_search_results("s1", {"jobs": [{"id": "a", "match_score": 70}, {"id": "b", "match_score": 60}]})
+        await storage.save_search_results("s1", {"jobs": [{"id": "a", "match_score": 75}, {"id": "c", "match_score": 65}]})
+        await storage.save_search_results("other", {"jobs": [{"id": "z", "match_score": 99}]})
+
+        top = await storage.top_jobs("s1", limit=2)
+        assert [(job["id"], job["match_score"]) for job in top] == [("a", 75), ("c", 65)]
+        assert await storage.top_jobs("s1", since=time.time() + 60) == []
+
+        with sqlite3.connect(storage.path) as conn:
+            plan = " ".join(row[-1] for row in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT job_id FROM job_results WHERE session_id = ? AND created_at >= ? "
+                "ORDER BY match_score DESC", ("s1", 0)
+            ))
+        assert "idx_results_session_score" in plan and "TEMP B-TREE" not in plan
+
+    asyncio.run(run())
+
+
+def test_session_paging():
+    async def run():
+        storage = _storage()
+        for i in range(3):
+            await storage.save_resume_profile(f"session-{i}", {})
+        first = await storage.list_session_page(limit=2)
+        assert [e["session_id"] for e in first["sessions"]] == ["session-2", "session-1"]
+        assert first["total"] == 3 and first["next_offset"] == 2
+        assert sorted(await storage.list_sessions()) == ["session-0", "session-1", "session-2"]
+
+    asyncio.run(run())
+
+
+def test_import_legacy_json_tree():
+    root = tempfile.mkdtemp()
+    os.makedirs(os.path.join(root, "profiles", "old"))
+    os.makedirs(os.path.join(root, "results", "old"))
+    with open(os.path.join(root, "profiles", "old", "profile.json"), "w") as f:
+        json.dump({"tech_skills": ["go"]}, f)
+    with open(os.path.join(root, "results", "old", "search_20250101_000000.json"), "w") as f:
+        json.dump({"jobs": [{"id": "x", "match_score": 50}], "total_jobs": 1}, f)
+
+    storage = _storage()
+    assert storage.import_json_tree(root) == 1
+    assert asyncio.run(storage.get_resume_profile("old")) == {"tech_skills": ["go"]}
+    assert asyncio.run(storage.get_search_results("old"))["total_jobs"] == 1
+
+
+if __name__ == "__main__":
+    test_round_trip_and_cascade_delete()
+    test_streamed_resume_is_stored_whole()
+    test_top_jobs_across_runs()
+    test_session_paging()
+    test_import_legacy_json_tree()
+    print("SQLite storage OK")
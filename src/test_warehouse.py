@@ -0,0 +1,79 @@
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+from jobtracker.warehouse import JobWarehouse, fetch_with_warehouse
+
+
+def _job(job_id: str, title: str, city: str = "Austin", state: str = "TX", days_old: float = 1,
+         description: str = "Build services", company: str = "Acme"):
+    posted = (datetime.now(timezone.utc) - timedelta(days=days_old)).isoformat()
+    return {"id": job_id, "title": title, "company": company, "city": city, "state": state,
+            "posted_at": posted, "apply_url": f"https://example.com/{job_id}", "source": "jsearch",
+            "raw": {"job_id": job_id, "job_description": description, "job_country": "US"}}
+
+
+def _warehouse(**kwargs) -> JobWarehouse:
+    return JobWarehouse(os.path.join(tempfile.mkdtemp(), "jobs.db"), **kwargs)
+
+
+class FakeFetcher:
+    def __init__(self, jobs):
+        self.jobs = jobs
+        self.calls = 0
+
+    def fetch_jsearch(self, keywords, location, posted_within_days, page=1):
+        self.calls += 1
+        return self.jobs
+
+
+def test_upsert_by_job_id_and_full_text_search():
+    warehouse = _warehouse()
+    warehouse.upsert([
+        _job("1", "Senior Python Developer", description="Django and PostgreSQL"),
+        _job("2", "DevOps Engineer", city="Denver", state="CO", description="Terraform, Kubernetes"),
+        _job("3", "Data Engineer", days_old=20, description="Spark pipelines in Python"),
+    ])
+    warehouse.upsert([_job("2", "Senior DevOps Engineer", city="Denver", state="CO", description="Terraform")])
+
+    assert warehouse.stats()["jobs"] == 3
+    assert [j["id"] for j in warehouse.search("python")] == ["1", "3"]  # title match ranks first
+    assert [j["id"] for j in warehouse.search("python", posted_within_days=7)] == ["1"]
+    assert [j["id"] for j in warehouse.search("engineers", location="Denver")] == ["2"]
+    assert warehouse.search("devops")[0]["title"] == "Senior DevOps Engineer"
+    assert warehouse.search("kubernetes") == []  # replaced description is no longer indexed
+    assert len(warehouse.search("", location="USA")) == 3
+    assert warehouse.search('python" OR *') is not None  # user input never reaches FTS syntax
+
+
+def test_fetch_falls_back_to_api_only_for_uncovered_windows():
+    warehouse = _warehouse()
+    fetcher = FakeFetcher([_job("1", "Python Developer"), _job("2", "Go Developer")])
+
+    first = fetch_with_warehouse(warehouse, fetcher, "Python  Developer", "USA", 7)
+    again = fetch_with_warehouse(warehouse, fetcher, "python developer", "usa", 5)  # same window ("week")
+    assert fetcher.calls == 1
+    assert [j["id"] for j in again] == [j["id"] for j in first] == ["1", "2"]
+
+    fetch_with_warehouse(warehouse, fetcher, "python developer", "USA", 7, page=2)
+    fetch_with_warehouse(warehouse, fetcher, "python developer", "USA", 30)
+    assert fetcher.calls == 3
+
+    stale = JobWarehouse(warehouse.path, fresh_hours=0)
+    fetch_with_warehouse(stale, fetcher, "python developer", "USA", 7)
+    assert fetcher.calls == 4
+
+
+def test_empty_fetch_is_not_marked_covered():
+    warehouse = _warehouse()
+    fetcher = FakeFetcher([])
+    fetch_with_warehouse(warehouse, fetcher, "rust", "USA", 7)
+    fetch_with_warehouse(warehouse, fetcher, "rust", "USA", 7)
+    assert fetcher.calls == 2
+
+
+if __name__ == "__main__":
+    test_upsert_by_job_id_and_full_text_search()
+    test_fetch_falls_back_to_api_only_for_uncovered_windows()
+    test_empty_fetch_is_not_marked_covered()
+    print("Warehouse OK")